@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures: temporary SQLite card databases and a card_database
+row factory, plus a fresh blocking-call limiter for every test.
+"""
+
+import uuid
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.utils import async_io
+from src.services.card_database_service import CARD_DATABASE_TABLES, CardDatabase
+
+
+def _make_card(player, year=2023, set_name="Chrome", manufacturer="Topps", card_number="1", **fields):
+    fields.setdefault("avg_raw_price", 10.0)
+    return CardDatabase(id=str(uuid.uuid4()), sport="MLB", year=year, manufacturer=manufacturer, set_name=set_name,
+                        player_name=player, card_number=card_number, parallel="", **fields)
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiter():
+    # anyio limiters bind to the event loop that created them
+    async_io._limiter = None
+    yield
+    async_io._limiter = None
+
+
+@pytest.fixture
+def make_card():
+    """CardDatabase row factory; a test file seeds its rows by overriding engine or db"""
+    return _make_card
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Empty card_database in a temporary SQLite file"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cards.db'}")
+    CardDatabase.metadata.create_all(bind=engine, tables=CARD_DATABASE_TABLES)
+    return engine
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    db = session_factory()
+    yield db
+    db.close()
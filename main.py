@@ -5,9 +5,9 @@ from datetime import datetime
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from src.drive_downloader import download_from_drive
-from src.enhanced_card_processor import process_all_images_enhanced as process_all_images
-from src.price_finder import research_all_prices
+from src.utils.drive_downloader import download_from_drive
+from src.utils.enhanced_card_processor import process_all_images_enhanced as process_all_images
+from src.utils.price_finder import research_all_prices
 
 def get_image_urls_for_card(card_data, image_urls_dict):
     """
@@ -229,7 +229,7 @@ def main():
     
     # Step 2: Process images with OCR (Target: 15 minutes)
     print("\n🔄 Step 2: Processing images with Google Vision API...")
-    cards = process_all_images(images)  
+    cards = process_all_images(images, batch_size=16, max_workers=4)  # 16 images per Vision request, 4 requests in flight
     
     if not cards:
         print("No cards processed. Exiting pipeline.")
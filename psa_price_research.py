@@ -2,13 +2,13 @@
 
 import time
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import quote_plus
-import re
 import json
 from datetime import datetime
 import pandas as pd
 
+from src.utils.ebay_listing_parser import parse_sold_listings
+
 def get_psa_card_definitions():
     """
     Define the 4 PSA graded cards with multiple search variations for better pricing.
@@ -101,50 +101,12 @@ def scrape_ebay_sold_listings_enhanced(search_query, max_results=10):
         response = requests.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find sold listing items with multiple selectors
-        items = soup.find_all('div', class_='s-item__wrapper clearfix')
-        if not items:
-            items = soup.find_all('div', class_='s-item')
-        
-        prices = []
-        listings_data = []
-        
-        for item in items[:max_results]:
-            try:
-                # Extract price
-                price_elem = item.find('span', class_='s-item__price')
-                if not price_elem:
-                    price_elem = item.find('span', class_='notranslate')
-                
-                if price_elem:
-                    price_text = price_elem.get_text(strip=True)
-                    # Extract numeric price
-                    price_match = re.search(r'\$?([\d,]+\.?\d*)', price_text)
-                    if price_match:
-                        try:
-                            price = float(price_match.group(1).replace(',', ''))
-                            
-                            # Extract title for verification
-                            title_elem = item.find('h3', class_='s-item__title')
-                            title = title_elem.get_text(strip=True) if title_elem else 'No title'
-                            
-                            # Extract sold date
-                            date_elem = item.find('span', class_='s-item__endedDate')
-                            sold_date = date_elem.get_text(strip=True) if date_elem else 'Unknown date'
-                            
-                            prices.append(price)
-                            listings_data.append({
-                                'price': price,
-                                'title': title,
-                                'sold_date': sold_date,
-                                'search_query': search_query
-                            })
-                        except ValueError:
-                            continue
-            except Exception as e:
-                continue
+        # Sold listings (wrapper divs, else any s-item div) with title and sold date
+        listings_data = [
+            dict(listing, search_query=search_query)
+            for listing in parse_sold_listings(response.content, max_results, fallback=True)
+        ]
+        prices = [listing['price'] for listing in listings_data]
         
         return prices, listings_data
     
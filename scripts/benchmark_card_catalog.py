@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the in-memory card catalog.
+Seeds a temporary SQLite card_database with seed_massive_card_database,
+loads it into a CardCatalog, and reports the catalog's memory per 100k rows
+and find_card_match latency (p50/p99) from the catalog and from the
+indexed SQL lookups. Nothing touches the configured database.
+
+Usage:
+    python scripts/benchmark_card_catalog.py [--cards 100000] [--lookups 5000]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.services import card_catalog
+from src.services.card_catalog import CardCatalog
+from src.services.card_database_service import CARD_DATABASE_TABLES, CardDatabase, CardDatabaseService
+from seed_massive_card_database import seed_massive_database
+
+def sample_queries(db, count):
+    """Lookups shaped like OCR output: a mix of full identities and player/year/manufacturer only"""
+    rows = db.query(CardDatabase.player_name, CardDatabase.year, CardDatabase.set_name,
+                    CardDatabase.manufacturer, CardDatabase.card_number).all()
+    queries = []
+    for player, year, set_name, manufacturer, card_number in random.sample(rows, min(count, len(rows))):
+        if random.random() < 0.5:
+            queries.append({"player": player.upper(), "year": str(year), "set": f"{manufacturer} {set_name}",
+                            "manufacturer": manufacturer, "card_number": card_number})
+        else:
+            queries.append({"player": player, "year": str(year + random.choice([-1, 0, 1])),
+                            "manufacturer": manufacturer})
+    # Cards the database does not have
+    queries.extend({"player": f"Unknown Player {i}", "year": "2023"} for i in range(count // 10))
+    random.shuffle(queries)
+    return queries
+
+def time_lookups(service, queries):
+    """Per-lookup latencies in microseconds, and the matched ids"""
+    timings, ids = [], []
+    for card_data in queries:
+        start = time.perf_counter()
+        match = service.find_card_match(card_data)
+        timings.append((time.perf_counter() - start) * 1e6)
+        ids.append(match.id if match else None)
+    return timings, ids
+
+def sql_candidates(service, card_data):
+    """Ids of every row the SQL lookup could return (.first() has no ORDER BY)"""
+    player, year = card_data["player"], service._extract_year(card_data["year"])
+    set_name, manufacturer = card_data.get("set", ""), card_data.get("manufacturer", "")
+    exact = service._exact_query(player, year, set_name, manufacturer, card_data.get("card_number", "")).all()
+    return {card.id for card in exact or service._fuzzy_query(player, year, manufacturer).all()}
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the in-memory card catalog")
+    parser.add_argument("--cards", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'cards.db')}")
+        CardDatabase.metadata.create_all(bind=engine, tables=CARD_DATABASE_TABLES)
+        db = sessionmaker(bind=engine)()
+
+        print(f"🗄️  Seeding {args.cards:,} cards into a temporary database...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            cards = seed_massive_database(db, args.cards)
+        queries = sample_queries(db, args.lookups)
+
+        catalog = CardCatalog(engine)
+        tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            catalog.load()
+        load_seconds = time.perf_counter() - start
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_100k = retained * 100000 / cards
+
+        service = CardDatabaseService(db)
+        card_catalog._catalogs[engine] = catalog
+        catalog_timings, catalog_ids = time_lookups(service, queries)
+
+        card_catalog.CARD_CATALOG_ENABLED = False
+        sql_timings, sql_ids = time_lookups(service, queries)
+        # Where several rows qualify, either path may pick any of them
+        mismatches = sum(
+            1 for card_data, catalog_id, sql_id in zip(queries, catalog_ids, sql_ids)
+            if catalog_id != sql_id and catalog_id not in sql_candidates(service, card_data)
+        )
+        db.close()
+        engine.dispose()
+
+    print(f"📊 Card catalog, {cards:,} cards, {len(queries):,} lookups")
+    print(f"   Load: {load_seconds:.2f}s, {retained / 1e6:.1f} MB retained ({peak / 1e6:.1f} MB peak)")
+    print(f"   Memory: {per_100k / 1e6:.1f} MB per 100k rows")
+    print(f"{'path':<8} {'p50 µs':>9} {'p99 µs':>9} {'mean µs':>9}")
+    for name, timings in (("catalog", catalog_timings), ("sql", sql_timings)):
+        print(f"{name:<8} {percentile(timings, 0.5):>9.1f} {percentile(timings, 0.99):>9.1f} "
+              f"{statistics.mean(timings):>9.1f}")
+    if mismatches:
+        print(f"❌ {mismatches} lookups matched a card the SQL lookup would not")
+        sys.exit(1)
+    print(f"✅ Every catalog match is one the SQL lookup accepts ({len(queries):,} lookups)")
+
+if __name__ == "__main__":
+    main()
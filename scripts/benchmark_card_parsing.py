@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for OCR text parsing.
+Times _extract_card_details_enhanced over a mixed corpus of raw and PSA graded
+card text (no Vision API calls) and reports per-card parse time.
+
+Usage:
+    python scripts/benchmark_card_parsing.py [--iterations 200] [--repeat 5]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import contextlib
+import io
+import time
+
+from src.utils.enhanced_card_processor import _extract_card_details_enhanced
+
+# Representative OCR output: front/back of raw cards and PSA slab labels
+SAMPLE_CARDS = [
+    ("2023 TOPPS CHROME PAUL SKENES #124 RC ROOKIE CARD", "Paul Skenes"),
+    ("2024 PANINI PRIZM BASKETBALL VICTOR WEMBANYAMA #1 ROOKIE", "Victor Wembanyama"),
+    ("2018 BOWMAN CHROME PROSPECTS SHOHEI OHTANI #BCP-1", "Shohei Ohtani"),
+    ("2023 TOPPS CHROME GOLD REFRACTOR RONALD ACUNA JR 15/50", "Ronald Acuna Jr"),
+    ("2023 TOPPS CHROME PAUL SKENES AUTO ROOKIE PATCH #/99", "Paul Skenes"),
+    ("PSA 10 GEM MINT\n2018 TOPPS CHROME SHOHEI OHTANI #1 ROOKIE\nCERT #12345678", "Shohei Ohtani"),
+    ("PROFESSIONAL SPORTS AUTHENTICATOR\nGRADE: 9\n2023 BOWMAN CHROME PAUL SKENES RC\nCERTIFICATION #87654321", "Paul Skenes"),
+    ("PSA Authentication and Grading Services\nMINT 10\n2020 TOPPS CHROME ROOKIE CARD\nJUAN SOTO #125\nPSA #98765432", "Juan Soto"),
+    (
+        "ELLY DE LA CRUZ\nCINCINNATI REDS\nINF\nHEIGHT: 6'5\" WEIGHT: 200 LBS\nBATS: SWITCH THROWS: RIGHT\n"
+        "BORN: 1-11-02, SABANA GRANDE DE BOYA, D.R.\nMAJOR LEAGUE BATTING RECORD\n2023 REDS 98 388 67 91 17 2 13 44\n"
+        "© 2024 THE TOPPS COMPANY, INC. MADE IN U.S.A.\nCODE#CMP100234 #215",
+        "Elly Delacruz",
+    ),
+    (
+        "JACKSON MERRILL\nSAN DIEGO PADRES\nSHORTSTOP\nSCOUTING REPORT: PLUS HIT TOOL, ADVANCED APPROACH\n"
+        "2024 BOWMAN'S BEST\nSERIAL NUMBERED 045/150\nORANGE REFRACTOR\nWILD CARD TRADING CARDS",
+        "Jackson Merrill",
+    ),
+    (
+        "Copyright 2024 Wild Card, Inc. All rights reserved\nALPHA\nMATTE BLACK\nPROSPECT EDITION\n"
+        "CHOURIO SALAS\nSCAN QR CODE TO VERIFY",
+        "Chourio Salas",
+    ),
+    ("BLURRY TEXT 123 XYZ UNCLEAR SYMBOLS @@@ 456", "Unknown Player"),
+]
+
+def run_benchmark(iterations, repeat=5):
+    """Best of `repeat` timed rounds, so a noisy machine does not skew the result."""
+    timings = []
+    # Extraction prints progress for PSA cards; keep it out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text, player in SAMPLE_CARDS:
+            _extract_card_details_enhanced(text, player)
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                for text, player in SAMPLE_CARDS:
+                    _extract_card_details_enhanced(text, player)
+            timings.append(time.perf_counter() - start)
+
+    parsed = iterations * len(SAMPLE_CARDS)
+    return min(timings), parsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR text parsing")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    elapsed, parsed = run_benchmark(args.iterations, args.repeat)
+    print(f"📊 Parsed {parsed} cards in {elapsed:.3f}s (best of {args.repeat})")
+    print(f"   Per card: {elapsed / parsed * 1e6:.1f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for eBay sold-listing extraction.
+Parses saved result pages (scripts/fixtures/ebay_sold/*.html.gz) with the
+BeautifulSoup parser and the streaming fast parser and reports parse time
+and peak memory for each. No network calls.
+
+The fixtures follow the markup of eBay's sold-results page (inline
+scripts/styles in the head, nav, s-item listings, footer) with synthetic
+listings. The 'no_wrappers' page exercises the s-item fallback used by
+psa_price_research.
+
+Usage:
+    python scripts/benchmark_ebay_parsing.py [--iterations 20] [--repeat 3] [--max-results 5]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import glob
+import gzip
+import time
+import tracemalloc
+
+from src.utils.ebay_listing_parser import parse_sold_listings_fast, parse_sold_listings_soup
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'ebay_sold')
+
+PARSERS = [
+    ("soup", parse_sold_listings_soup),
+    ("fast", parse_sold_listings_fast),
+]
+
+def load_fixtures(directory=FIXTURES_DIR):
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html.gz'))):
+        with gzip.open(path, 'rb') as f:
+            fixtures.append((os.path.basename(path)[:-len('.html.gz')], f.read()))
+    return fixtures
+
+def time_parser(parse, html, max_results, fallback, iterations, repeat):
+    """Best of `repeat` rounds, per parse, in milliseconds"""
+    parse(html, max_results, fallback)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            parse(html, max_results, fallback)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / iterations * 1000
+
+def peak_memory(parse, html, max_results, fallback):
+    """Peak bytes allocated during one parse"""
+    tracemalloc.start()
+    try:
+        parse(html, max_results, fallback)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark eBay sold-listing parsing")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-results", type=int, default=5,
+                        help="listings read per page (price_finder uses 5; 0 = whole page)")
+    args = parser.parse_args()
+    max_results = args.max_results or None
+
+    fixtures = load_fixtures()
+    if not fixtures:
+        print(f"❌ No fixtures found in {FIXTURES_DIR}")
+        sys.exit(1)
+
+    print(f"📊 eBay sold-listing parsing, max_results={max_results or 'all'} "
+          f"(best of {args.repeat} x {args.iterations})")
+    print(f"{'fixture':<24} {'KB':>6} {'parser':<6} {'ms/page':>9} {'peak MB':>8} {'listings':>9}")
+
+    totals = {name: [0.0, 0] for name, _ in PARSERS}
+    for fixture, html in fixtures:
+        fallback = 'no_wrappers' in fixture
+        results = {}
+        for name, parse in PARSERS:
+            ms = time_parser(parse, html, max_results, fallback, args.iterations, args.repeat)
+            peak = peak_memory(parse, html, max_results, fallback)
+            results[name] = parse(html, max_results, fallback)
+            totals[name][0] += ms
+            totals[name][1] = max(totals[name][1], peak)
+            print(f"{fixture:<24} {len(html) // 1024:>6} {name:<6} {ms:>9.2f} {peak / 1e6:>8.2f} {len(results[name]):>9}")
+        if results["fast"] != results["soup"]:
+            print(f"❌ {fixture}: parsers disagree")
+            sys.exit(1)
+
+    soup_ms, soup_peak = totals["soup"]
+    fast_ms, fast_peak = totals["fast"]
+    print(f"\n✅ Both parsers return identical listings on all {len(fixtures)} fixtures")
+    print(f"   Total parse time: soup {soup_ms:.1f} ms, fast {fast_ms:.1f} ms ({soup_ms / fast_ms:.1f}x faster)")
+    print(f"   Peak memory: soup {soup_peak / 1e6:.1f} MB, fast {fast_peak / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
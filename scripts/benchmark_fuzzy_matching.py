@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark for OCR-tolerant card matching.
+Seeds a temporary SQLite card_database with seed_massive_card_database, then
+reads cards back through synthetic OCR noise (confused glyphs such as l/1,
+o/0, m/rn; dropped, doubled and split characters; accents) and reports:
+  - recall of the exact/fuzzy lookups alone (what find_card_match did before
+    the trigram pass) and of find_card_match with it
+  - recall@k of find_card_candidates
+  - wrong matches accepted, including for players the database lacks
+  - lookup latency (p50/p99)
+A read counts as found when the match has the card's player, year and set.
+Named players and the seed's numbered placeholders ('Prospect 312') are
+reported apart: a placeholder that loses a digit reads as another one.
+
+Usage:
+    python scripts/benchmark_fuzzy_matching.py [--cards 50000] [--queries 2000] [--noise 2]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import contextlib
+import io
+import random
+import re
+import tempfile
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.services.card_catalog import get_card_catalog
+from src.services.card_database_service import CARD_DATABASE_TABLES, CardDatabase, CardDatabaseService, normalize_key
+from seed_massive_card_database import seed_massive_database
+
+# What OCR tends to read in place of a glyph
+OCR_MISREADS = {"l": ["1", "I"], "i": ["l", "1"], "o": ["0"], "s": ["5"], "b": ["8"], "m": ["rn"], "w": ["vv"],
+                "e": ["é", "c"], "a": ["á", "o"], "n": ["ñ", "h"], "u": ["v"], "c": ["e"], "g": ["q"]}
+
+# seed_massive_card_database pads its tiers with numbered players ('Prospect 312')
+PLACEHOLDER = re.compile(r"\d$")
+
+def add_noise(text, edits):
+    """text with `edits` random OCR-style errors"""
+    chars = list(text)
+    for _ in range(edits):
+        positions = [i for i, char in enumerate(chars) if char.strip()]
+        if not positions:
+            break
+        i = random.choice(positions)
+        kind = random.random()
+        misreads = OCR_MISREADS.get(chars[i].lower())
+        if kind < 0.6 and misreads:
+            chars[i] = random.choice(misreads)
+        elif kind < 0.75:
+            del chars[i]
+        elif kind < 0.9:
+            chars.insert(i, chars[i])
+        else:
+            chars.insert(i, " ")
+    return "".join(chars)
+
+def noisy_reads(db, count, noise):
+    """
+    (ocr card_data, true (player_norm, year, set_norm)) pairs for random seeded
+    cards, half of them named players and half placeholders
+    """
+    rows = db.query(CardDatabase.player_name, CardDatabase.year, CardDatabase.set_name,
+                    CardDatabase.manufacturer, CardDatabase.card_number).all()
+    named = [row for row in rows if not PLACEHOLDER.search(row.player_name)]
+    placeholders = [row for row in rows if PLACEHOLDER.search(row.player_name)]
+    sample = (random.sample(named, min(count // 2, len(named)))
+              + random.sample(placeholders, min(count - count // 2, len(placeholders))))
+    reads = []
+    for player, year, set_name, manufacturer, card_number in sample:
+        card_data = {"player": add_noise(player, random.randint(1, noise)), "year": str(year),
+                     "set": add_noise(f"{manufacturer} {set_name}", random.randint(0, 1))}
+        if random.random() < 0.5:
+            card_data["manufacturer"] = manufacturer
+        if random.random() < 0.5:
+            card_data["card_number"] = card_number
+        reads.append((card_data, (normalize_key(player), year, normalize_key(set_name))))
+    return reads
+
+def unknown_reads(count):
+    """Reads of players the database does not have"""
+    names = ["Jordan Lawlar", "Termarr Johnson", "Druw Jones", "Brooks Lee", "Cam Collier", "Kevin Parada",
+             "Jacob Berry", "Elijah Green", "Cade Horton", "Zach Neto", "Dylan Crews", "Wyatt Langford"]
+    return [({"player": add_noise(random.choice(names), 1), "year": "2023", "set": "Bowman Chrome"}, None)
+            for _ in range(count)]
+
+def is_placeholder(truth):
+    return truth is not None and PLACEHOLDER.search(truth[0]) is not None
+
+def is_card(match, truth):
+    return truth is not None and match is not None and (
+        normalize_key(match.player_name), match.year, normalize_key(match.set_name)) == truth
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run(lookup, reads):
+    """
+    Time lookup over reads; returns (found, wrong, latencies in µs). A lookup
+    returning a list (candidates) finds the card if any entry is it.
+    """
+    found = wrong = 0
+    timings = []
+    for card_data, truth in reads:
+        start = time.perf_counter()
+        match = lookup(card_data)
+        timings.append((time.perf_counter() - start) * 1e6)
+        matches = match if isinstance(match, list) else [match] if match is not None else []
+        if any(is_card(card, truth) for card in matches):
+            found += 1
+        elif matches:
+            wrong += 1
+    return found, wrong, timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR-tolerant card matching")
+    parser.add_argument("--cards", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--noise", type=int, default=2, help="most OCR errors put in a player name")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'cards.db')}")
+        CardDatabase.metadata.create_all(bind=engine, tables=CARD_DATABASE_TABLES)
+        db = sessionmaker(bind=engine)()
+
+        print(f"🗄️  Seeding {args.cards:,} cards into a temporary database...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_massive_database(db, args.cards)
+        reads = noisy_reads(db, args.queries, args.noise)
+        unknown = unknown_reads(args.queries // 10)
+
+        service = CardDatabaseService(db)
+        catalog = get_card_catalog(db)
+        with contextlib.redirect_stdout(io.StringIO()):
+            catalog.load()
+
+        def exact_and_fuzzy(card_data):
+            player, year = card_data["player"], service._extract_year(card_data["year"])
+            set_name, manufacturer = card_data.get("set", ""), card_data.get("manufacturer", "")
+            return catalog.find_match(
+                normalize_key(player), year,
+                set_keys=service._set_keys(set_name, manufacturer),
+                manufacturer_key=normalize_key(manufacturer) if manufacturer else None,
+                card_number=card_data.get("card_number", ""),
+                manufacturer_keys={normalize_key(v) for v in service._get_manufacturer_variants(manufacturer)}
+                if manufacturer else None,
+            )
+
+        lookups = [("exact+fuzzy", exact_and_fuzzy), ("find_card_match", service.find_card_match),
+                   ("candidates@" + str(args.k),
+                    lambda card_data: [card for _, card in service.find_card_candidates(card_data, limit=args.k)])]
+        groups = {"named": [read for read in reads if not is_placeholder(read[1])],
+                  "placeholder": [read for read in reads if is_placeholder(read[1])]}
+        results = {(name, group): run(lookup, group_reads)
+                   for name, lookup in lookups for group, group_reads in groups.items()}
+        _, unknown_wrong, _ = run(service.find_card_match, unknown)
+        stats = catalog.get_stats()
+        db.close()
+        engine.dispose()
+
+    print(f"📊 OCR-noisy matching: {stats['cards']:,} cards, {stats['players_indexed']:,} players, "
+          f"{len(reads):,} reads (1-{args.noise} errors per player name)")
+    print(f"{'lookup':<16} {'players':<12} {'reads':>6} {'recall':>7} {'wrong':>6} {'p50 µs':>8} {'p99 µs':>8}")
+    for (name, group), (found, wrong, timings) in results.items():
+        total = len(groups[group])
+        print(f"{name:<16} {group:<12} {total:>6} {found / total:>7.1%} {wrong if not name.startswith('candidates') else '-':>6} "
+              f"{percentile(timings, 0.5):>8.1f} {percentile(timings, 0.99):>8.1f}")
+    print(f"   Unknown players matched to some card: {unknown_wrong}/{len(unknown)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Evaluate OCR preprocessing settings against full-resolution uploads.
+For each image, OCRs the original bytes once as the reference, then each
+preprocessing setting, and reports payload size, Vision latency, text similarity
+and extracted-field agreement so OCR_MAX_LONG_EDGE / OCR_JPEG_QUALITY /
+OCR_CROP_TO_CARD can be tuned. Calls Vision directly (bypasses the OCR cache).
+
+Usage:
+    python scripts/evaluate_ocr_preprocessing.py test_images [--limit 20]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import contextlib
+import difflib
+import glob
+import io
+import time
+
+from google.cloud import vision
+
+from src.utils.vision_client import get_vision_client
+from src.utils.image_preprocessing import preprocess_image_bytes
+from src.utils.enhanced_card_processor import analyze_card_text, _extract_player_from_filename
+
+# (label, max_long_edge, jpeg_quality, crop)
+SETTINGS = [
+    ("edge2048-q90", 2048, 90, False),
+    ("edge1600-q85", 1600, 85, False),
+    ("edge1600-q85-crop", 1600, 85, True),
+    ("edge1200-q80", 1200, 80, False),
+    ("edge1024-q75", 1024, 75, False),
+]
+
+# Fields that drive pricing; agreement is measured against the full-resolution result
+COMPARED_FIELDS = ["year", "set", "card_number", "parallel", "grade", "cert_number"]
+
+def _ocr(client, content):
+    start = time.perf_counter()
+    response = client.document_text_detection(image=vision.Image(content=content))
+    elapsed = time.perf_counter() - start
+    if response.error.message:
+        raise Exception(f"Vision API error: {response.error.message}")
+    return response.full_text_annotation.text, elapsed
+
+def _details(text, player_name):
+    # The extractors print progress for graded cards; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        return analyze_card_text(text, player_name)
+
+def evaluate(image_paths):
+    client = get_vision_client()
+    totals = {label: {"bytes": 0, "seconds": 0.0, "similarity": 0.0, "fields": 0, "agreed": 0}
+              for label in ["original"] + [s[0] for s in SETTINGS]}
+
+    for image_path in image_paths:
+        with open(image_path, 'rb') as image_file:
+            content = image_file.read()
+        player_name = _extract_player_from_filename(image_path)
+
+        reference_text, elapsed = _ocr(client, content)
+        reference = _details(reference_text, player_name)
+        totals["original"]["bytes"] += len(content)
+        totals["original"]["seconds"] += elapsed
+        totals["original"]["similarity"] += 1.0
+        print(f"\n🖼️  {os.path.basename(image_path)}: {len(content) / 1024:.0f}KB, {elapsed * 1000:.0f}ms")
+
+        for label, max_long_edge, quality, crop in SETTINGS:
+            payload, info = preprocess_image_bytes(content, max_long_edge, quality, crop)
+            text, elapsed = _ocr(client, payload)
+            details = _details(text, player_name)
+
+            similarity = difflib.SequenceMatcher(None, reference_text, text).ratio()
+            compared = [field for field in COMPARED_FIELDS if reference.get(field)]
+            agreed = sum(1 for field in compared if details.get(field) == reference.get(field))
+
+            total = totals[label]
+            total["bytes"] += info["payload_bytes"]
+            total["seconds"] += elapsed
+            total["similarity"] += similarity
+            total["fields"] += len(compared)
+            total["agreed"] += agreed
+            print(f"   {label:<20} {info['payload_bytes'] / 1024:>7.0f}KB {elapsed * 1000:>6.0f}ms "
+                  f"text {similarity:.1%}  fields {agreed}/{len(compared)}")
+
+    count = len(image_paths)
+    print(f"\n📊 Summary over {count} images")
+    print(f"   {'setting':<20} {'avg KB':>8} {'avg ms':>8} {'text':>7} {'fields':>7}")
+    for label, total in totals.items():
+        fields = f"{total['agreed'] / total['fields']:.1%}" if total["fields"] else "-"
+        if label == "original":
+            fields = "100.0%"
+        print(f"   {label:<20} {total['bytes'] / count / 1024:>8.0f} {total['seconds'] / count * 1000:>8.0f} "
+              f"{total['similarity'] / count:>7.1%} {fields:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate OCR image preprocessing settings")
+    parser.add_argument("image_dir", nargs="?", default="test_images")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    image_paths = sorted(
+        path for pattern in ("*.jpg", "*.jpeg", "*.png")
+        for path in glob.glob(os.path.join(args.image_dir, pattern))
+    )[:args.limit]
+    if not image_paths:
+        print(f"❌ No images found in {args.image_dir}")
+        return
+
+    evaluate(image_paths)
+
+if __name__ == "__main__":
+    main()
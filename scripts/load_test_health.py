@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Load test: /health latency while card processing requests are in flight.
+Measures /health alone first (baseline), then again while `--concurrency`
+clients keep POSTing to /api/v1/cards/process-url (or process-dual-side when a
+back image is given), and prints p50/p95/p99 for both phases. With the event
+loop free, the loaded p99 should stay close to the baseline.
+
+Usage:
+    python scripts/load_test_health.py --token <JWT> --collection-id <uuid> \\
+        --image-url https://storage.googleapis.com/bucket/front.jpg \\
+        [--back-image-url https://storage.googleapis.com/bucket/back.jpg] \\
+        [--base-url http://localhost:8000] [--concurrency 8] [--duration 30]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not samples:
+        return float('nan')
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+async def probe_health(client, base_url, rate, stop_at):
+    """Hit /health at a fixed rate until stop_at; return latencies in ms."""
+    latencies = []
+    interval = 1.0 / rate
+    while time.monotonic() < stop_at:
+        started = time.perf_counter()
+        try:
+            response = await client.get(f"{base_url}/health")
+            if response.status_code == 200:
+                latencies.append((time.perf_counter() - started) * 1000)
+        except httpx.HTTPError as e:
+            print(f"⚠️  /health failed: {e}")
+        await asyncio.sleep(max(0, interval - (time.perf_counter() - started)))
+    return latencies
+
+async def process_cards(client, args, stop_at, results):
+    """Keep one card-processing request in flight until stop_at."""
+    headers = {"Authorization": f"Bearer {args.token}"}
+    if args.back_image_url:
+        path = "/api/v1/cards/process-dual-side"
+        payload = {
+            "front_image_url": args.image_url,
+            "back_image_url": args.back_image_url,
+            "collection_id": args.collection_id,
+            "filename": args.filename,
+        }
+    else:
+        path = "/api/v1/cards/process-url"
+        payload = {"image_url": args.image_url, "collection_id": args.collection_id, "filename": args.filename}
+
+    while time.monotonic() < stop_at:
+        started = time.perf_counter()
+        try:
+            response = await client.post(f"{args.base_url}{path}", json=payload, headers=headers, timeout=120)
+            results["latencies"].append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                results["errors"] += 1
+        except httpx.HTTPError:
+            results["errors"] += 1
+
+def report(label, latencies):
+    print(f"   {label:<10} n={len(latencies):<5} p50={percentile(latencies, 50):8.1f}ms "
+          f"p95={percentile(latencies, 95):8.1f}ms p99={percentile(latencies, 99):8.1f}ms "
+          f"max={max(latencies) if latencies else float('nan'):8.1f}ms")
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        print(f"📏 Baseline: /health alone for {args.baseline}s")
+        baseline = await probe_health(client, args.base_url, args.health_rate, time.monotonic() + args.baseline)
+
+        print(f"🔥 Loaded: {args.concurrency} concurrent card requests for {args.duration}s")
+        stop_at = time.monotonic() + args.duration
+        card_results = {"latencies": [], "errors": 0}
+        workers = [process_cards(client, args, stop_at, card_results) for _ in range(args.concurrency)]
+        loaded, *_ = await asyncio.gather(probe_health(client, args.base_url, args.health_rate, stop_at), *workers)
+
+    print("\n📊 /health latency")
+    report("baseline", baseline)
+    report("loaded", loaded)
+    print("\n📊 Card processing")
+    report("cards", card_results["latencies"])
+    print(f"   errors: {card_results['errors']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure /health p99 under concurrent card processing")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", default=os.getenv("FLIPHERO_TOKEN"), help="Bearer token (or FLIPHERO_TOKEN)")
+    parser.add_argument("--collection-id", required=True)
+    parser.add_argument("--image-url", required=True)
+    parser.add_argument("--back-image-url")
+    parser.add_argument("--filename", default="paul-skenes-front.jpg")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--baseline", type=float, default=5)
+    parser.add_argument("--health-rate", type=float, default=20, help="/health requests per second")
+    args = parser.parse_args()
+
+    if not args.token:
+        parser.error("--token or FLIPHERO_TOKEN is required")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
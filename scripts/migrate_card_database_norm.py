@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Migration: normalized match keys for card_database.
+Adds player_norm/set_norm/manufacturer_norm, fills them for existing rows in
+batches, and creates the (player_norm, year) and
+(player_norm, year, set_norm, card_number) indexes. Then creates
+card_database_name_words (the player-name words search_cards seeks on) and
+fills it for rows that have no words yet. Safe to re-run: only missing
+columns, unfilled rows and missing indexes are touched.
+Works on SQLite and PostgreSQL (uses the configured DATABASE_URL).
+
+Usage:
+    python scripts/migrate_card_database_norm.py [--batch-size 1000]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+from sqlalchemy import inspect, text
+
+from src.database import engine
+from src.services.card_database_service import CardDatabase, CardNameWord, name_words, normalize_key
+
+NORM_COLUMNS = ["player_norm", "set_norm", "manufacturer_norm"]
+
+def add_columns(engine):
+    existing = {column["name"] for column in inspect(engine).get_columns("card_database")}
+    added = [name for name in NORM_COLUMNS if name not in existing]
+    with engine.begin() as conn:
+        for name in added:
+            conn.execute(text(f"ALTER TABLE card_database ADD COLUMN {name} VARCHAR"))
+            print(f"✅ Added column: {name}")
+    return added
+
+def backfill(engine, batch_size=1000):
+    """Fill the match keys for rows that have none, batch_size rows per transaction"""
+    filled = 0
+    last_id = ""
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, player_name, set_name, manufacturer FROM card_database "
+                    "WHERE player_norm IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).fetchall()
+            if not rows:
+                break
+            conn.execute(
+                text(
+                    "UPDATE card_database SET player_norm = :player_norm, set_norm = :set_norm, "
+                    "manufacturer_norm = :manufacturer_norm WHERE id = :id"
+                ),
+                [
+                    {
+                        "id": row.id,
+                        "player_norm": normalize_key(row.player_name),
+                        "set_norm": normalize_key(row.set_name),
+                        "manufacturer_norm": normalize_key(row.manufacturer),
+                    }
+                    for row in rows
+                ],
+            )
+        filled += len(rows)
+        last_id = rows[-1].id
+        print(f"  Filled {filled} rows...")
+    return filled
+
+def create_indexes(engine):
+    existing = {index["name"] for index in inspect(engine).get_indexes("card_database")}
+    created = []
+    for index in CardDatabase.__table__.indexes:
+        if index.name not in existing:
+            index.create(bind=engine)
+            created.append(index.name)
+            print(f"✅ Created index: {index.name}")
+    return created
+
+def backfill_name_words(engine, batch_size=1000):
+    """Create card_database_name_words if needed and fill it for rows that have no words, batch_size rows per transaction"""
+    CardNameWord.__table__.create(bind=engine, checkfirst=True)
+    filled = 0
+    last_id = ""
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, player_norm FROM card_database WHERE id > :last_id AND NOT EXISTS "
+                    "(SELECT 1 FROM card_database_name_words w WHERE w.card_id = card_database.id) "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).fetchall()
+            if not rows:
+                break
+            words = [{"word": word, "card_id": row.id} for row in rows for word in name_words(row.player_norm)]
+            if words:
+                conn.execute(CardNameWord.__table__.insert(), words)
+        filled += len(rows)
+        last_id = rows[-1].id
+        print(f"  Indexed names of {filled} rows...")
+    return filled
+
+def migrate(engine, batch_size=1000):
+    if not inspect(engine).has_table("card_database"):
+        print("❌ card_database table not found; run scripts/seed_card_database.py first")
+        return False
+    add_columns(engine)
+    filled = backfill(engine, batch_size)
+    print(f"✅ Filled match keys for {filled} rows")
+    create_indexes(engine)
+    indexed = backfill_name_words(engine, batch_size)
+    print(f"✅ Indexed player-name words for {indexed} rows")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Add normalized match keys to card_database")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("🚀 Migrating card_database match keys...")
+    if migrate(engine, args.batch_size):
+        print("🎉 Migration completed!")
+    else:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
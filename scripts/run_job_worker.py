@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Standalone card-processing job worker.
+Claims queued jobs from the processing_jobs table (same DATABASE_URL as the
+API) and runs them, so workers can be scaled separately from API processes.
+Run the API with JOB_WORKERS=0 to leave all processing to these workers.
+
+Usage:
+    python scripts/run_job_worker.py [--workers 4]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+
+from src.database import engine, Base
+from src.services.job_service import JobWorkerPool, JOB_WORKERS
+from src.utils.async_io import close_http_client
+
+async def run(workers):
+    pool = JobWorkerPool(workers=workers)
+    await pool.start()
+    try:
+        # Workers run until the process is interrupted
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+        await close_http_client()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run card-processing job workers")
+    parser.add_argument("--workers", type=int, default=max(1, JOB_WORKERS))
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        asyncio.run(run(args.workers))
+    except KeyboardInterrupt:
+        print("👋 Job worker stopped")
+
+if __name__ == "__main__":
+    main()
@@ -71,6 +71,26 @@ CREATE TABLE card_images (
     CONSTRAINT valid_image_type CHECK (image_type IN ('front', 'back', 'detail'))
 );
 
+-- Card processing jobs table
+CREATE TABLE processing_jobs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL,
+    job_type VARCHAR(50) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    stage VARCHAR(20) NOT NULL DEFAULT 'queued',
+    progress REAL NOT NULL DEFAULT 0,
+    payload JSONB NOT NULL,
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    CONSTRAINT valid_job_status CHECK (status IN ('queued', 'running', 'succeeded', 'failed'))
+);
+
 -- Indexes
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_subscriptions_user_id ON subscriptions(user_id);
@@ -79,4 +99,6 @@ CREATE INDEX idx_cards_collection_id ON cards(collection_id);
 CREATE INDEX idx_cards_player_name ON cards(player_name);
 CREATE INDEX idx_cards_set_name ON cards(set_name);
 CREATE INDEX idx_cards_year ON cards(year);
-CREATE INDEX idx_card_images_card_id ON card_images(card_id); 
\ No newline at end of file
+CREATE INDEX idx_card_images_card_id ON card_images(card_id);
+CREATE INDEX idx_processing_jobs_user_id ON processing_jobs(user_id);
+CREATE INDEX idx_processing_jobs_status_created_at ON processing_jobs(status, created_at); 
\ No newline at end of file
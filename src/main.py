@@ -2,6 +2,7 @@ from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, F
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import timedelta, datetime
 
@@ -10,13 +11,17 @@ from .services.auth_service import AuthService, get_auth_service, oauth2_scheme
 from .services.card_service import CardService, get_card_service
 from .services.price_service import PriceService, get_price_service
 from .services.analytics_service import AnalyticsService, get_analytics_service
-from .services.card_database_service import HybridPricingService, get_hybrid_pricing_service, CardDatabaseService, get_card_database_service
+from .services.card_database_service import HybridPricingService, get_hybrid_pricing_service, CardDatabaseService, get_card_database_service, get_price_writeback
 from .services.ebay_service import EbayService, get_ebay_service
 from .services.billing_service import BillingService, get_billing_service, STRIPE_PRICES
 from .services.upload_service import UploadService, get_upload_service
+from .services.job_service import JobService, get_job_service, get_job_worker_pool, job_events
 from .schemas.auth import Token, UserCreate, GoogleOAuthRequest, AppleOAuthRequest, UserResponse, User
 from .schemas.card import CardCreate, CardUpdate, Card as CardSchema
 from .models.user import User
+from .utils.async_io import run_blocking, close_http_client
+from .utils.price_cache import get_price_cache_stats
+from .services.price_memo import get_price_memo_stats
 import logging
 
 # Set up logging
@@ -41,6 +46,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def start_job_workers():
+    await get_job_worker_pool().start()
+
+# Shutdown handlers run in registration order: the job workers stop first, as
+# their jobs use the HTTP client and queue price write-backs
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await get_job_worker_pool().stop()
+
+@app.on_event("shutdown")
+async def flush_price_writeback():
+    # Write out live prices still queued for the card database
+    await run_blocking(get_price_writeback().stop)
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await close_http_client()
+
 # Mount static files for serving uploaded images
 app.mount("/images", StaticFiles(directory="images"), name="images")
 
@@ -590,6 +614,20 @@ async def search_card_database(
         for card in results
     ]
 
+@app.get("/api/v1/pricing/cache/stats")
+async def get_price_cache_statistics(
+    current_user: User = Depends(get_auth_service().get_current_user)
+):
+    """Hit/miss counters for the eBay sold-price cache in this process"""
+    return get_price_cache_stats()
+
+@app.get("/api/v1/pricing/memo/stats")
+async def get_price_memo_statistics(
+    current_user: User = Depends(get_auth_service().get_current_user)
+):
+    """Hit rate and invalidations of the hybrid price memo in this process"""
+    return get_price_memo_stats()
+
 @app.get("/api/v1/pricing/database/popular/{sport}")
 async def get_popular_cards(
     sport: str,
@@ -867,145 +905,7 @@ async def process_card_from_url(
         raise HTTPException(status_code=400, detail="collection_id is required")
     
     try:
-        # Download the image from GCS for OCR processing
-        import requests
-        import tempfile
-        import os
-        from src.utils.enhanced_card_processor import process_all_images_enhanced
-        from src.utils.enhanced_card_processor import _extract_player_from_filename
-        
-        # Download image
-        img_response = requests.get(image_url, timeout=10)
-        if img_response.status_code != 200:
-            raise HTTPException(status_code=400, detail=f"Could not download image: {img_response.status_code}")
-        
-        # Save to temp file for OCR
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_file:
-            temp_file.write(img_response.content)
-            temp_path = temp_file.name
-        
-        try:
-            # Extract player name from filename
-            player_name = _extract_player_from_filename(filename)
-            
-            # Process with OCR
-            processed_cards = process_all_images_enhanced([temp_path])
-            if processed_cards and len(processed_cards) > 0:
-                card_data = processed_cards[0]
-                # Override player name with filename if extracted
-                if player_name:
-                    card_data["player"] = player_name
-            else:
-                # Fallback if OCR fails
-                card_data = {
-                    "player": player_name or "Unknown Player",
-                    "set": "Unknown Set",
-                    "year": "Unknown",
-                    "card_number": "",
-                    "parallel": "",
-                    "manufacturer": "Unknown",
-                    "features": "",
-                    "graded": False,
-                    "grade": "",
-                    "grading_company": "",
-                    "cert_number": "",
-                    "filename": filename
-                }
-            
-            # Get hybrid pricing
-            try:
-                hybrid_service = card_service.hybrid_pricing_service
-                hybrid_pricing_result = await hybrid_service.get_card_price(card_data)
-                
-                price_data = {
-                    "estimated_value": hybrid_pricing_result.get('estimated_value', 0.0),
-                    "listing_price": hybrid_pricing_result.get('estimated_value', 0.0) * 1.15,
-                    "confidence": hybrid_pricing_result.get('confidence', 'unknown'),
-                    "source": hybrid_pricing_result.get('source', 'unknown'),
-                    "method": hybrid_pricing_result.get('method', 'unknown'),
-                    "sample_size": hybrid_pricing_result.get('sample_size', 0),
-                    "search_query": f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
-                }
-                
-            except Exception as pricing_error:
-                print(f"❌ Hybrid pricing failed: {pricing_error}")
-                price_data = {
-                    "estimated_value": 1.0,
-                    "listing_price": 1.15,
-                    "confidence": "low",
-                    "source": "fallback",
-                    "method": "default",
-                    "sample_size": 0,
-                    "search_query": f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
-                }
-            
-            # Create card record with GCS image URL
-            from src.models.card import Card, CardImage
-            card = Card(
-                collection_id=collection_id,
-                player_name=card_data.get('player', ''),
-                set_name=card_data.get('set', ''),
-                year=card_data.get('year', ''),
-                card_number=card_data.get('card_number', ''),
-                parallel=card_data.get('parallel', ''),
-                manufacturer=card_data.get('manufacturer', ''),
-                features=card_data.get('features', ''),
-                graded=card_data.get('graded', False),
-                grade=card_data.get('grade', ''),
-                grading_company=card_data.get('grading_company', ''),
-                cert_number=card_data.get('cert_number', ''),
-                price_data=price_data or {}
-            )
-            card_service.db.add(card)
-            card_service.db.commit()
-            card_service.db.refresh(card)
-            
-            # Create image record pointing to GCS URL
-            card_image = CardImage(
-                card_id=card.id,
-                image_url=image_url,  # Store the GCS public URL
-                image_type='front'
-            )
-            card_service.db.add(card_image)
-            card_service.db.commit()
-            
-            # Add to price history
-            if price_data and isinstance(price_data, dict):
-                estimated_value = price_data.get("estimated_value")
-                if isinstance(estimated_value, (int, float)):
-                    try:
-                        card_service.price_service.add_price_history(
-                            card.id, 
-                            float(estimated_value), 
-                            price_source=price_data.get("source", "unknown")
-                        )
-                    except Exception as history_err:
-                        print(f"⚠️  Failed to record price history: {history_err}")
-            
-            return {
-                "card_id": card.id,
-                "card_data": {
-                    "player": card.player_name,
-                    "set": card.set_name,
-                    "year": card.year,
-                    "card_number": card.card_number,
-                    "parallel": card.parallel,
-                    "manufacturer": card.manufacturer,
-                    "features": card.features,
-                    "graded": card.graded,
-                    "grade": card.grade,
-                    "grading_company": card.grading_company,
-                    "cert_number": card.cert_number
-                },
-                "price_data": price_data,
-                "image_url": image_url
-            }
-            
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                
+        return await card_service.process_card_url(image_url, collection_id, filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1036,175 +936,101 @@ async def process_dual_side_card_endpoint(
         raise HTTPException(status_code=400, detail="collection_id is required")
     
     try:
-        import requests
-        import tempfile
-        import os
-        from src.utils.enhanced_card_processor import process_dual_side_card
-        from src.utils.enhanced_card_processor import _extract_player_from_filename
-        
-        # Download front image
-        front_response = requests.get(front_image_url, timeout=10)
-        if front_response.status_code != 200:
-            raise HTTPException(status_code=400, detail=f"Could not download front image: {front_response.status_code}")
-        
-        # Save front to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix="_front.jpg") as temp_file:
-            temp_file.write(front_response.content)
-            front_temp_path = temp_file.name
-        
-        back_temp_path = None
-        
-        # Download back image if provided
-        if back_image_url:
-            try:
-                back_response = requests.get(back_image_url, timeout=10)
-                if back_response.status_code == 200:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix="_back.jpg") as temp_file:
-                        temp_file.write(back_response.content)
-                        back_temp_path = temp_file.name
-                else:
-                    print(f"⚠️  Could not download back image: {back_response.status_code}")
-            except Exception as e:
-                print(f"⚠️  Back image download failed: {e}")
-        
-        try:
-            # Extract player name from filename
-            player_name = _extract_player_from_filename(filename)
-            
-            # Process with dual-side OCR
-            card_data = process_dual_side_card(front_temp_path, back_temp_path, player_name)
-            
-            if not card_data:
-                # Fallback if OCR fails
-                card_data = {
-                    "player": player_name or "Unknown Player",
-                    "set": "Unknown Set",
-                    "year": "Unknown",
-                    "card_number": "",
-                    "parallel": "",
-                    "manufacturer": "Unknown",
-                    "features": "",
-                    "graded": False,
-                    "grade": "",
-                    "grading_company": "",
-                    "cert_number": "",
-                    "confidence_score": 0.2,
-                    "dual_side": back_image_url is not None,
-                    "filename": filename
-                }
-            
-            # Get hybrid pricing
-            try:
-                hybrid_service = card_service.hybrid_pricing_service
-                hybrid_pricing_result = await hybrid_service.get_card_price(card_data)
-                
-                price_data = {
-                    "estimated_value": hybrid_pricing_result.get('estimated_value', 0.0),
-                    "listing_price": hybrid_pricing_result.get('estimated_value', 0.0) * 1.15,
-                    "confidence": hybrid_pricing_result.get('confidence', 'unknown'),
-                    "source": hybrid_pricing_result.get('source', 'unknown'),
-                    "method": hybrid_pricing_result.get('method', 'unknown'),
-                    "sample_size": hybrid_pricing_result.get('sample_size', 0),
-                    "search_query": f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
-                }
-                
-            except Exception as pricing_error:
-                print(f"❌ Hybrid pricing failed: {pricing_error}")
-                price_data = {
-                    "estimated_value": 1.0,
-                    "listing_price": 1.15,
-                    "confidence": "low",
-                    "source": "fallback",
-                    "method": "default",
-                    "sample_size": 0,
-                    "search_query": f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
-                }
-            
-            # Create card record
-            from src.models.card import Card, CardImage
-            card = Card(
-                collection_id=collection_id,
-                player_name=card_data.get('player', ''),
-                set_name=card_data.get('set', ''),
-                year=card_data.get('year', ''),
-                card_number=card_data.get('card_number', ''),
-                parallel=card_data.get('parallel', ''),
-                manufacturer=card_data.get('manufacturer', ''),
-                features=card_data.get('features', ''),
-                graded=card_data.get('graded', False),
-                grade=card_data.get('grade', ''),
-                grading_company=card_data.get('grading_company', ''),
-                cert_number=card_data.get('cert_number', ''),
-                price_data=price_data or {}
-            )
-            card_service.db.add(card)
-            card_service.db.commit()
-            card_service.db.refresh(card)
-            
-            # Create image records for both sides
-            front_image = CardImage(
-                card_id=card.id,
-                image_url=front_image_url,
-                image_type='front'
-            )
-            card_service.db.add(front_image)
-            
-            if back_image_url:
-                back_image = CardImage(
-                    card_id=card.id,
-                    image_url=back_image_url,
-                    image_type='back'
-                )
-                card_service.db.add(back_image)
-            
-            card_service.db.commit()
-            
-            # Add to price history
-            if price_data and isinstance(price_data, dict):
-                estimated_value = price_data.get("estimated_value")
-                if isinstance(estimated_value, (int, float)):
-                    try:
-                        card_service.price_service.add_price_history(
-                            card.id, 
-                            float(estimated_value), 
-                            price_source=price_data.get("source", "unknown")
-                        )
-                    except Exception as history_err:
-                        print(f"⚠️  Failed to record price history: {history_err}")
-            
-            return {
-                "card_id": card.id,
-                "card_data": {
-                    "player": card.player_name,
-                    "set": card.set_name,
-                    "year": card.year,
-                    "card_number": card.card_number,
-                    "parallel": card.parallel,
-                    "manufacturer": card.manufacturer,
-                    "features": card.features,
-                    "graded": card.graded,
-                    "grade": card.grade,
-                    "grading_company": card.grading_company,
-                    "cert_number": card.cert_number,
-                    "confidence_score": card_data.get('confidence_score', 0.0),
-                    "dual_side": card_data.get('dual_side', False),
-                    "ocr_sources": card_data.get('ocr_sources', 'front')
-                },
-                "price_data": price_data,
-                "front_image_url": front_image_url,
-                "back_image_url": back_image_url
-            }
-            
-        finally:
-            # Clean up temp files
-            for temp_path in [front_temp_path, back_temp_path]:
-                if temp_path and os.path.exists(temp_path):
-                    os.remove(temp_path)
-                
+        return await card_service.process_dual_side_urls(front_image_url, back_image_url, collection_id, filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/cards/process-batch")
+async def process_card_batch_endpoint(
+    payload: dict,
+    current_user: User = Depends(get_auth_service().get_current_user),
+    card_service: CardService = Depends(get_card_service)
+):
+    """Process many cards for one collection in a single call.
+    
+    Expected JSON payload:
+      {
+        "collection_id": "uuid",
+        "cards": [
+          {"image_url": "https://storage.googleapis.com/bucket/path/a.jpg", "filename": "paul-skenes-front.jpg"},
+          {"front_image_url": "https://.../b-front.jpg", "back_image_url": "https://.../b-back.jpg", "filename": "..."}
+        ]
+      }
+    Cards that fail to download or OCR come back as {"index", "error"} entries.
+    For large binders submit the same payload as a "process-batch" job instead.
+    """
+    collection_id = payload.get("collection_id")
+    cards = payload.get("cards")
+    
+    if not collection_id:
+        raise HTTPException(status_code=400, detail="collection_id is required")
+    if not isinstance(cards, list) or not cards:
+        raise HTTPException(status_code=400, detail="cards must be a non-empty list")
+    
+    try:
+        return await card_service.process_card_batch(collection_id, cards)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/v1/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    payload: dict,
+    current_user: User = Depends(get_auth_service().get_current_user),
+    job_service: JobService = Depends(get_job_service)
+):
+    """Queue card processing and return at once; poll the job or stream its events.
+    
+    Expected JSON payload: "type" plus the fields of the matching endpoint:
+      {"type": "process-url", "image_url": "...", "collection_id": "uuid", "filename": "..."}
+      {"type": "process-dual-side", "front_image_url": "...", "back_image_url": "...", "collection_id": "uuid", "filename": "..."}
+      {"type": "process-batch", "collection_id": "uuid", "cards": [...]}
+    """
+    job_type = payload.get("type")
+    if not job_type:
+        raise HTTPException(status_code=400, detail="type is required")
+    
+    job_payload = {key: value for key, value in payload.items() if key != "type"}
+    job = await run_blocking(job_service.submit, current_user.id, job_type, job_payload)
+    get_job_worker_pool().notify()
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/v1/jobs/{job.id}",
+        "events_url": f"/api/v1/jobs/{job.id}/events"
+    }
+
+@app.get("/api/v1/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_auth_service().get_current_user),
+    job_service: JobService = Depends(get_job_service)
+):
+    """Job status, stage and progress; result holds the processed card once it succeeds"""
+    job = await run_blocking(job_service.get_job, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobService.to_dict(job)
+
+@app.get("/api/v1/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    current_user: User = Depends(get_auth_service().get_current_user),
+    job_service: JobService = Depends(get_job_service)
+):
+    """Server-sent events: 'progress' on each stage change, then 'done' with the final job"""
+    job = await run_blocking(job_service.get_job, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        job_events(job_service, job_id, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/v1/uploads/signed-urls-dual")
 async def generate_dual_signed_urls(
     payload: dict,
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, DateTime, Float, Integer, Text, JSON, Index, func
+import uuid
+
+from src.database import Base
+
+class ProcessingJob(Base):
+    """A queued card-processing request. Workers claim rows with status 'queued'."""
+
+    __tablename__ = "processing_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, nullable=False, index=True)
+    job_type = Column(String, nullable=False)  # e.g., 'process-url', 'process-dual-side'
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    stage = Column(String, nullable=False, default="queued")
+    progress = Column(Float, nullable=False, default=0.0)
+    payload = Column(JSON, nullable=False)
+    result = Column(JSON)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))  # refreshed by the worker while the job runs
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("idx_processing_jobs_status_created_at", "status", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Enum, Text
+from sqlalchemy import Column, String, DateTime, Boolean, Enum, Text, Integer
 from sqlalchemy.sql import func
 import enum
 from sqlalchemy.orm import relationship
@@ -0,0 +1,460 @@
+import heapq
+import os
+import sys
+import threading
+import time
+import weakref
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.services.card_database_service import CardDatabase, on_card_commit
+from src.services.price_memo import invalidate_price_memo
+from src.utils.trigram_index import TrigramIndex, dice, trigrams
+
+# card_database held in process memory so find_card_match needs no database
+# round trip. Rows live in parallel arrays (one entry per row, strings
+# interned), bucketed by player_norm and year. Committed ORM writes in this
+# process are picked up on the next lookup; writes from other processes are
+# picked up every CARD_CATALOG_REFRESH_SECONDS by reading rows whose
+# last_updated moved, and passed on to the price memo. Deletes from other
+# processes are only seen on a reload.
+#   CARD_CATALOG_ENABLED: false answers every lookup with SQL instead
+CARD_CATALOG_ENABLED = os.getenv('CARD_CATALOG_ENABLED', 'true').lower() == 'true'
+CARD_CATALOG_REFRESH_SECONDS = float(os.getenv('CARD_CATALOG_REFRESH_SECONDS', '30'))
+
+# Beyond this many rows changed in-process, reload instead of patching
+FULL_RELOAD_PENDING_ROWS = 10000
+
+# OCR-tolerant matching (CardCatalog.search): player names and set names are
+# compared by trigram similarity, so 'Pau1 Skenas' or 'Topps Chrorne' still
+# find their card. A card's score is the weighted similarity of the fields the
+# query has, lowered a little for a year one off.
+#   FUZZY_MATCH_MIN_SCORE: find_card_match accepts the best candidate at or above this
+FUZZY_MATCH_MIN_SCORE = float(os.getenv('FUZZY_MATCH_MIN_SCORE', '0.75'))
+FUZZY_PLAYER_MIN_SCORE = 0.5  # players below this similarity are not considered
+FUZZY_PLAYER_CANDIDATES = 8
+FUZZY_WEIGHTS = {"player": 0.6, "set": 0.2, "manufacturer": 0.1, "card_number": 0.1}
+FUZZY_YEAR_OFF_BY_ONE = 0.9
+# ...and only if it beats every other player's best card by this much
+FUZZY_MATCH_MARGIN = 0.05
+
+# Glyphs OCR confuses, folded to one form before trigrams are taken
+OCR_CONFUSABLES = [("rn", "m"), ("vv", "w"), ("cl", "d"), ("1", "l"), ("i", "l"), ("0", "o"), ("5", "s"), ("8", "b")]
+ID_CHUNK = 500
+EPOCH = datetime(1970, 1, 1)
+NO_TIMESTAMP = -1 << 63
+
+# Columns read from card_database, in CatalogCard attribute order
+CATALOG_COLUMNS = [
+    CardDatabase.id, CardDatabase.sport, CardDatabase.year, CardDatabase.manufacturer,
+    CardDatabase.set_name, CardDatabase.player_name, CardDatabase.card_number, CardDatabase.parallel,
+    CardDatabase.avg_raw_price, CardDatabase.avg_psa9_price, CardDatabase.avg_psa10_price,
+    CardDatabase.last_updated, CardDatabase.sample_size,
+    CardDatabase.player_norm, CardDatabase.set_norm, CardDatabase.manufacturer_norm,
+]
+
+class CatalogCard:
+    """Read-only snapshot of a card_database row, with the attributes pricing reads"""
+
+    __slots__ = ("id", "sport", "year", "manufacturer", "set_name", "player_name", "card_number", "parallel",
+                 "avg_raw_price", "avg_psa9_price", "avg_psa10_price", "last_updated", "sample_size")
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"<CatalogCard {self.player_name} {self.year} {self.set_name} #{self.card_number}>"
+
+def ocr_key(key: str) -> str:
+    """A normalize_key value with OCR-confusable glyphs folded ('pau1 skenes' -> 'paul skenes')"""
+    for glyphs, folded in OCR_CONFUSABLES:
+        key = key.replace(glyphs, folded)
+    return key
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else (value or "")
+
+class CardCatalog:
+    """
+    In-memory card_database for one engine. Lookups mirror the SQL in
+    CardDatabaseService._exact_match/_fuzzy_match on the same normalized keys.
+    """
+
+    def __init__(self, bind, refresh_interval: float = CARD_CATALOG_REFRESH_SECONDS):
+        self.bind = bind
+        self.session_factory = sessionmaker(bind=bind)
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()          # guards the arrays and buckets
+        self._refresh_lock = threading.Lock()  # one refresher at a time
+        self._loaded = False
+        self._next_refresh = 0.0
+        self._pending_ids = set()
+        self._stats = {"lookups": 0, "hits": 0, "loads": 0, "refreshes": 0, "rows_refreshed": 0,
+                       "searches": 0, "search_hits": 0}
+        self._reset()
+
+    @classmethod
+    def from_rows(cls, rows) -> "CardCatalog":
+        """A fixed catalog of rows already read (CATALOG_COLUMNS tuples); never refreshed"""
+        catalog = cls(None, refresh_interval=float("inf"))
+        with catalog._lock:
+            for row in rows:
+                catalog._apply(row)
+            catalog._loaded = True
+            catalog._next_refresh = float("inf")
+        return catalog
+
+    def _reset(self):
+        self._positions = {}  # id -> row position
+        self._ids = []
+        self._sport = []
+        self._manufacturer = []
+        self._set_name = []
+        self._player_name = []
+        self._card_number = []
+        self._parallel = []
+        self._set_norm = []
+        self._manufacturer_norm = []
+        self._player_norm = []
+        self._year = array('H')
+        self._raw = array('d')
+        self._psa9 = array('d')
+        self._psa10 = array('d')
+        self._updated = array('q')  # microseconds since EPOCH, NO_TIMESTAMP if unknown
+        self._sample_size = array('i')
+        self._buckets = {}  # player_norm -> {year: array of row positions}
+        self._player_index = TrigramIndex()  # over ocr_key(player_norm)
+        self._player_folds = {}  # ocr_key(player_norm) -> player_norm values
+        self._key_grams = {}  # set/manufacturer key -> trigrams of its ocr_key
+        self._watermark = None
+
+    # --- lookups -----------------------------------------------------------
+
+    def find_match(self, player_key: str, year: int, set_keys: Optional[List[str]] = None,
+                   manufacturer_key: Optional[str] = None, card_number: Optional[str] = None,
+                   manufacturer_keys: Optional[Iterable[str]] = None) -> Optional[CatalogCard]:
+        """
+        Exact match on player/year (and set keys, manufacturer substring, card
+        number when given), else player with year ±1 (and a manufacturer key).
+        When several rows qualify the first loaded wins (years ascending for
+        the fuzzy pass); SQL's .first() leaves that choice to the query plan.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            self._stats["lookups"] += 1
+            years = self._buckets.get(player_key)
+            if not years:
+                return None
+
+            for pos in years.get(year, ()):
+                if set_keys is not None and self._set_norm[pos] not in set_keys:
+                    continue
+                if manufacturer_key is not None and manufacturer_key not in self._manufacturer_norm[pos]:
+                    continue
+                if card_number and self._card_number[pos] != card_number:
+                    continue
+                return self._hit(pos)
+
+            manufacturer_keys = set(manufacturer_keys) if manufacturer_keys is not None else None
+            for candidate_year in (year - 1, year, year + 1):
+                for pos in years.get(candidate_year, ()):
+                    if manufacturer_keys is not None and self._manufacturer_norm[pos] not in manufacturer_keys:
+                        continue
+                    return self._hit(pos)
+        return None
+
+    def search(self, player_key: str, year: int, set_keys: Optional[List[str]] = None,
+               manufacturer_key: Optional[str] = None, card_number: Optional[str] = None,
+               limit: int = 5, min_score: float = 0.0) -> List[Tuple[float, CatalogCard]]:
+        """
+        Cards ranked by similarity to an OCR reading, best first, as (score, card).
+        Considers the FUZZY_PLAYER_CANDIDATES most similar players and their
+        cards within a year either side, so the work per lookup is bounded.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            self._stats["searches"] += 1
+            scored = self._score(player_key, year, set_keys, manufacturer_key, card_number)
+            best = heapq.nlargest(limit, ((score, -pos) for score, pos, _ in scored if score >= min_score))
+            if best:
+                self._stats["search_hits"] += 1
+            return [(round(score, 3), self._card(-neg_pos)) for score, neg_pos in best]
+
+    def closest(self, player_key: str, year: int, set_keys: Optional[List[str]] = None,
+                manufacturer_key: Optional[str] = None, card_number: Optional[str] = None,
+                min_score: float = FUZZY_MATCH_MIN_SCORE, margin: float = FUZZY_MATCH_MARGIN) -> Optional[CatalogCard]:
+        """
+        The best card for an OCR reading if it scores min_score and beats every
+        other player's best card by margin; None when the reading is ambiguous.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            self._stats["searches"] += 1
+            scored = self._score(player_key, year, set_keys, manufacturer_key, card_number)
+            if not scored:
+                return None
+            best_score, best_pos, best_player = max(scored, key=lambda item: (item[0], -item[1]))
+            runner_up = max((score for score, _, player in scored if player != best_player), default=0.0)
+            if best_score < min_score or best_score - runner_up < margin:
+                return None
+            self._stats["search_hits"] += 1
+            return self._card(best_pos)
+
+    def _score(self, player_key, year, set_keys, manufacturer_key, card_number) -> List[Tuple[float, int, str]]:
+        """(score, position, player_norm) for every card of the players closest to player_key"""
+        weights = {"player": FUZZY_WEIGHTS["player"]}
+        if set_keys:
+            weights["set"] = FUZZY_WEIGHTS["set"]
+        if manufacturer_key:
+            weights["manufacturer"] = FUZZY_WEIGHTS["manufacturer"]
+        if card_number:
+            weights["card_number"] = FUZZY_WEIGHTS["card_number"]
+        total_weight = sum(weights.values())
+        set_grams = [trigrams(ocr_key(key)) for key in set_keys or ()]
+        manufacturer_grams = trigrams(ocr_key(manufacturer_key or ""))
+        set_scores, manufacturer_scores = {}, {}
+
+        scored = []
+        players = [
+            (player_score, player)
+            for player_score, folded in self._player_index.search(
+                ocr_key(player_key), FUZZY_PLAYER_CANDIDATES, FUZZY_PLAYER_MIN_SCORE)
+            for player in self._player_folds[folded]
+        ]
+        for player_score, player in players:
+            years = self._buckets.get(player)
+            if not years:
+                continue
+            for candidate_year, year_factor in ((year, 1.0), (year - 1, FUZZY_YEAR_OFF_BY_ONE),
+                                                (year + 1, FUZZY_YEAR_OFF_BY_ONE)):
+                for pos in years.get(candidate_year, ()):
+                    score = weights["player"] * player_score
+                    if set_keys:
+                        set_norm = self._set_norm[pos]
+                        if set_norm not in set_scores:
+                            grams = self._grams(set_norm)
+                            set_scores[set_norm] = max(dice(query_grams, grams) for query_grams in set_grams)
+                        score += weights["set"] * set_scores[set_norm]
+                    if manufacturer_key:
+                        manufacturer_norm = self._manufacturer_norm[pos]
+                        if manufacturer_norm not in manufacturer_scores:
+                            manufacturer_scores[manufacturer_norm] = dice(manufacturer_grams, self._grams(manufacturer_norm))
+                        score += weights["manufacturer"] * manufacturer_scores[manufacturer_norm]
+                    if card_number and self._card_number[pos] == card_number:
+                        score += weights["card_number"]
+                    scored.append((score / total_weight * year_factor, pos, player))
+        return scored
+
+    def _grams(self, key: str):
+        grams = self._key_grams.get(key)
+        if grams is None:
+            grams = self._key_grams[key] = frozenset(trigrams(ocr_key(key)))
+        return grams
+
+    def _hit(self, pos) -> CatalogCard:
+        self._stats["hits"] += 1
+        return self._card(pos)
+
+    def _card(self, pos) -> CatalogCard:
+        updated = self._updated[pos]
+        return CatalogCard(
+            self._ids[pos], self._sport[pos], self._year[pos], self._manufacturer[pos], self._set_name[pos],
+            self._player_name[pos], self._card_number[pos], self._parallel[pos],
+            self._raw[pos], self._psa9[pos], self._psa10[pos],
+            None if updated == NO_TIMESTAMP else EPOCH + timedelta(microseconds=updated), self._sample_size[pos],
+        )
+
+    # --- loading and refresh ----------------------------------------------
+
+    def invalidate(self, ids: Iterable[str]):
+        """Rows committed in this process: re-read them on the next lookup"""
+        with self._lock:
+            self._pending_ids.update(ids)
+
+    def due(self) -> bool:
+        """True if the next lookup will (re)load or refresh rows first"""
+        return not self._loaded or bool(self._pending_ids) or time.monotonic() >= self._next_refresh
+
+    def sync(self):
+        """Load or refresh now if due, as every lookup does first"""
+        self._ensure_fresh()
+
+    def _ensure_fresh(self):
+        if not self.due():
+            return
+        # The first load blocks every caller; later refreshes are skipped by
+        # callers that find one already running and answer from the current rows
+        if not self._refresh_lock.acquire(blocking=not self._loaded):
+            return
+        try:
+            if not self._loaded or len(self._pending_ids) > FULL_RELOAD_PENDING_ROWS:
+                self.load()
+            elif self._pending_ids or time.monotonic() >= self._next_refresh:
+                self.refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def load(self):
+        """(Re)load every row"""
+        start = time.perf_counter()
+        with self._lock:
+            self._pending_ids.clear()
+        db = self.session_factory()
+        try:
+            rows = db.query(*CATALOG_COLUMNS).yield_per(5000)
+            with self._lock:
+                self._reset()
+                for row in rows:
+                    self._apply(row)
+                self._loaded = True
+                self._stats["loads"] += 1
+                count = len(self._positions)
+        finally:
+            db.close()
+        self._next_refresh = time.monotonic() + self.refresh_interval
+        if self.bind is not None:
+            invalidate_price_memo(self.bind)
+        print(f"📚 Card catalog loaded {count:,} cards in {time.perf_counter() - start:.2f}s")
+
+    def refresh(self):
+        """Re-read rows changed since the last load/refresh"""
+        with self._lock:
+            pending = list(self._pending_ids)
+            self._pending_ids.clear()
+            watermark = self._watermark
+        seen = set()
+        rows = []
+        db = self.session_factory()
+        try:
+            if watermark is not None:
+                # >= so rows sharing the newest timestamp are not missed; re-applying is harmless
+                rows.extend(db.query(*CATALOG_COLUMNS).filter(CardDatabase.last_updated >= watermark).all())
+            for start in range(0, len(pending), ID_CHUNK):
+                chunk = pending[start:start + ID_CHUNK]
+                rows.extend(db.query(*CATALOG_COLUMNS).filter(CardDatabase.id.in_(chunk)).all())
+        except Exception as e:
+            with self._lock:
+                self._pending_ids.update(pending)
+            print(f"⚠️  Card catalog refresh failed: {e}")
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            for row in rows:
+                self._apply(row)
+                seen.add(row.id)
+            # Pending ids that no longer exist were deleted
+            for card_id in pending:
+                if card_id not in seen:
+                    self._remove(card_id)
+            self._stats["refreshes"] += 1
+            self._stats["rows_refreshed"] += len(rows)
+        self._next_refresh = time.monotonic() + self.refresh_interval
+
+        # Rows written elsewhere since the last refresh (this process's commits
+        # already reached the memo); rows at the old watermark were seen before
+        pending = set(pending)
+        written_elsewhere = {row.id for row in rows if row.id not in pending and row.last_updated
+                             and (watermark is None or row.last_updated > watermark)}
+        if written_elsewhere:
+            invalidate_price_memo(self.bind, written_elsewhere)
+
+    def _apply(self, row):
+        (card_id, sport, year, manufacturer, set_name, player_name, card_number, parallel,
+         raw, psa9, psa10, last_updated, sample_size, player_norm, set_norm, manufacturer_norm) = row
+        player_norm = _intern(player_norm)
+        updated = (last_updated - EPOCH) // timedelta(microseconds=1) if last_updated else NO_TIMESTAMP
+        if last_updated and (self._watermark is None or last_updated > self._watermark):
+            self._watermark = last_updated
+
+        pos = self._positions.get(card_id)
+        if pos is None:
+            pos = len(self._ids)
+            self._positions[card_id] = pos
+            self._ids.append(card_id)
+            for values in (self._sport, self._manufacturer, self._set_name, self._player_name, self._card_number,
+                           self._parallel, self._set_norm, self._manufacturer_norm, self._player_norm):
+                values.append("")
+            for values in (self._year, self._sample_size, self._updated):
+                values.append(0)
+            for values in (self._raw, self._psa9, self._psa10):
+                values.append(0.0)
+        elif self._player_norm[pos] != player_norm or self._year[pos] != year:
+            self._unbucket(pos)
+        else:
+            player_norm = None  # bucket unchanged
+
+        self._sport[pos] = _intern(sport)
+        self._manufacturer[pos] = _intern(manufacturer)
+        self._set_name[pos] = _intern(set_name)
+        self._player_name[pos] = _intern(player_name)
+        self._card_number[pos] = _intern(card_number)
+        self._parallel[pos] = _intern(parallel)
+        self._set_norm[pos] = _intern(set_norm)
+        self._manufacturer_norm[pos] = _intern(manufacturer_norm)
+        self._year[pos] = year
+        self._raw[pos] = raw or 0.0
+        self._psa9[pos] = psa9 or 0.0
+        self._psa10[pos] = psa10 or 0.0
+        self._updated[pos] = updated
+        self._sample_size[pos] = sample_size or 0
+
+        if player_norm is not None:
+            self._player_norm[pos] = player_norm
+            self._buckets.setdefault(player_norm, {}).setdefault(year, array('I')).append(pos)
+            folded = ocr_key(player_norm)
+            self._player_index.add(folded)
+            spellings = self._player_folds.setdefault(folded, [])
+            if player_norm not in spellings:
+                spellings.append(player_norm)
+
+    def _unbucket(self, pos):
+        years = self._buckets.get(self._player_norm[pos], {})
+        positions = years.get(self._year[pos])
+        if positions is not None and pos in positions:
+            positions.remove(pos)
+            if not positions:
+                del years[self._year[pos]]
+                if not years:
+                    del self._buckets[self._player_norm[pos]]
+
+    def _remove(self, card_id):
+        pos = self._positions.pop(card_id, None)
+        if pos is not None:
+            self._unbucket(pos)
+            self._player_norm[pos] = ""
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cards"] = len(self._positions)
+            stats["players_indexed"] = len(self._player_index)
+        stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+        return stats
+
+# One catalog per engine, so each database (and each test database) has its own
+_catalogs = weakref.WeakKeyDictionary()
+_catalogs_lock = threading.Lock()
+
+def get_card_catalog(db: Session) -> Optional[CardCatalog]:
+    """Catalog for the database behind this session, or None when disabled"""
+    if not CARD_CATALOG_ENABLED:
+        return None
+    bind = db.get_bind().engine
+    with _catalogs_lock:
+        catalog = _catalogs.get(bind)
+        if catalog is None:
+            catalog = _catalogs[bind] = CardCatalog(bind)
+    return catalog
+
+# Committed card_database writes in this process re-read their rows on the next lookup
+@on_card_commit
+def _invalidate_committed_cards(bind, ids):
+    catalog = _catalogs.get(bind)
+    if catalog is not None:
+        catalog.invalidate(ids)
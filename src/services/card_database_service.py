@@ -1,12 +1,50 @@
 from typing import Dict, List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, func
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, ForeignKey, Index, event, func
 from datetime import datetime, timedelta
 from fastapi import Depends
+from functools import lru_cache
 import json
 import os
+import asyncio
+import atexit
+import queue
+import threading
+import time
+import unicodedata
+import uuid
 
-from src.database import Base, get_db
+from src.database import Base, get_db, SessionLocal
+from src.services.price_memo import get_price_memo, invalidate_price_memo
+from src.utils.async_io import run_blocking
+
+# Stale-while-revalidate for hybrid pricing: a local price older than
+# PRICE_FRESHNESS_SECONDS is still returned at once (tagged stale) while a
+# background refresh re-prices the card from eBay. Only cards that have never
+# been priced wait on eBay. At most PRICE_REFRESH_CONCURRENCY refreshes run at
+# a time, so they cannot crowd interactive requests off the threadpool.
+PRICE_FRESHNESS_SECONDS = float(os.getenv('PRICE_FRESHNESS_SECONDS', str(60 * 60 * 24 * 7)))  # 7 days
+PRICE_REFRESH_CONCURRENCY = int(os.getenv('PRICE_REFRESH_CONCURRENCY', '2'))
+
+# Live eBay prices are written back into card_database so the next lookup for
+# the same card is a local hit. A background thread applies queued writes in
+# batches of up to PRICE_WRITEBACK_BATCH_SIZE, waiting at most
+# PRICE_WRITEBACK_INTERVAL_SECONDS for a batch to fill.
+PRICE_WRITEBACK_BATCH_SIZE = int(os.getenv('PRICE_WRITEBACK_BATCH_SIZE', '100'))
+PRICE_WRITEBACK_INTERVAL_SECONDS = float(os.getenv('PRICE_WRITEBACK_INTERVAL_SECONDS', '5'))
+
+# Price columns by condition, as accepted by update_card_price
+PRICE_COLUMNS = {
+    "raw": "avg_raw_price",
+    "psa 9": "avg_psa9_price",
+    "psa 10": "avg_psa10_price",
+}
+
+# find_card_matches without the card catalog: players per set-based query
+FIND_MATCHES_PLAYERS_PER_QUERY = 500
+
+KNOWN_MANUFACTURERS = ["Upper Deck", "Topps", "Bowman", "Panini", "Donruss", "Fleer", "Score", "Leaf"]
 
 
 class CardDatabase(Base):
@@ -34,23 +72,133 @@ class CardDatabase(Base):
     search_terms = Column(JSON)  # Alternative names, nicknames, etc.
     card_traits = Column(JSON)   # RC, SP, Auto, etc.
 
+    # Match keys (normalize_key of the display columns), filled on insert/update
+    player_norm = Column(String)
+    set_norm = Column(String)
+    manufacturer_norm = Column(String)
+
+    __table_args__ = (
+        Index("idx_card_database_player_year", "player_norm", "year"),
+        Index("idx_card_database_player_year_set_number", "player_norm", "year", "set_norm", "card_number"),
+    )
+
+
+class CardNameWord(Base):
+    """
+    One word of a card_database row's player_norm. The (word, card_id) key
+    makes a word-prefix search an index range, so "skenes" finds "Paul Skenes".
+    """
+    __tablename__ = "card_database_name_words"
+
+    word = Column(String, primary_key=True)
+    card_id = Column(String, ForeignKey("card_database.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("idx_card_database_name_words_card", "card_id"),
+    )
+
+# Tables to create for a card database
+CARD_DATABASE_TABLES = [CardDatabase.__table__, CardNameWord.__table__]
+
+
+@lru_cache(maxsize=8192)
+def normalize_key(text) -> str:
+    """
+    Match key for names: accents stripped, lowercased, apostrophes and periods
+    dropped, other punctuation as spaces ("Ronald Acuña Jr." -> "ronald acuna jr").
+    Memoized: lookups normalize the same brand and set names over and over.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = text.replace("'", "").replace("\u2019", "").replace(".", "")
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in text).split())
+
+
+@event.listens_for(CardDatabase, "before_insert")
+@event.listens_for(CardDatabase, "before_update")
+def _set_match_keys(mapper, connection, card):
+    card.player_norm = normalize_key(card.player_name)
+    card.set_norm = normalize_key(card.set_name)
+    card.manufacturer_norm = normalize_key(card.manufacturer)
+
+
+def name_words(player_norm: str) -> List[str]:
+    """Distinct words of a player_norm, as stored in card_database_name_words"""
+    return sorted(set((player_norm or "").split()))
+
+@event.listens_for(CardDatabase, "after_insert")
+def _insert_name_words(mapper, connection, card):
+    words = name_words(card.player_norm)
+    if words:
+        connection.execute(CardNameWord.__table__.insert(), [{"word": word, "card_id": card.id} for word in words])
+
+@event.listens_for(CardDatabase, "after_update")
+def _update_name_words(mapper, connection, card):
+    if not get_history(card, "player_name").has_changes():
+        return
+    connection.execute(CardNameWord.__table__.delete().where(CardNameWord.card_id == card.id))
+    _insert_name_words(mapper, connection, card)
+
+@event.listens_for(CardDatabase, "after_delete")
+def _delete_name_words(mapper, connection, card):
+    connection.execute(CardNameWord.__table__.delete().where(CardNameWord.card_id == card.id))
+
+
+# Committed card_database writes in this process (update_card_price,
+# write-back, seed scripts) are reported to these listeners as
+# (engine, card ids): the price memo, and the card catalog once loaded
+_card_commit_listeners = []
+CARDS_WRITTEN_KEY = "card_database_written"
+
+def on_card_commit(listener):
+    """Call listener(engine, card ids) after each commit that wrote card_database rows"""
+    _card_commit_listeners.append(listener)
+    return listener
+
+@event.listens_for(CardDatabase, "after_insert")
+@event.listens_for(CardDatabase, "after_update")
+@event.listens_for(CardDatabase, "after_delete")
+def _track_card_write(mapper, connection, card):
+    session = object_session(card)
+    if session is not None:
+        session.info.setdefault(CARDS_WRITTEN_KEY, {}).setdefault(connection.engine, set()).add(card.id)
+
+@event.listens_for(Session, "after_commit")
+def _report_committed_cards(session):
+    for bind, ids in session.info.pop(CARDS_WRITTEN_KEY, {}).items():
+        for listener in _card_commit_listeners:
+            listener(bind, ids)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_cards(session):
+    session.info.pop(CARDS_WRITTEN_KEY, None)
+
+on_card_commit(invalidate_price_memo)
+
 
 class CardDatabaseService:
     def __init__(self, db: Session):
         self.db = db
-        self.cache = {}  # In-memory cache for frequent lookups
         
     def find_card_match(self, card_data: Dict) -> Optional[CardDatabase]:
         """
         Find a match in the local card database for faster pricing.
-        Uses fuzzy matching for player names and sets.
+        Uses fuzzy matching for player names and sets. Answered from the
+        in-memory card catalog (a CatalogCard) unless CARD_CATALOG_ENABLED is off.
         """
+        from src.services.card_catalog import get_card_catalog
+        catalog = get_card_catalog(self.db)
+        if catalog is not None:
+            return self._catalog_match(catalog, card_data)
+
         # Extract key search parameters
-        player = card_data.get('player', '').strip()
+        player = (card_data.get('player') or '').strip()
         year = self._extract_year(card_data.get('year'))
-        set_name = card_data.get('set', '').strip()
-        manufacturer = card_data.get('manufacturer', '').strip()
-        card_number = card_data.get('card_number', '').strip()
+        set_name = (card_data.get('set') or '').strip()
+        manufacturer = (card_data.get('manufacturer') or '').strip()
+        card_number = (card_data.get('card_number') or '').strip()
         
         if not player or not year:
             return None
@@ -64,38 +212,144 @@ class CardDatabaseService:
         fuzzy_match = self._fuzzy_match(player, year, set_name, manufacturer)
         return fuzzy_match
     
+    def find_card_matches(self, cards: List[Dict]) -> List[Optional[CardDatabase]]:
+        """
+        find_card_match for many cards at once; matches in input order. From
+        the card catalog this makes no queries. With the catalog disabled, the
+        rows of every player read are fetched set-wise, one query per
+        FIND_MATCHES_PLAYERS_PER_QUERY players, and matched in memory
+        (exact and year-widened passes, as the SQL lookups).
+        """
+        from src.services.card_catalog import get_card_catalog
+        catalog = get_card_catalog(self.db)
+        if catalog is not None:
+            return [self._safe_catalog_match(catalog, card_data) for card_data in cards]
+        catalog = self._catalog_slice(cards)
+        return [self._safe_catalog_match(catalog, card_data, ocr=False) for card_data in cards]
+
+    def _safe_catalog_match(self, catalog, card_data: Dict, ocr: bool = True):
+        """_catalog_match, with a card that cannot be matched (malformed OCR fields) counted as no match"""
+        try:
+            return self._catalog_match(catalog, card_data, ocr=ocr)
+        except Exception as e:
+            print(f"⚠️  Card match failed for {card_data.get('player')!r}: {e}")
+            return None
+
+    def _catalog_match(self, catalog, card_data: Dict, ocr: bool = True):
+        player = (card_data.get('player') or '').strip()
+        year = self._extract_year(card_data.get('year'))
+        set_name = (card_data.get('set') or '').strip()
+        manufacturer = (card_data.get('manufacturer') or '').strip()
+        card_number = (card_data.get('card_number') or '').strip()
+
+        if not player or not year:
+            return None
+
+        set_keys = self._set_keys(set_name, manufacturer) if set_name else None
+        manufacturer_key = normalize_key(manufacturer) if manufacturer else None
+        match = catalog.find_match(
+            normalize_key(player), year, set_keys=set_keys, manufacturer_key=manufacturer_key,
+            card_number=card_number,
+            manufacturer_keys={normalize_key(v) for v in self._get_manufacturer_variants(manufacturer)} if manufacturer else None,
+        )
+        if match or not ocr:
+            return match
+        # OCR-noisy names: the closest card by trigram similarity, if it is clearly the one
+        return catalog.closest(normalize_key(player), year, set_keys=set_keys,
+                               manufacturer_key=manufacturer_key, card_number=card_number)
+
+    def _catalog_slice(self, cards: List[Dict]):
+        """A CardCatalog of just the rows these cards could match (their players, years ±1)"""
+        from src.services.card_catalog import CATALOG_COLUMNS, CardCatalog
+        years_by_player = {}
+        for card_data in cards:
+            player = normalize_key(card_data.get('player'))
+            year = self._extract_year(card_data.get('year'))
+            if player and year:
+                years_by_player.setdefault(player, set()).add(year)
+
+        players = sorted(years_by_player)
+        rows = []
+        for start in range(0, len(players), FIND_MATCHES_PLAYERS_PER_QUERY):
+            chunk = players[start:start + FIND_MATCHES_PLAYERS_PER_QUERY]
+            years = set().union(*(years_by_player[player] for player in chunk))
+            rows.extend(self.db.query(*CATALOG_COLUMNS).filter(
+                CardDatabase.player_norm.in_(chunk),
+                CardDatabase.year.between(min(years) - 1, max(years) + 1),
+            ).all())
+        return CardCatalog.from_rows(rows)
+
+    def find_card_candidates(self, card_data: Dict, limit: int = 5, min_score: float = 0.0) -> List[Tuple[float, CardDatabase]]:
+        """
+        Cards ranked by how closely they resemble card_data, as (score, card)
+        with score 0.0-1.0, tolerant of OCR typos in player and set names.
+        Needs the in-memory card catalog; empty when it is disabled.
+        """
+        from src.services.card_catalog import get_card_catalog
+        player = normalize_key(card_data.get('player'))
+        year = self._extract_year(card_data.get('year'))
+        catalog = get_card_catalog(self.db)
+        if not player or not year or catalog is None:
+            return []
+        set_name = (card_data.get('set') or '').strip()
+        manufacturer = (card_data.get('manufacturer') or '').strip()
+        return catalog.search(
+            player, year,
+            set_keys=self._set_keys(set_name, manufacturer) if set_name else None,
+            manufacturer_key=normalize_key(manufacturer) or None,
+            card_number=(card_data.get('card_number') or '').strip(),
+            limit=limit, min_score=min_score,
+        )
+
     def _exact_match(self, player: str, year: int, set_name: str, 
                     manufacturer: str, card_number: str) -> Optional[CardDatabase]:
-        """Attempt exact database match"""
+        """Attempt exact database match (index seek on player_norm, year, set_norm, card_number)"""
+        return self._exact_query(player, year, set_name, manufacturer, card_number).first()
+
+    def _exact_query(self, player: str, year: int, set_name: str, manufacturer: str, card_number: str):
         query = self.db.query(CardDatabase).filter(
-            CardDatabase.player_name.ilike(f"%{player}%"),
+            CardDatabase.player_norm == normalize_key(player),
             CardDatabase.year == year
         )
         
         if set_name:
-            query = query.filter(CardDatabase.set_name.ilike(f"%{set_name}%"))
+            query = query.filter(CardDatabase.set_norm.in_(self._set_keys(set_name, manufacturer)))
         if manufacturer:
-            query = query.filter(CardDatabase.manufacturer.ilike(f"%{manufacturer}%"))
+            query = query.filter(CardDatabase.manufacturer_norm.contains(normalize_key(manufacturer)))
         if card_number:
             query = query.filter(CardDatabase.card_number == card_number)
             
-        return query.first()
+        return query
     
     def _fuzzy_match(self, player: str, year: int, set_name: str, 
                     manufacturer: str) -> Optional[CardDatabase]:
-        """Attempt fuzzy matching with broader criteria"""
+        """Attempt fuzzy matching with broader criteria (index range on player_norm, year)"""
+        return self._fuzzy_query(player, year, manufacturer).first()
+
+    def _fuzzy_query(self, player: str, year: int, manufacturer: str):
         # Year range matching (±1 year for sets that span years)
         query = self.db.query(CardDatabase).filter(
-            CardDatabase.player_name.ilike(f"%{player}%"),
+            CardDatabase.player_norm == normalize_key(player),
             CardDatabase.year.between(year - 1, year + 1)
         )
         
         # Manufacturer matching with alternatives
         if manufacturer:
             manufacturer_variants = self._get_manufacturer_variants(manufacturer)
-            query = query.filter(CardDatabase.manufacturer.in_(manufacturer_variants))
+            query = query.filter(CardDatabase.manufacturer_norm.in_({normalize_key(v) for v in manufacturer_variants}))
             
-        return query.first()
+        return query
+
+    def _set_keys(self, set_name: str, manufacturer: str) -> List[str]:
+        """set_norm values that mean this set: as read, and without a leading brand ('Topps Chrome' -> 'chrome')"""
+        set_key = normalize_key(set_name)
+        keys = [set_key]
+        for brand in [manufacturer] + KNOWN_MANUFACTURERS:
+            brand_key = normalize_key(brand)
+            if brand_key and set_key.startswith(brand_key + " "):
+                keys.append(set_key[len(brand_key) + 1:])
+                break
+        return keys
     
     def _get_manufacturer_variants(self, manufacturer: str) -> List[str]:
         """Get alternative manufacturer names"""
@@ -111,7 +365,8 @@ class CardDatabaseService:
             
         return variants
     
-    def _extract_year(self, year_str: str) -> Optional[int]:
+    @staticmethod
+    def _extract_year(year_str: str) -> Optional[int]:
         """Extract year from various formats"""
         if isinstance(year_str, int):
             return year_str
@@ -130,8 +385,10 @@ class CardDatabaseService:
         card_match = self.find_card_match(card_data)
         if not card_match:
             return None
-            
-        # Get price based on condition
+        return self._price_for_condition(card_match, condition)
+
+    def _price_for_condition(self, card_match: CardDatabase, condition: str) -> Optional[float]:
+        """Get price based on condition"""
         if condition.lower() == "psa 10":
             return card_match.avg_psa10_price if card_match.avg_psa10_price > 0 else None
         elif condition.lower() == "psa 9":
@@ -176,10 +433,19 @@ class CardDatabaseService:
         ).order_by(CardDatabase.avg_psa10_price.desc()).limit(limit).all()
     
     def search_cards(self, query: str, sport: str = None, year: int = None) -> List[CardDatabase]:
-        """Search cards by player name or set"""
-        db_query = self.db.query(CardDatabase).filter(
-            CardDatabase.player_name.ilike(f"%{query}%")
-        )
+        """
+        Search cards by player name: every query word must start a word of the
+        name, so "skenes" and "paul sk" both find Paul Skenes (an index range
+        on card_database_name_words per query word)
+        """
+        words = normalize_key(query).split()
+        if not words:
+            return []
+        db_query = self.db.query(CardDatabase)
+        for word in words:
+            db_query = db_query.filter(CardDatabase.id.in_(
+                self.db.query(CardNameWord.card_id).filter(CardNameWord.word >= word, CardNameWord.word < word + "\uffff")
+            ))
         
         if sport:
             db_query = db_query.filter(CardDatabase.sport == sport)
@@ -189,37 +455,353 @@ class CardDatabaseService:
         return db_query.limit(50).all()
 
 
+def price_condition(card_data: Dict) -> Optional[str]:
+    """Condition whose price column describes this card: raw, psa 9, psa 10, or None for other grades"""
+    if not card_data.get('graded'):
+        return "raw"
+    company = (card_data.get('grading_company') or 'PSA').strip().upper()
+    try:
+        grade = float(card_data.get('grade'))
+    except (TypeError, ValueError):
+        return None
+    if company == 'PSA' and grade in (9, 10):
+        return f"psa {int(grade)}"
+    return None
+
+
+class CardPriceWriteBack:
+    """
+    Queues live eBay prices and upserts them into card_database off the
+    request path. Each batch is one session and one commit: existing rows are
+    loaded with a single query, matched on player/year/set/number/parallel,
+    and updated in the column for the card's condition; unknown cards get a
+    new row.
+    """
+
+    _STOP = object()
+
+    def __init__(self, session_factory=SessionLocal, batch_size: int = PRICE_WRITEBACK_BATCH_SIZE,
+                 interval: float = PRICE_WRITEBACK_INTERVAL_SECONDS):
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"queued": 0, "skipped": 0, "inserted": 0, "updated": 0, "batches": 0, "errors": 0}
+
+    def submit(self, card_data: Dict, pricing_data: Dict) -> bool:
+        """Queue a write; False if the card cannot be stored (no player/year, or a grade without a column)"""
+        entry = self._entry(card_data, pricing_data)
+        with self._lock:
+            self._stats["skipped" if entry is None else "queued"] += 1
+        if entry is None:
+            return False
+        self._ensure_started()
+        self._queue.put(entry)
+        return True
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Block until everything queued so far is written"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 30.0):
+        """Write what is queued, then end the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    @staticmethod
+    def _entry(card_data: Dict, pricing_data: Dict) -> Optional[Dict]:
+        player = (card_data.get('player') or '').strip()
+        year = CardDatabaseService._extract_year(card_data.get('year'))
+        condition = price_condition(card_data)
+        price = pricing_data.get('average_sold_price')
+        if not player or not year or condition is None or not price:
+            return None
+        set_name = (card_data.get('set') or '').strip()
+        return {
+            'player_name': player,
+            'year': year,
+            'set_name': set_name,
+            'card_number': str(card_data.get('card_number') or '').strip(),
+            'parallel': (card_data.get('parallel') or '').strip(),
+            'manufacturer': (card_data.get('manufacturer') or '').strip() or _manufacturer_from_set(set_name),
+            'sport': (card_data.get('sport') or '').strip(),
+            'rookie': bool(card_data.get('rookie', False)),
+            'condition': condition,
+            'price': price,
+            'sample_size': pricing_data.get('sample_size', 0),
+        }
+
+    @staticmethod
+    def _identity(player_name, year, set_name, card_number, parallel) -> Tuple:
+        return (normalize_key(player_name), year, normalize_key(set_name),
+                (card_number or '').lower(), (parallel or '').lower())
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="card-price-writeback", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self):
+        while True:
+            batch, waiters, stopping = [], [], False
+            item = self._queue.get()
+            deadline = time.monotonic() + self.interval
+            while True:
+                if item is self._STOP:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stopping:
+                return
+
+    def _write_batch(self, batch: List[Dict]):
+        # Last write wins for the same card and condition
+        latest = {}
+        for entry in batch:
+            identity = self._identity(entry['player_name'], entry['year'], entry['set_name'],
+                                      entry['card_number'], entry['parallel'])
+            latest[(identity, entry['condition'])] = entry
+
+        db = self.session_factory()
+        inserted = updated = 0
+        try:
+            rows = db.query(CardDatabase).filter(
+                CardDatabase.player_norm.in_({identity[0] for identity, _ in latest}),
+                CardDatabase.year.in_({identity[1] for identity, _ in latest}),
+            ).all()
+            rows_by_identity = {}
+            for row in rows:
+                identity = self._identity(row.player_name, row.year, row.set_name, row.card_number, row.parallel)
+                rows_by_identity.setdefault(identity, row)
+
+            now = datetime.utcnow()
+            for (identity, condition), entry in latest.items():
+                row = rows_by_identity.get(identity)
+                if row is None:
+                    row = CardDatabase(
+                        id=str(uuid.uuid4()),
+                        sport=entry['sport'],
+                        year=entry['year'],
+                        manufacturer=entry['manufacturer'],
+                        set_name=entry['set_name'],
+                        player_name=entry['player_name'],
+                        card_number=entry['card_number'],
+                        parallel=entry['parallel'],
+                        rookie=entry['rookie'],
+                        avg_raw_price=0.0,
+                        avg_psa9_price=0.0,
+                        avg_psa10_price=0.0,
+                        search_terms={"nicknames": [], "variations": []},
+                        card_traits={"rookie": entry['rookie'], "parallel": entry['parallel'] != ""},
+                    )
+                    db.add(row)
+                    rows_by_identity[identity] = row
+                    inserted += 1
+                else:
+                    updated += 1
+                setattr(row, PRICE_COLUMNS[condition], entry['price'])
+                row.sample_size = entry['sample_size']
+                row.last_updated = now
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️  Card price write-back failed for {len(latest)} cards: {e}")
+            with self._lock:
+                self._stats["errors"] += 1
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self._stats["inserted"] += inserted
+            self._stats["updated"] += updated
+            self._stats["batches"] += 1
+        print(f"💾 Wrote back {len(latest)} live prices to the card database ({inserted} new, {updated} updated)")
+
+
+def _manufacturer_from_set(set_name: str) -> str:
+    set_lower = set_name.lower()
+    for manufacturer in KNOWN_MANUFACTURERS:
+        if manufacturer.lower() in set_lower:
+            return manufacturer
+    return ""
+
+
+_price_writeback = None
+_price_writeback_lock = threading.Lock()
+
+def get_price_writeback() -> CardPriceWriteBack:
+    global _price_writeback
+    if _price_writeback is None:
+        with _price_writeback_lock:
+            if _price_writeback is None:
+                _price_writeback = CardPriceWriteBack()
+    return _price_writeback
+
+def set_price_writeback(writeback: Optional[CardPriceWriteBack]):
+    """Swap in another writer (e.g. a different database, or a test double)."""
+    global _price_writeback
+    with _price_writeback_lock:
+        _price_writeback = writeback
+
+
 class HybridPricingService:
     """
     Combines local database with eBay API for optimal pricing strategy.
     Uses local DB for common cards, eBay API for rare/unknown cards.
     """
     
-    def __init__(self, db: Session):
+    # Shared by every instance (one is built per request): card ids being
+    # refreshed, and strong references to the running refresh tasks
+    _refreshing = set()
+    _refresh_tasks = set()
+    _refresh_semaphore = None
+
+    def __init__(self, db: Session, session_factory=SessionLocal,
+                 freshness_seconds: float = PRICE_FRESHNESS_SECONDS):
         self.db = db
         self.card_db_service = CardDatabaseService(db)
+        # Background refreshes outlive the request, so they open their own sessions
+        self.session_factory = session_factory
+        self.freshness_seconds = freshness_seconds
+        # A Session is not thread-safe: concurrent get_card_price calls (bulk
+        # ingestion) take turns on it instead of querying from several threads
+        self._db_lock = asyncio.Lock()
         
     async def get_card_price(self, card_data: Dict) -> Dict:
         """
         Intelligent pricing that tries local DB first, falls back to eBay API.
+        The database lookup and eBay scraping block, so both run on the
+        card-processing threadpool instead of the event loop.
+        A local price past its freshness window is returned as-is, tagged
+        stale, and refreshed in the background.
         """
-        # Try local database first (instant response)
-        local_price = self.card_db_service.get_estimated_price(card_data)
-        
-        if local_price and local_price > 0:
-            return {
-                'source': 'local_database',
-                'estimated_value': local_price,
-                'confidence': 'high',
-                'last_updated': 'recent',
-                'method': 'database_lookup'
-            }
-        
+        return (await self.get_card_prices([card_data]))[0]
+
+    async def get_card_prices(self, cards: List[Dict], ebay_concurrency: Optional[int] = None) -> List[Dict]:
+        """
+        get_card_price for many cards, in input order. Cards in the price memo
+        skip matching; the rest are matched with one find_card_matches call and
+        memoized. Cards without a local price go to eBay, at most
+        ebay_concurrency at a time (unbounded if None).
+        """
+        from src.services.card_catalog import get_card_catalog
+
+        # Try local database first (instant response); graded PSA 9/10 cards read their own column
+        conditions = [price_condition(card_data) or "raw" for card_data in cards]
+        bind = self.db.get_bind().engine
+        memo = get_price_memo(bind)
+        catalog = get_card_catalog(self.db)
+        if catalog is not None and catalog.due():
+            # Memo hits skip the catalog, so it passes on writes from other processes here
+            await run_blocking(catalog.sync)
+
+        keys = [self._memo_key(card_data, condition) for card_data, condition in zip(cards, conditions)]
+        prices = [None] * len(cards)
+        unmemoized = []
+        for i, key in enumerate(keys):
+            found, prices[i] = memo.get(key)
+            if not found:
+                unmemoized.append(i)
+        if unmemoized:
+            version = memo.version()
+            async with self._db_lock:
+                matches = await run_blocking(self.card_db_service.find_card_matches, [cards[i] for i in unmemoized])
+            for i, card_match in zip(unmemoized, matches):
+                prices[i] = self._local_price(card_match, conditions[i])
+                memo.set(keys[i], prices[i], version)
+
+        results = [self._local_price_result(card_data, condition, local_price)
+                   for card_data, condition, local_price in zip(cards, conditions, prices)]
+
         # Fall back to eBay API for unknown cards
+        semaphore = asyncio.Semaphore(ebay_concurrency) if ebay_concurrency else None
+
+        async def price_from_ebay(card_data):
+            if semaphore is None:
+                return await self._ebay_price_result(card_data)
+            async with semaphore:
+                return await self._ebay_price_result(card_data)
+
+        misses = [i for i, result in enumerate(results) if result is None]
+        for i, result in zip(misses, await asyncio.gather(*(price_from_ebay(cards[i]) for i in misses))):
+            results[i] = result
+        return results
+
+    @staticmethod
+    def _memo_key(card_data: Dict, condition: str) -> Tuple:
+        """The price memo key: what find_card_match reads of card_data, normalized"""
+        return (
+            normalize_key(card_data.get('player')),
+            CardDatabaseService._extract_year(card_data.get('year')),
+            normalize_key(card_data.get('set')),
+            normalize_key(card_data.get('manufacturer')),
+            str(card_data.get('card_number') or '').strip(),
+            condition,
+        )
+
+    def _local_price(self, card_match, condition: str) -> Optional[Tuple]:
+        """(card id, price, last_updated) of a matched card, or None if it has no price for condition"""
+        if not card_match:
+            return None
+        local_price = self.card_db_service._price_for_condition(card_match, condition)
+        if not local_price or local_price <= 0:
+            return None
+        return card_match.id, local_price, card_match.last_updated
+
+    def _local_price_result(self, card_data: Dict, condition: str, local: Optional[Tuple]) -> Optional[Dict]:
+        """The local database answer for a card (a _local_price value), or None if it has no local price"""
+        if local is None:
+            return None
+        card_id, local_price, last_updated = local
+        stale = self._is_stale(last_updated)
+        if stale:
+            self._schedule_refresh(card_id, card_data, condition)
+        return {
+            'source': 'local_database',
+            'estimated_value': local_price,
+            'confidence': 'medium' if stale else 'high',
+            'last_updated': last_updated.isoformat() if last_updated else None,
+            'stale': stale,
+            'method': 'database_lookup'
+        }
+
+    async def _ebay_price_result(self, card_data: Dict) -> Dict:
         from src.utils.price_finder import research_all_prices
         
         try:
-            results = research_all_prices([card_data])
+            results = await run_blocking(research_all_prices, [card_data])
             if results and results[0].get('pricing_data'):
                 pricing_data = results[0]['pricing_data']
                 
@@ -244,10 +826,57 @@ class HybridPricingService:
             'method': 'default_estimate'
         }
     
+    def _is_stale(self, last_updated: Optional[datetime]) -> bool:
+        if last_updated is None:
+            return True
+        return datetime.utcnow() - last_updated > timedelta(seconds=self.freshness_seconds)
+
+    def _schedule_refresh(self, card_id: str, card_data: Dict, condition: str = "raw") -> bool:
+        """Queue a background re-price of card_id unless one is already pending"""
+        if (card_id, condition) in HybridPricingService._refreshing:
+            return False
+        HybridPricingService._refreshing.add((card_id, condition))
+        task = asyncio.get_running_loop().create_task(self._refresh_card_price(card_id, dict(card_data), condition))
+        HybridPricingService._refresh_tasks.add(task)
+        task.add_done_callback(HybridPricingService._refresh_tasks.discard)
+        return True
+
+    @classmethod
+    def _get_refresh_semaphore(cls) -> asyncio.Semaphore:
+        if cls._refresh_semaphore is None:
+            cls._refresh_semaphore = asyncio.Semaphore(PRICE_REFRESH_CONCURRENCY)
+        return cls._refresh_semaphore
+
+    async def _refresh_card_price(self, card_id: str, card_data: Dict, condition: str = "raw"):
+        """Re-price a stale card from eBay and store it on its card_database row"""
+        from src.utils.price_finder import research_all_prices
+
+        try:
+            async with self._get_refresh_semaphore():
+                results = await run_blocking(research_all_prices, [card_data])
+                pricing_data = results[0].get('pricing_data') if results else None
+                if not pricing_data:
+                    print(f"⚠️  Background refresh found no sold listings for card {card_id}; keeping the stale price")
+                    return
+                await run_blocking(self._store_refreshed_price, card_id, condition, pricing_data)
+                print(f"🔄 Refreshed stale price for card {card_id}: ${pricing_data['average_sold_price']}")
+        except Exception as e:
+            print(f"⚠️  Background price refresh failed for card {card_id}: {e}")
+        finally:
+            HybridPricingService._refreshing.discard((card_id, condition))
+
+    def _store_refreshed_price(self, card_id: str, condition: str, pricing_data: Dict):
+        db = self.session_factory()
+        try:
+            CardDatabaseService(db).update_card_price(
+                card_id, condition, pricing_data['average_sold_price'], pricing_data.get('sample_size', 1)
+            )
+        finally:
+            db.close()
+
     def _cache_price_result(self, card_data: Dict, pricing_data: Dict):
-        """Cache eBay results in local database for future use"""
-        # Implementation to save eBay results to local database
-        pass
+        """Cache eBay results in local database for future use (queued, written in batches)"""
+        get_price_writeback().submit(card_data, pricing_data)
 
 
 # Dependencies
@@ -1,4 +1,6 @@
 from typing import List, Optional
+import os
+import asyncio
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException, Depends
 import uuid
@@ -6,12 +8,29 @@ import uuid
 from src.database import get_db
 from src.models.card import Card, CardImage
 from src.models.collection import Collection
+from src.models.price_history import CardPriceHistory
 from src.schemas.card import CardCreate, CardUpdate
 from .price_service import PriceService
 from .card_database_service import HybridPricingService, get_hybrid_pricing_service
 from src.utils.card_processor import process_all_images
 from src.utils.gcs_url_generator import get_gcs_image_urls
 from src.utils.price_finder import research_all_prices
+from src.utils.async_io import run_blocking, download
+from src.utils.ocr_pool import OCR_MAX_WORKERS
+
+# Bulk ingestion: cards per request, how many cards are between download and
+# the end of OCR at once (so downloaded images held in memory are bounded by
+# this, not by the batch size), and how many distinct pricing lookups run at
+# once. OCR is bounded by CARD_PROCESSING_MAX_THREADS, and dual-side cards by
+# the shared OCR pool: each holds two of its OCR_MAX_WORKERS.
+BULK_MAX_CARDS = int(os.getenv('BULK_MAX_CARDS', '500'))
+BULK_CARDS_IN_FLIGHT = int(os.getenv('BULK_CARDS_IN_FLIGHT', '16'))
+BULK_PRICING_CONCURRENCY = int(os.getenv('BULK_PRICING_CONCURRENCY', '4'))
+
+# Card fields that decide the hybrid price (local DB match and eBay query);
+# cards that agree on all of them share one pricing lookup in a batch
+PRICING_KEY_FIELDS = ('player', 'year', 'set', 'manufacturer', 'card_number', 'parallel', 'features',
+                      'graded', 'grading_company', 'grade')
 
 class CardService:
     def __init__(self, db: Session):
@@ -21,148 +40,539 @@ class CardService:
 
     async def process_card_image(self, file: UploadFile, collection_id: str, user_id: str) -> dict:
         import os
-        import tempfile
         from src.utils.enhanced_card_processor import process_all_images_enhanced
         
-        # Create temporary directory if it doesn't exist
-        os.makedirs("temp", exist_ok=True)
+        # OCR straight from the upload bytes; the image is written to disk once, to its permanent location
+        content = await file.read()
+        # Process image using enhanced OCR
+        processed_cards = process_all_images_enhanced([(file.filename, content)])
+        if processed_cards and len(processed_cards) > 0:
+            card_data = processed_cards[0]
+        else:
+            # If OCR returns no results, create basic card structure
+            card_data = {
+                "player": "Unknown Player",
+                "set": "Unknown Set",
+                "year": "Unknown",
+                "card_number": "",
+                "parallel": "",
+                "manufacturer": "Unknown",
+                "features": "",
+                "graded": False,
+                "grade": "",
+                "grading_company": "",
+                "cert_number": "",
+                "filename": file.filename
+            }
+        
+        # 🚀 NEW: Use hybrid pricing (local DB + eBay fallback)
+        print(f"🔍 Getting price for: {card_data.get('player')} {card_data.get('set')} {card_data.get('year')}")
         
-        # Save image to temporary location
-        temp_path = f"temp/{file.filename}"
         try:
-            with open(temp_path, "wb") as buffer:
-                content = await file.read()
-                buffer.write(content)
-
-            # For now, create a mock card data structure for testing
-            # TODO: Replace with actual OCR processing when Google Cloud credentials are set up
+            hybrid_pricing_result = await self.hybrid_pricing_service.get_card_price(card_data)
             
-            # Process image using enhanced OCR
-            processed_cards = process_all_images_enhanced([temp_path])
-            if processed_cards and len(processed_cards) > 0:
-                card_data = processed_cards[0]
-            else:
-                # If OCR returns no results, create basic card structure
-                card_data = {
-                    "player": "Unknown Player",
-                    "set": "Unknown Set",
-                    "year": "Unknown",
-                    "card_number": "",
-                    "parallel": "",
-                    "manufacturer": "Unknown",
-                    "features": "",
-                    "graded": False,
-                    "grade": "",
-                    "grading_company": "",
-                    "cert_number": "",
-                    "filename": file.filename
-                }
+            price_data = {
+                "estimated_value": hybrid_pricing_result.get('estimated_value', 0.0),
+                "listing_price": hybrid_pricing_result.get('estimated_value', 0.0) * 1.15,  # 15% markup
+                "confidence": hybrid_pricing_result.get('confidence', 'unknown'),
+                "source": hybrid_pricing_result.get('source', 'unknown'),
+                "method": hybrid_pricing_result.get('method', 'unknown'),
+                "sample_size": hybrid_pricing_result.get('sample_size', 0),
+                "stale": hybrid_pricing_result.get('stale', False),
+                "search_query": f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
+            }
             
-            # 🚀 NEW: Use hybrid pricing (local DB + eBay fallback)
-            print(f"🔍 Getting price for: {card_data.get('player')} {card_data.get('set')} {card_data.get('year')}")
+            print(f"✅ Price found via {hybrid_pricing_result.get('source')}: ${hybrid_pricing_result.get('estimated_value', 0)}")
             
-            try:
-                hybrid_pricing_result = await self.hybrid_pricing_service.get_card_price(card_data)
-                
-                price_data = {
-                    "estimated_value": hybrid_pricing_result.get('estimated_value', 0.0),
-                    "listing_price": hybrid_pricing_result.get('estimated_value', 0.0) * 1.15,  # 15% markup
-                    "confidence": hybrid_pricing_result.get('confidence', 'unknown'),
-                    "source": hybrid_pricing_result.get('source', 'unknown'),
-                    "method": hybrid_pricing_result.get('method', 'unknown'),
-                    "sample_size": hybrid_pricing_result.get('sample_size', 0),
-                    "search_query": f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
-                }
-                
-                print(f"✅ Price found via {hybrid_pricing_result.get('source')}: ${hybrid_pricing_result.get('estimated_value', 0)}")
-                
-            except Exception as pricing_error:
-                print(f"❌ Hybrid pricing failed: {pricing_error}")
-                # Ultimate fallback
-                price_data = {
+        except Exception as pricing_error:
+            print(f"❌ Hybrid pricing failed: {pricing_error}")
+            # Ultimate fallback
+            price_data = {
+                "estimated_value": 1.0,
+                "listing_price": 1.15,
+                "confidence": "low",
+                "source": "fallback",
+                "method": "default",
+                "sample_size": 0,
+                "search_query": f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
+            }
+
+        # Create card record
+        card = Card(
+            collection_id=collection_id,
+            player_name=card_data.get('player', ''),
+            set_name=card_data.get('set', ''),
+            year=card_data.get('year', ''),
+            card_number=card_data.get('card_number', ''),
+            parallel=card_data.get('parallel', ''),
+            manufacturer=card_data.get('manufacturer', ''),
+            features=card_data.get('features', ''),
+            graded=card_data.get('graded', False),
+            grade=card_data.get('grade', ''),
+            grading_company=card_data.get('grading_company', ''),
+            cert_number=card_data.get('cert_number', ''),
+            price_data=price_data or {}
+        )
+        self.db.add(card)
+        self.db.commit()
+        self.db.refresh(card)
+
+        # Persist the initial price point to history
+        if price_data and isinstance(price_data, dict):
+            estimated_value = price_data.get("estimated_value") or price_data.get("average_price")
+            if isinstance(estimated_value, (int, float)):
+                # Use source field if provided; fallback to price_data['source']
+                price_source = price_data.get("source", "unknown")
+                try:
+                    self.price_service.add_price_history(card.id, float(estimated_value), price_source=price_source)
+                except Exception as history_err:
+                    # Log but don't fail the main flow
+                    print(f"⚠️  Failed to record price history: {history_err}")
+
+        # For now, store image locally (can be enhanced to upload to cloud storage later)
+        # Create permanent storage path
+        storage_dir = f"images/cards/{user_id}"
+        os.makedirs(storage_dir, exist_ok=True)
+        permanent_path = f"{storage_dir}/{card.id}_{file.filename}"
+        
+        # Write the upload to its permanent location
+        with open(permanent_path, "wb") as buffer:
+            buffer.write(content)
+        
+        # Create image record
+        card_image = CardImage(
+            card_id=card.id,
+            image_url=permanent_path,
+            image_type='front'
+        )
+        self.db.add(card_image)
+        self.db.commit()
+
+        return {
+            "card_id": card.id,
+            "card_data": {
+                "player": card.player_name,
+                "set": card.set_name,
+                "year": card.year,
+                "card_number": card.card_number,
+                "parallel": card.parallel,
+                "manufacturer": card.manufacturer,
+                "features": card.features,
+                "graded": card.graded,
+                "grade": card.grade,
+                "grading_company": card.grading_company,
+                "cert_number": card.cert_number
+            },
+            "price_data": price_data
+        }
+
+    # Building blocks for the async process endpoints. The sync methods block
+    # (OCR, SQLAlchemy) and are meant to be awaited through run_blocking.
+
+    def _fallback_card_data(self, player_name: Optional[str], filename: str) -> dict:
+        """Card structure used when OCR returns nothing"""
+        return {
+            "player": player_name or "Unknown Player",
+            "set": "Unknown Set",
+            "year": "Unknown",
+            "card_number": "",
+            "parallel": "",
+            "manufacturer": "Unknown",
+            "features": "",
+            "graded": False,
+            "grade": "",
+            "grading_company": "",
+            "cert_number": "",
+            "filename": filename
+        }
+
+    def extract_card_from_image(self, content: bytes, filename: str) -> dict:
+        """OCR and parse one card image. Blocking."""
+        from src.utils.enhanced_card_processor import process_all_images_enhanced, _extract_player_from_filename
+
+        player_name = _extract_player_from_filename(filename)
+        processed_cards = process_all_images_enhanced([(filename, content)])
+
+        if processed_cards and len(processed_cards) > 0:
+            card_data = processed_cards[0]
+            # Override player name with filename if extracted
+            if player_name:
+                card_data["player"] = player_name
+            return card_data
+        return self._fallback_card_data(player_name, filename)
+
+    def extract_dual_side_card(self, front_content: bytes, back_content: Optional[bytes], filename: str) -> dict:
+        """OCR and merge front and (optional) back images of one card. Blocking."""
+        from src.utils.enhanced_card_processor import process_dual_side_card, _extract_player_from_filename
+
+        player_name = _extract_player_from_filename(filename)
+        card_data = process_dual_side_card(front_content, back_content, player_name)
+
+        if not card_data:
+            card_data = self._fallback_card_data(player_name, filename)
+            card_data["confidence_score"] = 0.2
+            card_data["dual_side"] = back_content is not None
+        return card_data
+
+    async def price_card(self, card_data: dict) -> dict:
+        """Hybrid price (local DB, then eBay) shaped as the card's price_data"""
+        return (await self.price_card_batch([card_data]))[0]
+
+    async def price_card_batch(self, cards_data: List[dict]) -> List[dict]:
+        """
+        price_card for many cards: their local matches are looked up together
+        (CardDatabaseService.find_card_matches), then misses go to eBay,
+        BULK_PRICING_CONCURRENCY at a time. Returns price_data per card, in order.
+        """
+        try:
+            hybrid_pricing_results = await self.hybrid_pricing_service.get_card_prices(
+                cards_data, ebay_concurrency=BULK_PRICING_CONCURRENCY
+            )
+        except Exception as pricing_error:
+            print(f"❌ Hybrid pricing failed: {pricing_error}")
+            hybrid_pricing_results = [None] * len(cards_data)
+
+        price_data = []
+        for card_data, hybrid_pricing_result in zip(cards_data, hybrid_pricing_results):
+            search_query = f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
+            if hybrid_pricing_result is None:
+                price_data.append({
                     "estimated_value": 1.0,
                     "listing_price": 1.15,
                     "confidence": "low",
                     "source": "fallback",
                     "method": "default",
                     "sample_size": 0,
-                    "search_query": f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}"
-                }
-
-            # Create card record
-            card = Card(
-                collection_id=collection_id,
-                player_name=card_data.get('player', ''),
-                set_name=card_data.get('set', ''),
-                year=card_data.get('year', ''),
-                card_number=card_data.get('card_number', ''),
-                parallel=card_data.get('parallel', ''),
-                manufacturer=card_data.get('manufacturer', ''),
-                features=card_data.get('features', ''),
-                graded=card_data.get('graded', False),
-                grade=card_data.get('grade', ''),
-                grading_company=card_data.get('grading_company', ''),
-                cert_number=card_data.get('cert_number', ''),
-                price_data=price_data or {}
-            )
-            self.db.add(card)
-            self.db.commit()
-            self.db.refresh(card)
+                    "search_query": search_query
+                })
+                continue
+            price_data.append({
+                "estimated_value": hybrid_pricing_result.get('estimated_value', 0.0),
+                "listing_price": hybrid_pricing_result.get('estimated_value', 0.0) * 1.15,
+                "confidence": hybrid_pricing_result.get('confidence', 'unknown'),
+                "source": hybrid_pricing_result.get('source', 'unknown'),
+                "method": hybrid_pricing_result.get('method', 'unknown'),
+                "sample_size": hybrid_pricing_result.get('sample_size', 0),
+                "stale": hybrid_pricing_result.get('stale', False),
+                "search_query": search_query
+            })
+        return price_data
 
-            # Persist the initial price point to history
-            if price_data and isinstance(price_data, dict):
-                estimated_value = price_data.get("estimated_value") or price_data.get("average_price")
+    def save_processed_card(self, collection_id: str, card_data: dict, price_data: dict, images: List[tuple]) -> Card:
+        """
+        Persist a processed card, its (image_url, image_type) records and the
+        initial price history point. Blocking.
+        """
+        card = Card(
+            collection_id=collection_id,
+            player_name=card_data.get('player', ''),
+            set_name=card_data.get('set', ''),
+            year=card_data.get('year', ''),
+            card_number=card_data.get('card_number', ''),
+            parallel=card_data.get('parallel', ''),
+            manufacturer=card_data.get('manufacturer', ''),
+            features=card_data.get('features', ''),
+            graded=card_data.get('graded', False),
+            grade=card_data.get('grade', ''),
+            grading_company=card_data.get('grading_company', ''),
+            cert_number=card_data.get('cert_number', ''),
+            price_data=price_data or {}
+        )
+        self.db.add(card)
+        self.db.commit()
+        self.db.refresh(card)
+
+        for image_url, image_type in images:
+            self.db.add(CardImage(card_id=card.id, image_url=image_url, image_type=image_type))
+        self.db.commit()
+
+        # Add to price history
+        if price_data and isinstance(price_data, dict):
+            estimated_value = price_data.get("estimated_value")
+            if isinstance(estimated_value, (int, float)):
+                try:
+                    self.price_service.add_price_history(
+                        card.id,
+                        float(estimated_value),
+                        price_source=price_data.get("source", "unknown")
+                    )
+                except Exception as history_err:
+                    print(f"⚠️  Failed to record price history: {history_err}")
+
+        # Reload after the last commit so callers on the event loop can read
+        # attributes without triggering a lazy load
+        self.db.refresh(card)
+        return card
+
+    def _processed_card_response(self, card: Card, card_data: dict, dual_side: bool = False) -> dict:
+        response_card = {
+            "player": card.player_name,
+            "set": card.set_name,
+            "year": card.year,
+            "card_number": card.card_number,
+            "parallel": card.parallel,
+            "manufacturer": card.manufacturer,
+            "features": card.features,
+            "graded": card.graded,
+            "grade": card.grade,
+            "grading_company": card.grading_company,
+            "cert_number": card.cert_number
+        }
+        if dual_side:
+            response_card.update({
+                "confidence_score": card_data.get('confidence_score', 0.0),
+                "dual_side": card_data.get('dual_side', False),
+                "ocr_sources": card_data.get('ocr_sources', 'front')
+            })
+        return {"card_id": card.id, "card_data": response_card}
+
+    async def process_card_url(self, image_url: str, collection_id: str, filename: str, progress=None) -> dict:
+        """
+        Full single-image pipeline: download, OCR, hybrid pricing, save.
+        progress, if given, is an async callable awaited with each stage name
+        ("downloading", "ocr", "pricing", "saving") as the pipeline reaches it,
+        and finally with ("saved", response) once the card is written.
+        """
+        if progress:
+            await progress("downloading")
+        content = await self._download_image(image_url)
+
+        # OCR and the database writes block, so they run on the bounded card-processing threadpool
+        if progress:
+            await progress("ocr")
+        card_data = await run_blocking(self.extract_card_from_image, content, filename)
+
+        if progress:
+            await progress("pricing")
+        price_data = await self.price_card(card_data)
+
+        # Create card record with an image record pointing to the GCS URL
+        if progress:
+            await progress("saving")
+        card = await run_blocking(self.save_processed_card, collection_id, card_data, price_data, [(image_url, 'front')])
+
+        response = self._processed_card_response(card, card_data)
+        response.update({"price_data": price_data, "image_url": image_url})
+        if progress:
+            await progress("saved", response)
+        return response
+
+    async def process_dual_side_urls(self, front_image_url: str, back_image_url: Optional[str], collection_id: str,
+                                     filename: str, progress=None) -> dict:
+        """
+        Full dual-side pipeline: download both sides, OCR and merge, hybrid
+        pricing, save. A missing or failed back image falls back to front only.
+        progress works as in process_card_url.
+        """
+        if progress:
+            await progress("downloading")
+        front_content, back_content = await self._download_card_sides(front_image_url, back_image_url)
+
+        if progress:
+            await progress("ocr")
+        card_data = await run_blocking(self.extract_dual_side_card, front_content, back_content, filename)
+
+        if progress:
+            await progress("pricing")
+        price_data = await self.price_card(card_data)
+
+        # Create card record with image records for both sides
+        if progress:
+            await progress("saving")
+        images = [(front_image_url, 'front')]
+        if back_image_url:
+            images.append((back_image_url, 'back'))
+        card = await run_blocking(self.save_processed_card, collection_id, card_data, price_data, images)
+
+        response = self._processed_card_response(card, card_data, dual_side=True)
+        response.update({"price_data": price_data, "front_image_url": front_image_url, "back_image_url": back_image_url})
+        if progress:
+            await progress("saved", response)
+        return response
+
+    async def _download_image(self, image_url: str, side: str = None) -> bytes:
+        img_response = await download(image_url)
+        if img_response.status_code != 200:
+            label = f"{side} image" if side else "image"
+            raise HTTPException(status_code=400, detail=f"Could not download {label}: {img_response.status_code}")
+        return img_response.content
+
+    async def _download_card_sides(self, front_image_url: str, back_image_url: Optional[str]) -> tuple:
+        """
+        Download both sides concurrently. The front must succeed; a failed back
+        download is logged and returned as None so OCR falls back to the front.
+        """
+        downloads = [self._download_image(front_image_url, "front")]
+        if back_image_url:
+            downloads.append(self._download_image(back_image_url, "back"))
+        contents = await asyncio.gather(*downloads, return_exceptions=True)
+
+        if isinstance(contents[0], Exception):
+            raise contents[0]
+        back_content = None
+        if back_image_url:
+            if isinstance(contents[1], Exception):
+                print(f"⚠️  Back image download failed: {getattr(contents[1], 'detail', contents[1])}")
+            else:
+                back_content = contents[1]
+        return contents[0], back_content
+
+    @staticmethod
+    def _pricing_key(card_data: dict) -> tuple:
+        return tuple(str(card_data.get(field) or '').strip().lower() for field in PRICING_KEY_FIELDS)
+
+    async def price_cards(self, cards_data: List[dict]) -> List[dict]:
+        """
+        Price many cards, looking each distinct card up only once: a binder
+        with ten copies of the same base card costs one pricing query.
+        Returns price_data for each card, in input order.
+        """
+        unique_cards = {}
+        for card_data in cards_data:
+            unique_cards.setdefault(self._pricing_key(card_data), card_data)
+
+        prices = await self.price_card_batch(list(unique_cards.values()))
+        prices_by_key = dict(zip(unique_cards, prices))
+        print(f"💰 Priced {len(cards_data)} cards with {len(unique_cards)} distinct pricing queries")
+
+        return [
+            dict(prices_by_key[self._pricing_key(card_data)],
+                 search_query=f"{card_data.get('player', 'Unknown')} {card_data.get('set', 'Unknown')}")
+            for card_data in cards_data
+        ]
+
+    def save_processed_cards(self, collection_id: str, entries: List[tuple]) -> List[dict]:
+        """
+        Persist many processed cards, given as (card_data, price_data, images)
+        tuples, with their image records and initial price history points in a
+        single transaction. Returns the API card payload for each entry. Blocking.
+        """
+        responses = []
+        try:
+            for card_data, price_data, images in entries:
+                card = Card(
+                    id=str(uuid.uuid4()),
+                    collection_id=collection_id,
+                    player_name=card_data.get('player', ''),
+                    set_name=card_data.get('set', ''),
+                    year=card_data.get('year', ''),
+                    card_number=card_data.get('card_number', ''),
+                    parallel=card_data.get('parallel', ''),
+                    manufacturer=card_data.get('manufacturer', ''),
+                    features=card_data.get('features', ''),
+                    graded=card_data.get('graded', False),
+                    grade=card_data.get('grade', ''),
+                    grading_company=card_data.get('grading_company', ''),
+                    cert_number=card_data.get('cert_number', ''),
+                    price_data=price_data or {}
+                )
+                self.db.add(card)
+                for image_url, image_type in images:
+                    self.db.add(CardImage(card_id=card.id, image_url=image_url, image_type=image_type))
+
+                estimated_value = (price_data or {}).get("estimated_value")
                 if isinstance(estimated_value, (int, float)):
-                    # Use source field if provided; fallback to price_data['source']
-                    price_source = price_data.get("source", "unknown")
-                    try:
-                        self.price_service.add_price_history(card.id, float(estimated_value), price_source=price_source)
-                    except Exception as history_err:
-                        # Log but don't fail the main flow
-                        print(f"⚠️  Failed to record price history: {history_err}")
-
-            # For now, store image locally (can be enhanced to upload to cloud storage later)
-            # Create permanent storage path
-            storage_dir = f"images/cards/{user_id}"
-            os.makedirs(storage_dir, exist_ok=True)
-            permanent_path = f"{storage_dir}/{card.id}_{file.filename}"
-            
-            # Move file to permanent location
-            import shutil
-            shutil.move(temp_path, permanent_path)
-            
-            # Create image record
-            card_image = CardImage(
-                card_id=card.id,
-                image_url=permanent_path,
-                image_type='front'
-            )
-            self.db.add(card_image)
+                    self.db.add(CardPriceHistory(
+                        card_id=card.id,
+                        price=float(estimated_value),
+                        price_source=price_data.get("source", "unknown")
+                    ))
+
+                # Built before the commit expires the instances, so no reloads are needed
+                responses.append(self._processed_card_response(card, card_data, dual_side='dual_side' in card_data))
             self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return responses
 
-            return {
-                "card_id": card.id,
-                "card_data": {
-                    "player": card.player_name,
-                    "set": card.set_name,
-                    "year": card.year,
-                    "card_number": card.card_number,
-                    "parallel": card.parallel,
-                    "manufacturer": card.manufacturer,
-                    "features": card.features,
-                    "graded": card.graded,
-                    "grade": card.grade,
-                    "grading_company": card.grading_company,
-                    "cert_number": card.cert_number
-                },
-                "price_data": price_data
-            }
+    async def process_card_batch(self, collection_id: str, items: List[dict], progress=None) -> dict:
+        """
+        Ingest many cards in one call. Each item is {"image_url", "filename"}
+        or {"front_image_url", "back_image_url", "filename"}.
+        Downloads and OCR are pipelined per card (one card OCRs while others
+        download), with at most BULK_CARDS_IN_FLIGHT cards between the two at
+        once, identical pricing queries are looked up once, and all rows
+        are written in one transaction. A card that fails to download or OCR
+        is reported in its slot without failing the rest of the batch.
+        """
+        if not items:
+            raise HTTPException(status_code=400, detail="cards must be a non-empty list")
+        if len(items) > BULK_MAX_CARDS:
+            raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_CARDS} cards per batch")
+
+        if progress:
+            await progress("downloading")
+        # A card holds its slot from download until OCR is done with its images
+        card_slots = asyncio.Semaphore(BULK_CARDS_IN_FLIGHT)
+        # More dual-side cards than the OCR pool can run would only queue there
+        dual_side_slots = asyncio.Semaphore(max(1, OCR_MAX_WORKERS // 2))
+        ocr_started = False
 
-        except Exception as e:
-            # Clean up temporary file if it exists
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            raise e
+        async def extract(item):
+            nonlocal ocr_started
+            filename = item.get("filename", "unknown.jpg")
+            front_image_url = item.get("front_image_url") or item.get("image_url")
+            back_image_url = item.get("back_image_url")
+            if not front_image_url:
+                raise HTTPException(status_code=400, detail="image_url or front_image_url is required")
+
+            async with card_slots:
+                if item.get("front_image_url"):
+                    front_content, back_content = await self._download_card_sides(front_image_url, back_image_url)
+                else:
+                    front_content, back_content = await self._download_image(front_image_url), None
+
+                if progress and not ocr_started:
+                    ocr_started = True
+                    await progress("ocr")
+                if item.get("front_image_url"):
+                    async with dual_side_slots:
+                        card_data = await run_blocking(self.extract_dual_side_card, front_content, back_content, filename)
+                else:
+                    card_data = await run_blocking(self.extract_card_from_image, front_content, filename)
+
+            images = [(front_image_url, 'front')]
+            if back_image_url:
+                images.append((back_image_url, 'back'))
+            return card_data, images
+
+        extracted = await asyncio.gather(*(extract(item) for item in items), return_exceptions=True)
+
+        results = [None] * len(items)
+        ok_indexes = []
+        for index, outcome in enumerate(extracted):
+            if isinstance(outcome, Exception):
+                error = outcome.detail if isinstance(outcome, HTTPException) else str(outcome)
+                print(f"❌ Batch card {index} failed: {error}")
+                results[index] = {"index": index, "error": error}
+            else:
+                ok_indexes.append(index)
+
+        if progress:
+            await progress("pricing")
+        cards_data = [extracted[index][0] for index in ok_indexes]
+        prices = await self.price_cards(cards_data)
+
+        if progress:
+            await progress("saving")
+        entries = [(extracted[index][0], price_data, extracted[index][1]) for index, price_data in zip(ok_indexes, prices)]
+        saved = await run_blocking(self.save_processed_cards, collection_id, entries) if entries else []
+
+        for index, response, (_, price_data, images) in zip(ok_indexes, saved, entries):
+            response.update({"index": index, "price_data": price_data, "image_urls": [url for url, _ in images]})
+            results[index] = response
+
+        batch = {
+            "collection_id": collection_id,
+            "processed": len(ok_indexes),
+            "failed": len(items) - len(ok_indexes),
+            "distinct_pricing_queries": len({self._pricing_key(card_data) for card_data in cards_data}),
+            "cards": results
+        }
+        if progress:
+            await progress("saved", batch)
+        return batch
 
     def _create_mock_card_data(self, filename: str) -> dict:
         """Create mock card data for testing when OCR is not available"""
@@ -0,0 +1,403 @@
+import os
+import json
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from src.database import get_db, SessionLocal
+from src.models.job import ProcessingJob
+from src.utils.async_io import run_blocking
+
+# Card-processing jobs live in the processing_jobs table, so the queue needs no
+# external services: the API process runs JOB_WORKERS worker tasks by default,
+# and with JOB_WORKERS=0 it only enqueues while scripts/run_job_worker.py
+# processes jobs from the same database in separate processes.
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', '1.0'))
+# Workers stamp heartbeat_at on their running jobs every JOB_HEARTBEAT_SECONDS;
+# a job still 'running' whose heartbeat is older than JOB_STALE_SECONDS belongs
+# to a worker that died. Every worker pool looks for those jobs at startup and
+# then every JOB_REQUEUE_INTERVAL_SECONDS.
+JOB_HEARTBEAT_SECONDS = float(os.getenv('JOB_HEARTBEAT_SECONDS', '30'))
+JOB_STALE_SECONDS = float(os.getenv('JOB_STALE_SECONDS', '600'))
+JOB_REQUEUE_INTERVAL_SECONDS = float(os.getenv('JOB_REQUEUE_INTERVAL_SECONDS', '60'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+# How often the server-sent-events stream re-reads a job, and sends a keep-alive when idle
+JOB_EVENTS_POLL_SECONDS = float(os.getenv('JOB_EVENTS_POLL_SECONDS', '0.5'))
+JOB_EVENTS_KEEPALIVE_SECONDS = 15.0
+
+# Pipeline stages reported to clients, with the progress fraction at the start of each
+JOB_STAGES = {
+    "queued": 0.0,
+    "downloading": 0.1,
+    "ocr": 0.3,
+    "pricing": 0.6,
+    "saving": 0.9,
+    # The pipeline's output is written; it is kept on the job so a retry does not write it again
+    "saved": 0.95,
+    "succeeded": 1.0,
+    "failed": 1.0,
+}
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+def _as_utc(value):
+    # SQLite hands timestamps back without tzinfo; they are stored as UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def _required(payload: dict, *fields):
+    for field in fields:
+        if not payload.get(field):
+            raise HTTPException(status_code=400, detail=f"{field} is required")
+
+async def _run_process_url(card_service, payload, progress):
+    return await card_service.process_card_url(
+        payload["image_url"], payload["collection_id"], payload.get("filename", "unknown.jpg"), progress
+    )
+
+async def _run_process_dual_side(card_service, payload, progress):
+    return await card_service.process_dual_side_urls(
+        payload["front_image_url"], payload.get("back_image_url"), payload["collection_id"],
+        payload.get("filename", "unknown.jpg"), progress
+    )
+
+async def _run_process_batch(card_service, payload, progress):
+    return await card_service.process_card_batch(payload["collection_id"], payload["cards"], progress)
+
+# job_type -> (required payload fields, async handler(card_service, payload, progress))
+JOB_HANDLERS = {
+    "process-url": (("image_url", "collection_id"), _run_process_url),
+    "process-dual-side": (("front_image_url", "collection_id"), _run_process_dual_side),
+    "process-batch": (("collection_id", "cards"), _run_process_batch),
+}
+
+class JobService:
+    """Queue operations on processing_jobs. All methods block (SQLAlchemy)."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def submit(self, user_id: str, job_type: str, payload: dict) -> ProcessingJob:
+        if job_type not in JOB_HANDLERS:
+            raise HTTPException(status_code=400, detail=f"Unknown job type: {job_type}")
+        required_fields, _ = JOB_HANDLERS[job_type]
+        _required(payload, *required_fields)
+
+        # Stamped here rather than by the server default: SQLite's CURRENT_TIMESTAMP
+        # only has second resolution, and claim order is by created_at
+        job = ProcessingJob(user_id=user_id, job_type=job_type, payload=payload, status="queued", stage="queued",
+                            created_at=_utcnow())
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def get_job(self, job_id: str, user_id: Optional[str] = None) -> Optional[ProcessingJob]:
+        query = self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id)
+        if user_id is not None:
+            query = query.filter(ProcessingJob.user_id == user_id)
+        job = query.first()
+        if job is not None:
+            # Pollers re-read the same row; never serve it from the identity map
+            self.db.refresh(job)
+        return job
+
+    def claim_next(self) -> Optional[ProcessingJob]:
+        """
+        Atomically move the oldest queued job to 'running' and return it.
+        The conditional UPDATE means two workers (or two processes) polling
+        the same table never both claim a job.
+        """
+        while True:
+            candidate = (
+                self.db.query(ProcessingJob.id)
+                .filter(ProcessingJob.status == "queued")
+                .order_by(ProcessingJob.created_at, ProcessingJob.id)
+                .first()
+            )
+            if candidate is None:
+                return None
+
+            now = _utcnow()
+            claimed = (
+                self.db.query(ProcessingJob)
+                .filter(ProcessingJob.id == candidate.id, ProcessingJob.status == "queued")
+                .update({
+                    ProcessingJob.status: "running",
+                    ProcessingJob.started_at: now,
+                    ProcessingJob.heartbeat_at: now,
+                    ProcessingJob.attempts: ProcessingJob.attempts + 1,
+                }, synchronize_session=False)
+            )
+            self.db.commit()
+            if claimed:
+                return self.get_job(candidate.id)
+
+    def update_stage(self, job_id: str, stage: str, result: dict = None):
+        """Record the job's stage, and with result, what the pipeline has saved so far"""
+        values = {
+            ProcessingJob.stage: stage,
+            ProcessingJob.progress: JOB_STAGES.get(stage, 0.0),
+            ProcessingJob.heartbeat_at: _utcnow(),
+        }
+        if result is not None:
+            values[ProcessingJob.result] = result
+        self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).update(values, synchronize_session=False)
+        self.db.commit()
+
+    def saved_result(self, job_id: str) -> Optional[dict]:
+        """The result an earlier attempt at a running job saved before its worker died, if any"""
+        return (
+            self.db.query(ProcessingJob.result)
+            .filter(ProcessingJob.id == job_id, ProcessingJob.status == "running")
+            .scalar()
+        )
+
+    def heartbeat(self, job_id: str):
+        """Mark a running job as still alive, so requeue_stale leaves it to its worker"""
+        self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id, ProcessingJob.status == "running").update({
+            ProcessingJob.heartbeat_at: _utcnow(),
+        }, synchronize_session=False)
+        self.db.commit()
+
+    def complete(self, job_id: str, result: dict):
+        self._finish(job_id, "succeeded", result=result)
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, "failed", error=error)
+
+    def _finish(self, job_id: str, status: str, result: dict = None, error: str = None):
+        self.db.query(ProcessingJob).filter(ProcessingJob.id == job_id).update({
+            ProcessingJob.status: status,
+            ProcessingJob.stage: status,
+            ProcessingJob.progress: 1.0,
+            ProcessingJob.result: result,
+            ProcessingJob.error: error,
+            ProcessingJob.finished_at: _utcnow(),
+        }, synchronize_session=False)
+        self.db.commit()
+
+    def requeue_stale(self, stale_seconds: float = JOB_STALE_SECONDS) -> int:
+        """
+        Return jobs orphaned by a dead worker (no heartbeat for stale_seconds)
+        to the queue, or fail them once they have used up JOB_MAX_ATTEMPTS.
+        Returns how many were requeued.
+        """
+        cutoff = _utcnow() - timedelta(seconds=stale_seconds)
+        requeued = 0
+        for job in self.db.query(ProcessingJob).filter(ProcessingJob.status == "running").all():
+            last_seen = _as_utc(job.heartbeat_at or job.started_at)
+            if last_seen is not None and last_seen > cutoff:
+                continue
+            if job.attempts >= JOB_MAX_ATTEMPTS:
+                job.status = job.stage = "failed"
+                job.progress = 1.0
+                job.error = f"Worker stopped responding after {job.attempts} attempts"
+                job.finished_at = _utcnow()
+            else:
+                job.status = job.stage = "queued"
+                job.progress = 0.0
+                requeued += 1
+        self.db.commit()
+        return requeued
+
+    @staticmethod
+    def to_dict(job: ProcessingJob) -> dict:
+        return {
+            "job_id": job.id,
+            "job_type": job.job_type,
+            "status": job.status,
+            "stage": job.stage,
+            "progress": job.progress,
+            "result": job.result,
+            "error": job.error,
+            "attempts": job.attempts,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "heartbeat_at": job.heartbeat_at.isoformat() if job.heartbeat_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+class JobWorkerPool:
+    """
+    Async workers that claim jobs from processing_jobs and run the matching
+    card pipeline. Each job gets its own database session. Blocking steps
+    inside the pipeline already go through run_blocking, so the workers share
+    the card-processing threadpool with the synchronous endpoints.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, session_factory=SessionLocal,
+                 poll_interval: float = JOB_POLL_INTERVAL_SECONDS, handlers: dict = None,
+                 card_service_factory=None, heartbeat_interval: float = JOB_HEARTBEAT_SECONDS,
+                 requeue_interval: float = JOB_REQUEUE_INTERVAL_SECONDS, stale_seconds: float = JOB_STALE_SECONDS):
+        self.workers = workers
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.requeue_interval = requeue_interval
+        self.stale_seconds = stale_seconds
+        self.handlers = handlers or JOB_HANDLERS
+        self.card_service_factory = card_service_factory
+        self._tasks = []
+        self._wakeup = None
+
+    async def start(self):
+        if self._tasks or self.workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        await self._requeue_stale()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._requeue_stale_periodically()))
+        print(f"👷 Started {self.workers} card-processing job workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake an idle worker now instead of at its next poll (same process only)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _with_jobs(self, action):
+        db = self.session_factory()
+        try:
+            return action(JobService(db))
+        finally:
+            db.close()
+
+    async def _requeue_stale(self):
+        requeued = await run_blocking(self._with_jobs, lambda jobs: jobs.requeue_stale(self.stale_seconds))
+        if requeued:
+            print(f"♻️  Requeued {requeued} interrupted jobs")
+            self.notify()
+
+    async def _requeue_stale_periodically(self):
+        # A worker can die (in another process) while this one keeps running
+        while True:
+            await asyncio.sleep(self.requeue_interval)
+            try:
+                await self._requeue_stale()
+            except Exception as e:
+                print(f"⚠️  Requeueing stale jobs failed: {e}")
+
+    async def _worker(self):
+        while True:
+            job = await run_blocking(self._with_jobs, self._claim)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.run_job(*job)
+
+    @staticmethod
+    def _claim(jobs: JobService):
+        job = jobs.claim_next()
+        if job is None:
+            return None
+        return job.id, job.job_type, dict(job.payload or {})
+
+    def _card_service(self, db):
+        if self.card_service_factory is not None:
+            return self.card_service_factory(db)
+        # Imported here: card_service pulls in the OCR and pricing stack
+        from src.services.card_service import CardService
+        return CardService(db)
+
+    async def _heartbeat(self, job_id: str):
+        # Its own session: the job's session is in use by the pipeline's threads
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await run_blocking(self._with_jobs, lambda jobs: jobs.heartbeat(job_id))
+            except Exception as e:
+                print(f"⚠️  Heartbeat failed for job {job_id}: {e}")
+
+    async def run_job(self, job_id: str, job_type: str, payload: dict):
+        db = self.session_factory()
+        jobs = JobService(db)
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            async def progress(stage, result=None):
+                await run_blocking(jobs.update_stage, job_id, stage, result)
+
+            # A retry of a job whose worker died after saving: finish with what it saved
+            saved = await run_blocking(jobs.saved_result, job_id)
+            if saved is not None:
+                await run_blocking(jobs.complete, job_id, saved)
+                print(f"✅ Job {job_id} had already saved its result; not running it again")
+                return
+
+            if job_type not in self.handlers:
+                raise Exception(f"Unknown job type: {job_type}")
+            _, handler = self.handlers[job_type]
+            print(f"⚙️  Job {job_id} ({job_type}) started")
+            result = await handler(self._card_service(db), payload, progress)
+            await run_blocking(jobs.complete, job_id, result)
+            print(f"✅ Job {job_id} succeeded")
+        except asyncio.CancelledError:
+            # Shutdown mid-job: leave it 'running' so requeue_stale picks it up
+            raise
+        except Exception as e:
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            print(f"❌ Job {job_id} failed: {error}")
+            try:
+                db.rollback()
+                await run_blocking(jobs.fail, job_id, str(error))
+            except Exception as record_error:
+                print(f"⚠️  Failed to record job failure: {record_error}")
+        finally:
+            heartbeat.cancel()
+            db.close()
+
+async def job_events(jobs: JobService, job_id: str, user_id: str, poll_interval: float = JOB_EVENTS_POLL_SECONDS):
+    """
+    Server-sent events for one job: a 'progress' event whenever its status or
+    stage changes, ending with a 'done' event once it succeeds or fails.
+    Polls the table, so it follows jobs run by workers in other processes.
+    """
+    last_state = None
+    idle = 0.0
+    while True:
+        job = await run_blocking(jobs.get_job, job_id, user_id)
+        if job is None:
+            yield f"event: error\ndata: {json.dumps({'detail': 'Job not found'})}\n\n"
+            return
+
+        state = JobService.to_dict(job)
+        if state["status"] in TERMINAL_STATUSES:
+            yield f"event: done\ndata: {json.dumps(state)}\n\n"
+            return
+        if (state["status"], state["stage"]) != last_state:
+            last_state = (state["status"], state["stage"])
+            idle = 0.0
+            yield f"event: progress\ndata: {json.dumps(state)}\n\n"
+        elif idle >= JOB_EVENTS_KEEPALIVE_SECONDS:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+
+        await asyncio.sleep(poll_interval)
+        idle += poll_interval
+
+_job_worker_pool = None
+
+def get_job_worker_pool() -> JobWorkerPool:
+    global _job_worker_pool
+    if _job_worker_pool is None:
+        _job_worker_pool = JobWorkerPool()
+    return _job_worker_pool
+
+def get_job_service(db: Session = Depends(get_db)) -> JobService:
+    return JobService(db)
@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+# Memo in front of hybrid pricing: a card's normalized identity and condition
+# -> the local price matched for it, as (card id, price, last_updated), or
+# None when the local database has no price for it. Repeated lookups of the
+# same card (a user re-pricing a card, the same card in several uploads) then
+# skip matching. Each engine (each database) has its own memo. An entry is
+# dropped when its card_database row changes: committed in this process
+# (update_card_price, write-back, seed scripts), or picked up by the card
+# catalog's refresh. Any change also drops the memo's no-price
+# entries, since a new row may be the price they lacked.
+# PRICE_MEMO_TTL_SECONDS bounds how long a write nothing reported (another
+# process with the catalog disabled) can go unseen.
+#   PRICE_MEMO_ENTRIES: entries per engine; 0 disables the memo
+PRICE_MEMO_ENTRIES = int(os.getenv('PRICE_MEMO_ENTRIES', '10000'))
+PRICE_MEMO_TTL_SECONDS = float(os.getenv('PRICE_MEMO_TTL_SECONDS', '300'))
+
+class PriceMemo:
+    """Bounded LRU with per-entry expiry, invalidated by card id. Thread-safe."""
+
+    def __init__(self, max_entries: int = PRICE_MEMO_ENTRIES, ttl: float = PRICE_MEMO_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._by_card = {}  # card id -> keys whose value is that card
+        self._no_price = set()  # keys whose value is None
+        self._version = 0  # invalidations so far
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "stale_sets": 0, "invalidations": 0, "evictions": 0}
+
+    def get(self, key: Tuple) -> Tuple[bool, Optional[Tuple]]:
+        """Return (found, value); a memoized 'no local price' is found with value None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry[1]
+
+    def version(self) -> int:
+        """Invalidations so far; pass it to set() for a value read afterwards"""
+        return self._version
+
+    def set(self, key: Tuple, value: Optional[Tuple], version: Optional[int] = None):
+        """
+        Memoize value for key. With version, the value is dropped if rows
+        changed since version was taken, as it may have been read before the
+        change.
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if version is not None and version != self._version:
+                self._stats["stale_sets"] += 1
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            if value is None:
+                self._no_price.add(key)
+            else:
+                self._by_card.setdefault(value[0], set()).add(key)
+            self._stats["sets"] += 1
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, card_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Drop the entries for card_ids and every no-price entry, or all entries
+        if card_ids is None. Returns the number dropped.
+        """
+        with self._lock:
+            self._version += 1
+            if card_ids is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self._by_card.clear()
+                self._no_price.clear()
+            else:
+                keys = set(self._no_price)
+                for card_id in card_ids:
+                    keys.update(self._by_card.get(card_id, ()))
+                for key in keys:
+                    self._drop(key)
+                dropped = len(keys)
+            self._stats["invalidations"] += dropped
+            return dropped
+
+    def _drop(self, key):
+        _, value = self._entries.pop(key)
+        if value is None:
+            self._no_price.discard(key)
+            return
+        keys = self._by_card[value[0]]
+        keys.discard(key)
+        if not keys:
+            del self._by_card[value[0]]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["lookups"] = lookups
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+# One memo per engine, like the card catalogs
+_memos = weakref.WeakKeyDictionary()
+_memos_lock = threading.Lock()
+
+def get_price_memo(bind) -> PriceMemo:
+    """Memo for the database behind this engine"""
+    with _memos_lock:
+        memo = _memos.get(bind)
+        if memo is None:
+            memo = _memos[bind] = PriceMemo()
+    return memo
+
+def invalidate_price_memo(bind, card_ids: Optional[Iterable[str]] = None) -> int:
+    """PriceMemo.invalidate on bind's memo, if it has one"""
+    memo = _memos.get(bind)
+    return memo.invalidate(card_ids) if memo is not None else 0
+
+def get_price_memo_stats() -> Dict:
+    """Counters summed over every engine's memo in this process"""
+    with _memos_lock:
+        memos = list(_memos.values())
+    counters = ("hits", "misses", "sets", "stale_sets", "invalidations", "evictions", "entries")
+    stats = dict.fromkeys(counters, 0)
+    for memo in memos:
+        memo_stats = memo.get_stats()
+        for name in counters:
+            stats[name] += memo_stats[name]
+    stats["lookups"] = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+    stats["max_entries"] = PRICE_MEMO_ENTRIES
+    stats["databases"] = len(memos)
+    return stats
@@ -4,6 +4,7 @@ from fastapi import HTTPException, Depends
 
 from src.database import get_db
 from src.utils.price_finder import research_all_prices
+from src.utils.async_io import run_blocking
 from src.models.price_history import CardPriceHistory
 
 class PriceService:
@@ -17,7 +18,7 @@ class PriceService:
         try:
             # Convert single card to list format expected by research_all_prices
             cards = [card_data]
-            results = research_all_prices(cards)
+            results = await run_blocking(research_all_prices, cards)
             
             if not results or not results[0].get('pricing_data'):
                 return None
@@ -48,9 +49,11 @@ class PriceService:
     async def research_bulk_prices(self, cards_data: list) -> list:
         """
         Research prices for multiple cards in bulk.
+        Queries are fetched concurrently over pooled connections (see
+        price_finder.fetch_sold_prices), off the event loop.
         """
         try:
-            results = research_all_prices(cards_data)
+            results = await run_blocking(research_all_prices, cards_data)
             return [
                 {
                     'card_id': card.get('id'),
@@ -0,0 +1,52 @@
+import os
+import functools
+import anyio
+import httpx
+
+# Card processing does blocking work (Vision OCR, eBay scraping, SQLAlchemy).
+# Async endpoints hand it to a dedicated, bounded set of worker threads so the
+# event loop stays free for other requests, and a burst of card uploads cannot
+# use up the threadpool FastAPI needs for sync dependencies like get_db.
+CARD_PROCESSING_MAX_THREADS = int(os.getenv('CARD_PROCESSING_MAX_THREADS', '16'))
+IMAGE_DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv('IMAGE_DOWNLOAD_TIMEOUT_SECONDS', '10'))
+
+_limiter = None
+_http_client = None
+
+def _get_limiter():
+    # anyio limiters bind to the running event loop, so create on first use
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(CARD_PROCESSING_MAX_THREADS)
+    return _limiter
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking call on the card-processing threadpool and await its result.
+    At most CARD_PROCESSING_MAX_THREADS calls run at once; the rest queue.
+    """
+    return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_get_limiter())
+
+def get_http_client():
+    """Shared async HTTP client with connection pooling for image downloads."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=IMAGE_DOWNLOAD_TIMEOUT_SECONDS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _http_client
+
+async def download(url, timeout=IMAGE_DOWNLOAD_TIMEOUT_SECONDS):
+    """
+    GET url without blocking the event loop.
+    Returns the httpx.Response; callers check status_code and read .content.
+    """
+    return await get_http_client().get(url, timeout=timeout)
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
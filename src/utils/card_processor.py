@@ -4,6 +4,10 @@ import io
 from google.cloud import vision
 from tqdm import tqdm
 
+from src.utils.vision_client import get_vision_client
+from src.utils.concurrency import call_with_retry, map_ordered
+from src.utils.ocr_pool import RETRYABLE_ERRORS, OCR_MAX_RETRIES, OCR_TIMEOUT_SECONDS
+
 def _extract_card_details(text):
     """
     Uses heuristics and regex to extract details from OCR text.
@@ -73,32 +77,32 @@ def _extract_card_details(text):
 
     return details
 
-def process_all_images(image_paths):
+def _ocr_image(client, image_path, timeout=None):
+    with io.open(image_path, 'rb') as image_file:
+        content = image_file.read()
+    
+    image = vision.Image(content=content)
+    if timeout:
+        response = call_with_retry(client.document_text_detection, image=image, timeout=timeout,
+                                   retry_on=RETRYABLE_ERRORS, max_retries=OCR_MAX_RETRIES)
+    else:
+        response = client.document_text_detection(image=image)
+
+    if response.error.message:
+        raise Exception(f"{response.error.message}")
+
+    return response.full_text_annotation.text
+
+def process_all_images(image_paths, max_workers=None):
     """
     Processes a list of image paths using Google Vision API OCR.
+    With max_workers, up to that many OCR requests run concurrently (per-call
+    timeouts, jittered retries on quota errors); results keep the input order.
     """
     print("Step 2: Processing images with Google Vision API...")
 
-    # Use OAuth credentials from token.json
     try:
-        import json
-        from google.oauth2.credentials import Credentials
-        
-        if not os.path.exists('token.json'):
-            print("Error: token.json not found. Please run authentication first.")
-            return []
-            
-        with open('token.json', 'r') as f:
-            token_data = json.load(f)
-        
-        # Create credentials with Vision API scope
-        SCOPES = [
-            'https://www.googleapis.com/auth/drive.readonly',
-            'https://www.googleapis.com/auth/cloud-platform'
-        ]
-        creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-        
-        client = vision.ImageAnnotatorClient(credentials=creds)
+        client = get_vision_client()
     except Exception as e:
         print(f"Error initializing Google Vision client: {e}")
         return []
@@ -109,17 +113,21 @@ def process_all_images(image_paths):
         print("No images found to process.")
         return []
 
-    for image_path in tqdm(image_paths, desc="Processing images"):
-        try:
-            with io.open(image_path, 'rb') as image_file:
-                content = image_file.read()
-            
-            image = vision.Image(content=content)
-            response = client.document_text_detection(image=image)
-            text = response.full_text_annotation.text
+    if max_workers:
+        texts = map_ordered(lambda image_path: _ocr_image(client, image_path, OCR_TIMEOUT_SECONDS), image_paths, max_workers,
+                            desc="Processing images")
+    else:
+        texts = []
+        for image_path in tqdm(image_paths, desc="Processing images"):
+            try:
+                texts.append(_ocr_image(client, image_path))
+            except Exception as e:
+                texts.append(e)
 
-            if response.error.message:
-                raise Exception(f"{response.error.message}")
+    for image_path, text in zip(image_paths, texts):
+        try:
+            if isinstance(text, Exception):
+                raise text
 
             card_details = _extract_card_details(text)
             
@@ -0,0 +1,43 @@
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+
+def call_with_retry(func, *args, retry_on, max_retries=3, base_delay=1.0, max_delay=30.0, **kwargs):
+    """
+    Call func, retrying the exception types in retry_on with full-jitter
+    exponential backoff. Any other exception, or the last retryable one, is
+    raised to the caller.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except retry_on:
+            if attempt >= max_retries:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            attempt += 1
+            time.sleep(delay)
+
+def map_ordered(func, items, max_workers, desc="Processing"):
+    """
+    Run func over items on a bounded thread pool.
+    Returns one entry per item in input order: func's return value, or the
+    exception it raised, so one failed item never stops the rest.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    if not items:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+        for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                results[index] = e
+
+    return results
@@ -0,0 +1,208 @@
+import os
+import re
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup
+
+# Sold-listing extraction from eBay search result pages. The fast path streams
+# the page through the stdlib tokenizer, keeps only the few fields we read
+# from each listing, and stops once max_results listings are in; no document
+# tree is built. The BeautifulSoup path is the original implementation, kept
+# as a fallback and as the reference the benchmark compares against.
+#   EBAY_HTML_PARSER: fast or soup
+EBAY_HTML_PARSER = os.getenv('EBAY_HTML_PARSER', 'fast').lower()
+
+# Listing containers: the wrapper div first, any s-item div if a page has none
+ITEM_CLASS = 's-item__wrapper clearfix'
+FALLBACK_ITEM_CLASS = 's-item'
+
+PRICE_PATTERN = re.compile(r'\$?([\d,]+\.?\d*)')
+
+# How much of the page is tokenized between checks for enough listings
+FEED_CHUNK_CHARS = 64 * 1024
+
+def parse_price(price_text):
+    """First dollar amount in a price string ('$1,250.00', '$10.00 to $15.00'), or None"""
+    price_match = PRICE_PATTERN.search(price_text)
+    if not price_match:
+        return None
+    try:
+        return float(price_match.group(1).replace(',', ''))
+    except ValueError:
+        return None
+
+def _decode(html):
+    if isinstance(html, (bytes, bytearray)):
+        return bytes(html).decode('utf-8', errors='replace')
+    return html
+
+class _SoldListingStream(HTMLParser):
+    """
+    Collects price/title/sold-date text from listing containers as tags go by.
+    Mirrors the BeautifulSoup lookups: the first matching element of each kind
+    inside a listing, its text stripped piece by piece and joined.
+    """
+
+    # field -> (tag, class token); the notranslate span is the price fallback
+    FIELDS = {
+        'price': ('span', 's-item__price'),
+        'price_fallback': ('span', 'notranslate'),
+        'title': ('h3', 's-item__title'),
+        'sold_date': ('span', 's-item__endedDate'),
+    }
+
+    def __init__(self, item_class, exact_class, max_items=None):
+        super().__init__(convert_charrefs=True)
+        self.item_class = item_class
+        self.exact_class = exact_class
+        self.max_items = max_items
+        self.items = []
+        self.done = False
+        self._item = None
+        self._item_depth = 0
+        self._field = None  # (name, tag, depth, text parts) while capturing
+
+    def _is_item(self, classes):
+        if self.exact_class:
+            return ' '.join(classes.split()) == self.item_class
+        return self.item_class in classes.split()
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._field is not None:
+            if tag == self._field[1]:
+                self._field[2] += 1
+            return
+
+        classes = ''
+        for name, value in attrs:
+            if name == 'class':
+                classes = value or ''
+                break
+
+        if self._item is None:
+            if tag == 'div' and self._is_item(classes):
+                self._item = {}
+                self._item_depth = 1
+            return
+
+        if tag == 'div':
+            self._item_depth += 1
+            return
+        if not classes:
+            return
+        tokens = classes.split()
+        for name, (field_tag, field_class) in self.FIELDS.items():
+            if tag == field_tag and field_class in tokens and name not in self._item:
+                self._field = [name, tag, 1, []]
+                return
+
+    def handle_endtag(self, tag):
+        if self.done or self._item is None:
+            return
+        if self._field is not None:
+            if tag == self._field[1]:
+                self._field[2] -= 1
+                if self._field[2] == 0:
+                    name, _, _, parts = self._field
+                    self._item[name] = ''.join(part.strip() for part in parts)
+                    self._field = None
+            return
+        if tag == 'div':
+            self._item_depth -= 1
+            if self._item_depth == 0:
+                self.items.append(self._item)
+                self._item = None
+                if self.max_items is not None and len(self.items) >= self.max_items:
+                    self.done = True
+
+    def handle_data(self, data):
+        if self._field is not None:
+            self._field[3].append(data)
+
+def _stream_items(html, item_class, exact_class, max_items):
+    stream = _SoldListingStream(item_class, exact_class, max_items)
+    for start in range(0, len(html), FEED_CHUNK_CHARS):
+        stream.feed(html[start:start + FEED_CHUNK_CHARS])
+        if stream.done:
+            break
+    else:
+        stream.close()
+        # A listing still open at the end of the page (truncated HTML) still counts
+        if stream._item is not None:
+            stream.items.append(stream._item)
+    return stream.items[:max_items] if max_items is not None else stream.items
+
+def _to_listing(fields, price_fallback):
+    price_text = fields.get('price')
+    if price_text is None and price_fallback:
+        price_text = fields.get('price_fallback')
+    if price_text is None:
+        return None
+    price = parse_price(price_text)
+    if price is None:
+        return None
+    return {
+        'price': price,
+        'title': fields.get('title', 'No title'),
+        'sold_date': fields.get('sold_date', 'Unknown date'),
+    }
+
+def parse_sold_listings_fast(html, max_results=None, fallback=False):
+    """
+    Sold listings ({price, title, sold_date}) from the first max_results listing
+    containers on an eBay results page. With fallback, a page without wrapper
+    divs is read from its s-item divs, and a notranslate span stands in for a
+    missing price.
+    """
+    html = _decode(html)
+    items = _stream_items(html, ITEM_CLASS, True, max_results)
+    if not items and fallback:
+        items = _stream_items(html, FALLBACK_ITEM_CLASS, False, max_results)
+
+    listings = []
+    for fields in items:
+        listing = _to_listing(fields, fallback)
+        if listing:
+            listings.append(listing)
+    return listings
+
+def parse_sold_listings_soup(html, max_results=None, fallback=False):
+    """BeautifulSoup version of parse_sold_listings_fast, same arguments and result"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    items = soup.find_all('div', class_=ITEM_CLASS)
+    if not items and fallback:
+        items = soup.find_all('div', class_=FALLBACK_ITEM_CLASS)
+
+    listings = []
+    for item in items[:max_results]:
+        price_elem = item.find('span', class_='s-item__price')
+        if not price_elem and fallback:
+            price_elem = item.find('span', class_='notranslate')
+        if not price_elem:
+            continue
+        price = parse_price(price_elem.get_text(strip=True))
+        if price is None:
+            continue
+        title_elem = item.find('h3', class_='s-item__title')
+        date_elem = item.find('span', class_='s-item__endedDate')
+        listings.append({
+            'price': price,
+            'title': title_elem.get_text(strip=True) if title_elem else 'No title',
+            'sold_date': date_elem.get_text(strip=True) if date_elem else 'Unknown date',
+        })
+    return listings
+
+PARSERS = {
+    'fast': parse_sold_listings_fast,
+    'soup': parse_sold_listings_soup,
+}
+
+def parse_sold_listings(html, max_results=None, fallback=False, parser=None):
+    """Sold listings from an eBay results page using the EBAY_HTML_PARSER implementation"""
+    name = parser or EBAY_HTML_PARSER
+    if name not in PARSERS:
+        print(f"⚠️  Unknown EBAY_HTML_PARSER '{name}', using fast")
+        name = 'fast'
+    return PARSERS[name](html, max_results, fallback)
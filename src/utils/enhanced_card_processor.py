@@ -1,71 +1,97 @@
 import os
 import re
 import io
-import json
+import time
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from google.cloud import vision
-from google.oauth2.credentials import Credentials
-from google.oauth2 import service_account
 from tqdm import tqdm
 
-def perform_ocr_on_image(image_path):
+from src.utils.vision_client import get_vision_client
+from src.utils.ocr_cache import get_cached_annotation, store_annotation
+from src.utils.image_preprocessing import prepare_ocr_payload, preprocessing_signature
+from src.utils.concurrency import call_with_retry, map_ordered
+from src.utils.ocr_pool import (
+    get_ocr_executor, RETRYABLE_ERRORS, OCR_MAX_RETRIES, OCR_TIMEOUT_SECONDS, OCR_BACK_SIDE_TIMEOUT_SECONDS,
+    OCR_QUEUE_TIMEOUT_SECONDS,
+)
+from src.utils.ocr_patterns import (
+    GRADED_PRIMARY, GRADED_SECONDARY, GRADED_QR,
+    PSA_GRADE_PATTERNS, PSA_CERT_PATTERNS, PSA_YEAR_PATTERNS, PSA_SET_PATTERNS,
+    PSA_CARD_NUMBER_PATTERNS, PSA_PARALLEL_PATTERNS, PSA_PARALLEL_PRIORITY, PSA_FEATURE_MATCHER,
+    RECENT_YEAR, VINTAGE_YEAR, CARD_NUMBER_PATTERNS, MEASUREMENT_VALUE, SIMPLE_NUMBER,
+    MEASUREMENT_KEYWORDS, PARALLEL_PATTERNS, PARALLEL_PRIORITY, NUMBERED_PARALLEL, SET_PATTERNS,
+    MANUFACTURER_KEYWORDS, MANUFACTURER_MATCHER, LINE_LEADING_SYMBOL, LINE_CARDS_SUFFIX,
+    LINE_YEAR, LINE_CARD_NUMBER, LINE_CARD_TERMS, WHITESPACE_RUN, COPYRIGHT_PATTERNS,
+    COMPANY_SUFFIX, FEATURE_MATCHER, SET_BRAND_MANUFACTURERS, fold_for_prefilter,
+)
+
+# Vision accepts at most 16 images per synchronous batch_annotate_images request
+VISION_BATCH_LIMIT = 16
+
+def _annotate_image_content(content, client=None, timeout=None):
+    """
+    Run document_text_detection on raw image bytes, consulting the OCR cache first.
+    Returns the vision.TextAnnotation (text plus layout; empty if no text was found).
+    Raises on Vision API errors, which are never cached.
+    With OCR_PREPROCESS_ENABLED the image is downscaled/re-encoded before upload;
+    the cache stays keyed by the original bytes plus the preprocessing settings.
+    """
+    variant = preprocessing_signature()
+    annotation = get_cached_annotation(content, variant)
+    if annotation is not None:
+        return annotation
+    
+    if client is None:
+        client = get_vision_client()
+    
+    image = vision.Image(content=prepare_ocr_payload(content))
+    if timeout:
+        response = client.document_text_detection(image=image, timeout=timeout)
+    else:
+        response = client.document_text_detection(image=image)
+    
+    if response.error.message:
+        raise Exception(f"Vision API error: {response.error.message}")
+    
+    annotation = response.full_text_annotation
+    store_annotation(content, annotation, variant)
+    return annotation
+
+def _read_image(image):
+    """
+    Image bytes from a file path, raw bytes, or a readable binary buffer
+    (io.BytesIO, an upload's SpooledTemporaryFile). Buffers are read from the
+    start, so the same buffer can be passed to more than one OCR helper.
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return bytes(image)
+    if hasattr(image, 'read'):
+        if hasattr(image, 'seek'):
+            image.seek(0)
+        return image.read()
+    with io.open(image, 'rb') as image_file:
+        return image_file.read()
+
+def _image_label(image):
+    """Printable name for an image given as a path, bytes or buffer"""
+    if isinstance(image, (str, os.PathLike)):
+        return os.path.basename(image)
+    name = getattr(image, 'name', None)
+    return os.path.basename(name) if isinstance(name, str) else "in-memory image"
+
+def perform_ocr_on_image(image):
     """
     Perform OCR on a single image using Google Vision API.
+    image may be a file path, bytes, or a binary buffer.
     Returns the extracted text or None if failed.
     """
     try:
-        # Initialize Vision client with same logic as other parts of the app
-        creds = None
-        SCOPES = [
-            'https://www.googleapis.com/auth/drive.readonly',
-            'https://www.googleapis.com/auth/cloud-platform'
-        ]
-        
-        # Try OAuth token first
-        if os.path.exists('token.json'):
-            try:
-                with open('token.json', 'r') as f:
-                    token_data = json.load(f)
-                creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-            except Exception:
-                creds = None
-        
-        # Try service account
-        if not creds and os.path.exists('credentials.json'):
-            try:
-                with open('credentials.json', 'r') as f:
-                    secret_data = json.load(f)
-                if secret_data.get('type') == 'service_account':
-                    creds = service_account.Credentials.from_service_account_file(
-                        'credentials.json', scopes=SCOPES
-                    )
-            except Exception:
-                creds = None
-        
-        # Create client
-        if creds:
-            client = vision.ImageAnnotatorClient(credentials=creds)
-        else:
-            client = vision.ImageAnnotatorClient()
-        
-        # Read image file
-        with io.open(image_path, 'rb') as image_file:
-            content = image_file.read()
-        
-        image = vision.Image(content=content)
-        response = client.document_text_detection(image=image)
-        
-        if response.error.message:
-            print(f"❌ Vision API error: {response.error.message}")
-            return None
-        
-        # Extract text
-        if response.full_text_annotation:
-            return response.full_text_annotation.text
-        else:
-            return ""
+        annotation = _annotate_image_content(_read_image(image), timeout=OCR_TIMEOUT_SECONDS)
+        return annotation.text
             
     except Exception as e:
-        print(f"❌ OCR failed for {image_path}: {e}")
+        print(f"❌ OCR failed for {_image_label(image)}: {e}")
         return None
 
 def _quick_graded_card_detection(text):
@@ -74,39 +100,18 @@ def _quick_graded_card_detection(text):
     Uses multiple indicators including QR code presence and PSA-specific text.
     Returns True if graded, False otherwise.
     """
-    # Primary PSA indicators (most reliable)
-    primary_indicators = [
-        r'\bPSA\s+\d+\b',  # PSA 10, PSA 9, etc.
-        r'\bPROFESSIONAL\s+SPORTS\s+AUTHENTICATOR\b',
-        r'\bCERT\s*#?\s*\d{8,}\b',  # PSA cert numbers are typically 8+ digits
-        r'\bCERTIFICATION\s*#?\s*\d{8,}\b'
-    ]
-    
-    # Secondary indicators (supportive evidence)
-    secondary_indicators = [
-        r'\bPSA\b',
-        r'\bGRADE\s*:?\s*\d+\b',
-        r'\bAUTHENTIC\b',
-        r'\bGRADED\b'
-    ]
-    
-    # QR code indicators (PSA cards have QR codes)
-    qr_indicators = [
-        r'QR',
-        r'SCAN',
-        r'CODE'
-    ]
-    
-    primary_matches = sum(1 for pattern in primary_indicators if re.search(pattern, text, re.IGNORECASE))
-    secondary_matches = sum(1 for pattern in secondary_indicators if re.search(pattern, text, re.IGNORECASE))
-    qr_matches = sum(1 for pattern in qr_indicators if re.search(pattern, text, re.IGNORECASE))
+    folded = fold_for_prefilter(text)
     
     # Decision logic: Need at least one primary indicator OR multiple secondary + QR
-    if primary_matches >= 1:
-        return True
-    elif secondary_matches >= 2 and qr_matches >= 1:
+    if GRADED_PRIMARY.search(text, folded):
         return True
     
+    secondary_matches = set()
+    for match in GRADED_SECONDARY.finditer(text, folded):
+        secondary_matches.add(match.lastgroup)
+        if len(secondary_matches) >= 2:
+            return GRADED_QR.contains_any(folded)
+    
     return False
 
 def _detect_psa_graded_card(text):
@@ -138,18 +143,11 @@ def _extract_psa_card_details(text, player_name):
     
     print(f"🏆 Detected PSA graded card - using enhanced extraction")
     
+    folded = fold_for_prefilter(text)
+    
     # 1. Extract PSA Grade (most critical for pricing) - IMPROVED PATTERNS
-    grade_patterns = [
-        r'PSA\s+(\d+(?:\.\d+)?)\s+GEM\s+MINT',  # PSA 10 GEM MINT
-        r'PSA\s+(\d+(?:\.\d+)?)',  # PSA 10, PSA 9.5
-        r'GRADE\s*:?\s*(\d+(?:\.\d+)?)',  # GRADE: 10
-        r'(\d+(?:\.\d+)?)\s+PSA(?:\s|$)',   # 10 PSA (reverse order)
-        r'MINT\s+(\d+)(?!\d)',  # MINT 10 (but not MINT 125 etc)
-        r'GEM\s+MINT\s+(\d+)(?!\d)'  # GEM MINT 10
-    ]
-    
-    for pattern in grade_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in PSA_GRADE_PATTERNS:
+        match = pattern.search(text, folded)
         if match:
             grade_candidate = match.group(1)
             # Validate grade is reasonable (1-10)
@@ -159,16 +157,8 @@ def _extract_psa_card_details(text, player_name):
                 break
     
     # 2. Extract Certification Number (critical for authenticity)
-    cert_patterns = [
-        r'CERT\s*#?\s*(\d{8,})',  # CERT #12345678
-        r'CERTIFICATION\s*#?\s*(\d{8,})',
-        r'PSA\s*#\s*(\d{8,})',  # PSA #12345678
-        r'#\s*(\d{8,})',  # Simple # followed by long number
-        r'(\d{8,})'  # Any 8+ digit number (fallback)
-    ]
-    
-    for pattern in cert_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in PSA_CERT_PATTERNS:
+        match = pattern.search(text, folded)
         if match:
             cert_num = match.group(1)
             # Validate it's not a year or other number
@@ -178,40 +168,16 @@ def _extract_psa_card_details(text, player_name):
                 break
     
     # 3. Extract Year (PSA labels clearly display year)
-    year_patterns = [
-        r'\b(20[0-2]\d)\s+(?:TOPPS|PANINI|BOWMAN|DONRUSS|FLEER|UPPER)',  # Year before manufacturer
-        r'(?:TOPPS|PANINI|BOWMAN|DONRUSS|FLEER|UPPER)\s+(20[0-2]\d)',    # Year after manufacturer
-        r'©\s*(20[0-2]\d)',  # Copyright year
-        r'\b(20[0-2]\d)\b'  # Any recent year (fallback)
-    ]
-    
-    for pattern in year_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in PSA_YEAR_PATTERNS:
+        match = pattern.search(text, folded)
         if match:
             details["year"] = match.group(1)
             print(f"  ✅ Year found: {details['year']}")
             break
     
     # 4. Extract Set Name (PSA labels are very precise about sets) - IMPROVED PATTERNS
-    set_patterns = [
-        # Full set names with manufacturer (more specific patterns)
-        r'(?:20\d{2}\s+)?(TOPPS\s+CHROME)(?:\s+(?:ROOKIE|RC|AUTO|GOLD|REFRACTOR))*',
-        r'(?:20\d{2}\s+)?(BOWMAN\s+CHROME)(?:\s+(?:ROOKIE|RC|AUTO|PROSPECTS))*',
-        r'(?:20\d{2}\s+)?(PANINI\s+PRIZM)(?:\s+(?:BASKETBALL|FOOTBALL|ROOKIE))*',
-        r'(?:20\d{2}\s+)?(TOPPS\s+SERIES)(?:\s+\d+)*',
-        r'(?:20\d{2}\s+)?(BOWMAN\s+STERLING)(?:\s+(?:ROOKIE|RC|AUTO))*',
-        r'(?:20\d{2}\s+)?(TOPPS\s+FINEST)(?:\s+(?:ROOKIE|RC|AUTO))*',
-        r'(?:20\d{2}\s+)?(TOPPS\s+HERITAGE)(?:\s+(?:ROOKIE|RC))*',
-        # Standalone premium set names
-        r'\b(CHROME)(?:\s+(?:ROOKIE|RC|AUTO|CARD))*\b',
-        r'\b(PRIZM)(?:\s+(?:BASKETBALL|FOOTBALL|ROOKIE))*\b',
-        r'\b(SELECT|MOSAIC|OPTIC|STERLING|FINEST|HERITAGE)(?:\s+(?:ROOKIE|RC))*\b',
-        # Manufacturer only (fallback)
-        r'\b(TOPPS|PANINI|BOWMAN|DONRUSS|FLEER|UPPER\s+DECK)\b'
-    ]
-    
-    for pattern in set_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in PSA_SET_PATTERNS:
+        match = pattern.search(text, folded)
         if match:
             set_name = match.group(1).strip().title()
             if len(set_name) > 3:
@@ -219,27 +185,14 @@ def _extract_psa_card_details(text, player_name):
                 print(f"  ✅ Set found: {details['set']}")
                 
                 # Extract manufacturer from set
-                set_upper = set_name.upper()
-                if any(brand in set_upper for brand in ['TOPPS', 'BOWMAN']):
-                    details["manufacturer"] = "TOPPS"
-                elif any(brand in set_upper for brand in ['PANINI', 'PRIZM', 'SELECT', 'MOSAIC', 'OPTIC']):
-                    details["manufacturer"] = "PANINI"
-                elif 'DONRUSS' in set_upper:
-                    details["manufacturer"] = "DONRUSS"
-                elif any(brand in set_upper for brand in ['FLEER', 'UPPER']):
-                    details["manufacturer"] = "UPPER DECK"
+                manufacturer = _manufacturer_from_set(set_name)
+                if manufacturer:
+                    details["manufacturer"] = manufacturer
                 break
     
     # 5. Extract Card Number (PSA labels show card numbers clearly) - IMPROVED PATTERNS
-    card_num_patterns = [
-        r'#\s*([A-Z]*\d{1,4}[A-Z]?)(?:\s|$)',  # #150, #RC150, #150A (with word boundary)
-        r'NO\.\s*([A-Z]*\d{1,4}[A-Z]?)(?:\s|$)',  # NO. 150, NO. RC150
-        r'CARD\s*#?\s*([A-Z]*\d{1,4}[A-Z]?)(?:\s|$)',  # CARD #150
-        r'\b([A-Z]{1,3}-?\d{1,4})(?:\s|$)'  # RC-1, BDP-15, etc.
-    ]
-    
-    for pattern in card_num_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in PSA_CARD_NUMBER_PATTERNS:
+        match = pattern.search(text, folded)
         if match:
             card_num = match.group(1)
             # Avoid years and cert numbers and grades
@@ -251,57 +204,16 @@ def _extract_psa_card_details(text, player_name):
                     break
     
     # 6. Extract Parallel/Insert Information (PSA is very specific) - IMPROVED ORDER
-    parallel_patterns = [
-        r'\b(\d+/\d+)\b',  # Numbered parallels like 24/99, 1/1
-        r'\b(SUPERFRACTOR|GOLD\s+REFRACTOR|SILVER\s+REFRACTOR|BLACK\s+REFRACTOR|REFRACTOR)\b',
-        r'\b(AUTO|AUTOGRAPH|SIGNATURE)\b',
-        r'\b(PATCH|JERSEY|RELIC|MEMORABILIA)\b',
-        r'\b(RC|ROOKIE|1ST\s+BOWMAN|ROOKIE\s+PATCH\s+AUTO|RPA)\b',
-        r'\b(GOLD|SILVER|BLACK|RED|BLUE|GREEN|ORANGE|PURPLE)\s+(?:REFRACTOR|PARALLEL|PRIZM)\b',
-        r'\b(CHROME|PRIZM)(?!\s+(?:CARD|ROOKIE\s+CARD))\b'  # Avoid "Chrome Card" or "Chrome Rookie Card"
-    ]
-    
     parallel_found = []
-    for pattern in parallel_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        parallel_found.extend(matches)
+    for pattern in PSA_PARALLEL_PATTERNS:
+        parallel_found.extend(pattern.findall(text, folded))
     
     if parallel_found:
-        # Remove duplicates and join in a logical order
-        unique_parallels = []
-        seen = set()
-        # Define priority order for parallel terms
-        priority_order = ['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'GOLD', 'SILVER', 'BLACK', 'RED', 'BLUE', 'GREEN', 'ORANGE', 'PURPLE', 'REFRACTOR', 'CHROME', 'PRIZM']
-        
-        # Add numbered parallels first (like 15/50)
-        for item in parallel_found:
-            if re.match(r'\d+/\d+', item) and item.lower() not in seen:
-                unique_parallels.append(item)
-                seen.add(item.lower())
-        
-        # Add other parallels in priority order
-        for priority_item in priority_order:
-            for item in parallel_found:
-                if priority_item.lower() in item.lower() and item.lower() not in seen:
-                    unique_parallels.append(item)
-                    seen.add(item.lower())
-        
-        # Add any remaining items
-        for item in parallel_found:
-            if item.lower() not in seen:
-                unique_parallels.append(item)
-                seen.add(item.lower())
-        
-        details["parallel"] = " ".join(unique_parallels).title()
+        details["parallel"] = _order_parallels(parallel_found, PSA_PARALLEL_PRIORITY)
         print(f"  ✅ Parallel found: {details['parallel']}")
     
     # 7. Extract Special Features (important for search queries)
-    feature_keywords = ['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'RELIC', 'MEMORABILIA', '1ST BOWMAN', 'FIRST BOWMAN']
-    features_found = []
-    
-    for keyword in feature_keywords:
-        if keyword in text.upper():
-            features_found.append(keyword)
+    features_found = PSA_FEATURE_MATCHER.find_ordered(text.upper())
     
     if features_found:
         details["features"] = ", ".join(set(features_found)).title()
@@ -309,6 +221,45 @@ def _extract_psa_card_details(text, player_name):
     
     return details
 
+def _manufacturer_from_set(set_name):
+    """Manufacturer implied by brand keywords in an extracted set name, or None."""
+    set_upper = set_name.upper()
+    for brands, manufacturer in SET_BRAND_MANUFACTURERS:
+        if brands.contains_any(set_upper):
+            return manufacturer
+    return None
+
+def _order_parallels(parallel_found, priority_order):
+    """
+    Remove duplicates and join parallel terms in a logical order:
+    numbered parallels first (like 15/50), then priority_order, then the rest.
+    """
+    unique_parallels = []
+    seen = set()
+    lowered = [(item, item.lower()) for item in parallel_found]
+    
+    # Add numbered parallels first (like 15/50)
+    for item, item_lower in lowered:
+        if NUMBERED_PARALLEL.match(item) and item_lower not in seen:
+            unique_parallels.append(item)
+            seen.add(item_lower)
+    
+    # Add other parallels in priority order
+    for priority_item in priority_order:
+        priority_lower = priority_item.lower()
+        for item, item_lower in lowered:
+            if priority_lower in item_lower and item_lower not in seen:
+                unique_parallels.append(item)
+                seen.add(item_lower)
+    
+    # Add any remaining items
+    for item, item_lower in lowered:
+        if item_lower not in seen:
+            unique_parallels.append(item)
+            seen.add(item_lower)
+    
+    return " ".join(unique_parallels).title()
+
 def _extract_player_from_filename(image_path):
     """
     Extract player name from filename.
@@ -333,11 +284,12 @@ def _extract_player_from_filename(image_path):
     
     return None
 
-def _extract_card_details_enhanced(text, player_name):
+def _extract_card_details_enhanced(text, player_name, is_graded=None):
     """
     Enhanced extraction focusing on set, year, parallel, and card details.
     Uses filename-derived player name as ground truth.
     Includes specialized logic for PSA graded cards.
+    Pass is_graded when graded detection already ran on this text to skip re-detecting.
     """
     details = {
         "player": player_name,  # Use filename as ground truth
@@ -354,44 +306,42 @@ def _extract_card_details_enhanced(text, player_name):
     }
     
     # Check if this is a PSA graded card first
-    is_psa_card = _detect_psa_graded_card(text)
+    is_psa_card = _detect_psa_graded_card(text) if is_graded is None else is_graded
     if is_psa_card:
         return _extract_psa_card_details(text, player_name)
     
     # Continue with regular extraction for raw cards...
+    folded = fold_for_prefilter(text)
 
     # 1. Extract Year (prioritize recent years for current cards)
-    year_matches = re.findall(r'\b(20[0-2]\d)\b', text)
+    year_matches = RECENT_YEAR.findall(text)
     if year_matches:
         # Prefer the most recent year found
         details["year"] = max(year_matches)
     else:
         # Fallback to older years if no recent ones found
-        year_match = re.search(r'\b(19[8-9]\d)\b', text)
+        year_match = VINTAGE_YEAR.search(text)
         if year_match:
             details["year"] = year_match.group(0)
 
     # 2. Extract Card Number (various formats, avoid physical measurements)
-    card_num_patterns = [
-        r'(?:No\.|#|Card\s*#)\s*([A-Z0-9-]+)',  # Explicit card number indicators
-        r'\b([A-Z]{1,3}-?\d{1,4}[A-Z]?)\b',     # Like RC-1, BDP-15, etc.
-        r'CODE#([A-Z0-9]+)',                     # CODE# format
-    ]
-    
-    for pattern in card_num_patterns:
-        card_num_match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in CARD_NUMBER_PATTERNS:
+        card_num_match = pattern.search(text, folded)
         if card_num_match:
             potential_number = card_num_match.group(1)
             # Avoid obvious physical measurements (but be less restrictive)
-            if not re.match(r'^\d+["\']$', potential_number):  # Height like 6'2"
+            if not MEASUREMENT_VALUE.match(potential_number):  # Height like 6'2"
                 details["card_number"] = potential_number
                 break
     
     # If no explicit card number found, look for simple numbers but be more selective
     if not details["card_number"]:
-        # Look for standalone numbers that aren't obviously measurements or years
-        simple_numbers = re.findall(r'\b(\d{1,4})\b', text)
-        for num in simple_numbers:
+        # One pass collects every standalone number with the spans it occurs at
+        number_spans = {}
+        for match in SIMPLE_NUMBER.finditer(text):
+            number_spans.setdefault(match.group(1), []).append(match.span())
+        
+        for num, spans in number_spans.items():
             num_int = int(num)
             # Skip if it looks like a year, or very high numbers suggesting measurements
             # But be more selective about what we consider measurements
@@ -407,18 +357,14 @@ def _extract_card_details_enhanced(text, player_name):
             
             # Check if this number appears near measurement keywords (more context-aware)
             else:
-                # Look for the number's context in the text
-                num_pattern = rf'\b{num}\b'
-                matches = list(re.finditer(num_pattern, text))
-                for match in matches:
-                    start, end = match.span()
+                for start, end in spans:
                     # Get 20 characters before and after the number
                     context_start = max(0, start - 20)
                     context_end = min(len(text), end + 20)
                     context = text[context_start:context_end].upper()
                     
                     # Check if measurement keywords are near this specific occurrence
-                    if any(keyword in context for keyword in ['HEIGHT', 'WEIGHT', 'LBS', 'KG', 'FT', 'IN']):
+                    if MEASUREMENT_KEYWORDS.contains_any(context):
                         skip_this_number = True
                         break
             
@@ -427,152 +373,62 @@ def _extract_card_details_enhanced(text, player_name):
                 break
 
     # 3. Extract Parallel/Rarity Information (CRITICAL for pricing) - IMPROVED ORDER
-    parallel_patterns = [
-        r'\b(\d+/\d+)\b',  # Numbered parallels like 24/99, 1/1
-        r'\b(SUPERFRACTOR|GOLD\s+REFRACTOR|SILVER\s+REFRACTOR|BLACK\s+REFRACTOR|REFRACTOR)\b',
-        r'\b(AUTO|AUTOGRAPH|SIGNATURE)\b',
-        r'\b(PATCH|JERSEY|RELIC|MEMORABILIA)\b',
-        r'\b(RC|ROOKIE|RPA|ROOKIE\s+PATCH\s+AUTO)\b',
-        r'\b(GOLD|SILVER|BLACK|RED|BLUE|GREEN|ORANGE|PURPLE)\s+(?:REFRACTOR|PARALLEL|PRIZM)\b',
-        r'\b(PRIZM|OPTIC|SELECT|MOSAIC)(?!\s+(?:CARD|ROOKIE\s+CARD))\b'
-    ]
-    
     parallel_found = []
-    for pattern in parallel_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        parallel_found.extend(matches)
+    for pattern in PARALLEL_PATTERNS:
+        parallel_found.extend(pattern.findall(text, folded))
     
     if parallel_found:
-        # Remove duplicates and join in a logical order
-        unique_parallels = []
-        seen = set()
-        # Define priority order for parallel terms  
-        priority_order = ['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'GOLD', 'SILVER', 'BLACK', 'RED', 'BLUE', 'GREEN', 'ORANGE', 'PURPLE', 'REFRACTOR', 'CHROME', 'PRIZM', 'OPTIC', 'SELECT', 'MOSAIC']
-        
-        # Add numbered parallels first (like 15/50)
-        for item in parallel_found:
-            if re.match(r'\d+/\d+', item) and item.lower() not in seen:
-                unique_parallels.append(item)
-                seen.add(item.lower())
-        
-        # Add other parallels in priority order
-        for priority_item in priority_order:
-            for item in parallel_found:
-                if priority_item.lower() in item.lower() and item.lower() not in seen:
-                    unique_parallels.append(item)
-                    seen.add(item.lower())
-        
-        # Add any remaining items
-        for item in parallel_found:
-            if item.lower() not in seen:
-                unique_parallels.append(item)
-                seen.add(item.lower())
-        
-        details["parallel"] = " ".join(unique_parallels).title()
+        details["parallel"] = _order_parallels(parallel_found, PARALLEL_PRIORITY)
 
     # 4. Extract Set/Edition (focus on actual product names) - IMPROVED PATTERNS
-    # First try specific set patterns that are more precise
-    set_patterns = [
-        # Full set names with manufacturer (more specific patterns)
-        r'(?:20\d{2}\s+)?(TOPPS\s+CHROME)(?:\s+(?:ROOKIE|RC|AUTO|GOLD|REFRACTOR|CARD))*',
-        r'(?:20\d{2}\s+)?(BOWMAN\s+CHROME)(?:\s+(?:ROOKIE|RC|AUTO|PROSPECTS|CARD))*',
-        r'(?:20\d{2}\s+)?(PANINI\s+PRIZM)(?:\s+(?:BASKETBALL|FOOTBALL|ROOKIE|CARD))*',
-        r'(?:20\d{2}\s+)?(TOPPS\s+SERIES)(?:\s+\d+)*',
-        r'(?:20\d{2}\s+)?(BOWMAN\s+STERLING)(?:\s+(?:ROOKIE|RC|AUTO|CARD))*',
-        r'(?:20\d{2}\s+)?(TOPPS\s+FINEST)(?:\s+(?:ROOKIE|RC|AUTO|CARD))*',
-        r'(?:20\d{2}\s+)?(TOPPS\s+HERITAGE)(?:\s+(?:ROOKIE|RC|CARD))*',
-        # Standalone premium set names (without player names)
-        r'\b(CHROME)(?:\s+(?:ROOKIE|RC|AUTO|CARD))*\b',
-        r'\b(PRIZM)(?:\s+(?:BASKETBALL|FOOTBALL|ROOKIE|CARD))*\b',
-        r'\b(SELECT|MOSAIC|OPTIC|STERLING|FINEST|HERITAGE)(?:\s+(?:ROOKIE|RC|CARD))*\b',
-        # Simple manufacturer
-        r'\b(TOPPS|PANINI|BOWMAN|DONRUSS|FLEER)(?!\s+(?:[A-Z]+\s+){2,})\b'
-    ]
-    
     # Try pattern-based extraction first
-    for pattern in set_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in SET_PATTERNS:
+        match = pattern.search(text, folded)
         if match:
             set_name = match.group(1).strip().title()
             if len(set_name) > 3 and set_name.upper() not in player_name.upper():
                 details["set"] = set_name
                 
                 # Extract manufacturer from set
-                set_upper = set_name.upper()
-                if any(brand in set_upper for brand in ['TOPPS', 'BOWMAN']):
-                    details["manufacturer"] = "TOPPS"
-                elif any(brand in set_upper for brand in ['PANINI', 'PRIZM', 'SELECT', 'MOSAIC', 'OPTIC']):
-                    details["manufacturer"] = "PANINI"
-                elif 'DONRUSS' in set_upper:
-                    details["manufacturer"] = "DONRUSS"
-                elif any(brand in set_upper for brand in ['FLEER', 'UPPER']):
-                    details["manufacturer"] = "UPPER DECK"
+                manufacturer = _manufacturer_from_set(set_name)
+                if manufacturer:
+                    details["manufacturer"] = manufacturer
                 break
     
     # If pattern-based didn't work, fall back to line-based approach
     if not details["set"]:
         lines = [line.strip() for line in text.split('\n') if line.strip()]
-        
-        # Enhanced manufacturer keywords including smaller companies
-        manufacturer_keywords = {
-            'TOPPS': ['TOPPS', 'BOWMAN', 'CHROME'],
-            'PANINI': ['PANINI', 'PRIZM', 'SELECT', 'MOSAIC', 'OPTIC', 'DONRUSS'],
-            'UPPER DECK': ['UPPER DECK', 'UD'],
-            'FLEER': ['FLEER'],
-            'SCORE': ['SCORE'],
-            'WILD CARD': ['WILD CARD'],
-            'LEAF': ['LEAF'],
-            'SAGE': ['SAGE'],
-            'PRESS PASS': ['PRESS PASS']
-        }
+        player_words = player_name.upper().split() if player_name else []
         
         potential_sets = []
         
         for line in lines:
             line_upper = line.upper()
             
+            # Look for set names with manufacturer keywords (one scan per line)
+            line_keywords = MANUFACTURER_MATCHER.find_all(line_upper)
+            if not line_keywords:
+                continue
+            
             # Skip lines that are mostly player names
-            if player_name and len([word for word in player_name.upper().split() if word in line_upper]) >= 2:
+            if player_name and len([word for word in player_words if word in line_upper]) >= 2:
                 continue
             
-            # Look for set names with manufacturer keywords
-            for manufacturer, keywords in manufacturer_keywords.items():
-                for keyword in keywords:
-                    if keyword in line_upper:
-                        # Clean up the line more aggressively
-                        clean_line = line.strip()
-                        clean_line = re.sub(r'^[@#&*]', '', clean_line)
-                        clean_line = re.sub(r'Cards?$', '', clean_line, flags=re.IGNORECASE)
-                        clean_line = re.sub(r'\d{4}', '', clean_line)  # Remove years
-                        clean_line = re.sub(r'#\d+', '', clean_line)  # Remove card numbers
-                        clean_line = re.sub(r'\b(RC|ROOKIE|AUTO|AUTOGRAPH|CARD)\b', '', clean_line, flags=re.IGNORECASE)
-                        
-                        # Remove player name components
-                        if player_name:
-                            for name_part in player_name.split():
-                                if len(name_part) > 2:  # Only remove substantial name parts
-                                    clean_line = re.sub(rf'\b{re.escape(name_part)}\b', '', clean_line, flags=re.IGNORECASE)
-                        
-                        clean_line = re.sub(r'\s+', ' ', clean_line).strip()  # Normalize spaces
-                        
-                        if len(clean_line) > 3 and clean_line.upper() not in ['RC', 'ROOKIE', 'AUTO', 'CARD']:
-                            potential_sets.append(clean_line)
-                            if not details["manufacturer"]:
-                                details["manufacturer"] = manufacturer
-                        break
+            clean_line = _clean_set_line(line, player_name)
+            for manufacturer, keywords in MANUFACTURER_KEYWORDS.items():
+                if any(keyword in line_keywords for keyword in keywords):
+                    if len(clean_line) > 3 and clean_line.upper() not in ['RC', 'ROOKIE', 'AUTO', 'CARD']:
+                        potential_sets.append(clean_line)
+                        if not details["manufacturer"]:
+                            details["manufacturer"] = manufacturer
         
         # Also look for copyright lines that might indicate manufacturer
-        copyright_patterns = [
-            r'Copyright\s+\d{4}\s+([^,\.]+)',  # "Copyright 2024 Wild Card, Inc."
-            r'©\s*\d{4}\s+([^,\.]+)',          # "© 2024 Wild Card"
-        ]
-        
-        for pattern in copyright_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in COPYRIGHT_PATTERNS:
+            match = pattern.search(text, folded)
             if match:
                 copyright_company = match.group(1).strip()
                 # Clean up common suffixes
-                copyright_company = re.sub(r'\s+(Inc\.?|LLC\.?|Corp\.?)', '', copyright_company, flags=re.IGNORECASE)
+                copyright_company = COMPANY_SUFFIX.sub('', copyright_company)
                 if len(copyright_company) > 3 and not details["set"]:
                     potential_sets.append(copyright_company)
                     if not details["manufacturer"]:
@@ -586,114 +442,243 @@ def _extract_card_details_enhanced(text, player_name):
             details["set"] = unique_sets[0].title()
 
     # 5. Extract Special Features
-    feature_keywords = ['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'RELIC', 'MEMORABILIA', 'SERIAL', 'NUMBERED']
-    features_found = []
-    
-    for keyword in feature_keywords:
-        if keyword in text.upper():
-            features_found.append(keyword)
+    features_found = FEATURE_MATCHER.find_ordered(text.upper())
     
     if features_found:
         details["features"] = ", ".join(set(features_found)).title()
 
     return details
 
-def quick_graded_check(image_path):
+def _clean_set_line(line, player_name):
+    """Strip symbols, years, card numbers, card terms and player name parts from a set line."""
+    clean_line = line.strip()
+    clean_line = LINE_LEADING_SYMBOL.sub('', clean_line)
+    clean_line = LINE_CARDS_SUFFIX.sub('', clean_line)
+    clean_line = LINE_YEAR.sub('', clean_line)  # Remove years
+    clean_line = LINE_CARD_NUMBER.sub('', clean_line)  # Remove card numbers
+    clean_line = LINE_CARD_TERMS.sub('', clean_line)
+    
+    # Remove player name components
+    if player_name:
+        for name_part in player_name.split():
+            if len(name_part) > 2:  # Only remove substantial name parts
+                clean_line = re.sub(rf'\b{re.escape(name_part)}\b', '', clean_line, flags=re.IGNORECASE)
+    
+    return WHITESPACE_RUN.sub(' ', clean_line).strip()  # Normalize spaces
+
+def analyze_card_text(text, player_name):
     """
-    Quick check to determine if a card is PSA graded before full OCR processing.
-    This allows for faster, more targeted extraction.
+    Single pass over one OCR result: graded detection runs once and its answer
+    picks the PSA or raw-card extractor for the same text.
+    Returns the card details dict (details['graded'] carries the detection).
     """
-    try:
-        # Use OAuth credentials from token.json
-        import json
-        from google.oauth2.credentials import Credentials
-        
-        creds = None
+    is_graded = _quick_graded_card_detection(text)
+    return _extract_card_details_enhanced(text, player_name, is_graded=is_graded)
 
-        SCOPES = [
-            'https://www.googleapis.com/auth/drive.readonly',
-            'https://www.googleapis.com/auth/cloud-platform'
-        ]
+def analyze_card_image(image, player_name=None, client=None):
+    """
+    Unified OCR pipeline: OCR the image once, then feed the text to both graded
+    detection and full extraction. Use this instead of quick_graded_check
+    followed by a second extraction pass.
+    image may be a file path, bytes, or a binary buffer; without a path the
+    player name cannot come from the filename, so pass player_name.
+    Returns (text, card_details). Raises on Vision API errors.
+    """
+    if not player_name and isinstance(image, (str, os.PathLike)):
+        player_name = _extract_player_from_filename(image)
+    
+    text = _annotate_image_content(_read_image(image), client).text
+    return text, analyze_card_text(text, player_name)
 
-        # 1️⃣ Try OAuth token.json (interactive flow)
-        if os.path.exists('token.json'):
-            try:
-                with open('token.json', 'r') as f:
-                    token_data = json.load(f)
-                creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-            except Exception:
-                creds = None
-
-        # 2️⃣ Try service-account key
-        if not creds and os.path.exists('credentials.json'):
-            try:
-                from google.oauth2 import service_account
-                with open('credentials.json', 'r') as f:
-                    secret_data = json.load(f)
-                if secret_data.get('type') == 'service_account':
-                    creds = service_account.Credentials.from_service_account_file(
-                        'credentials.json', scopes=SCOPES
-                    )
-            except Exception:
-                creds = None
-
-        # 3️⃣ Fallback: default credentials (e.g., GOOGLE_APPLICATION_CREDENTIALS)
-        if creds:
-            client = vision.ImageAnnotatorClient(credentials=creds)
-        else:
-            client = vision.ImageAnnotatorClient()
-        
+def quick_graded_check(image):
+    """
+    Quick check to determine if a card is PSA graded before full OCR processing.
+    image may be a file path, bytes, or a binary buffer.
+    The OCR result is cached, so a later analyze_card_image() or
+    process_all_images_enhanced() on the same image does not call Vision again.
+    """
+    try:
         # Quick OCR scan for graded indicators
-        with io.open(image_path, 'rb') as image_file:
-            content = image_file.read()
-        
-        image = vision.Image(content=content)
-        response = client.document_text_detection(image=image)
-        
-        if response.error.message:
-            return False
-            
-        text = response.full_text_annotation.text if response.full_text_annotation else ""
+        text = _annotate_image_content(_read_image(image)).text
         
         # Use our quick detection function
         is_graded = _quick_graded_card_detection(text)
         
         if is_graded:
-            print(f"🏆 Quick scan detected PSA graded card: {os.path.basename(image_path)}")
+            print(f"🏆 Quick scan detected PSA graded card: {_image_label(image)}")
         
         return is_graded
         
     except Exception as e:
-        print(f"Error in quick graded check for {image_path}: {e}")
+        print(f"Error in quick graded check for {_image_label(image)}: {e}")
         return False
 
-def process_all_images_enhanced(image_paths):
+def _batch_annotate_images(images, client=None, batch_size=VISION_BATCH_LIMIT, max_workers=None):
+    """
+    OCR many images with batch_annotate_images, up to batch_size images per request.
+    images are file paths, bytes or binary buffers.
+    Cached images are not re-sent. Errors are isolated per image: the returned list
+    holds a vision.TextAnnotation or the Exception for each image, in input order.
+    With max_workers, up to that many batch requests are in flight at once.
+    Images are read one batch at a time, so only the batches in flight hold image bytes.
+    """
+    batch_size = max(1, min(batch_size, VISION_BATCH_LIMIT))
+    results = [None] * len(images)
+    variant = preprocessing_signature()
+    feature = vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)
+    
+    def annotate_chunk(chunk):
+        """(index, annotation or Exception) for the images at chunk's indices"""
+        chunk_results = []
+        contents = {}
+        for index in chunk:
+            try:
+                content = _read_image(images[index])
+            except Exception as e:
+                chunk_results.append((index, e))
+                continue
+            cached = get_cached_annotation(content, variant)
+            if cached is not None:
+                chunk_results.append((index, cached))
+            else:
+                contents[index] = content
+        if not contents:
+            return chunk_results
+        
+        vision_client = client or get_vision_client()
+        requests = [
+            vision.AnnotateImageRequest(image=vision.Image(content=prepare_ocr_payload(content)), features=[feature])
+            for content in contents.values()
+        ]
+        
+        try:
+            batch_response = call_with_retry(vision_client.batch_annotate_images, requests=requests, timeout=OCR_TIMEOUT_SECONDS,
+                                             retry_on=RETRYABLE_ERRORS, max_retries=OCR_MAX_RETRIES)
+        except Exception as e:
+            # A rejected batch (e.g. one oversized image) must not sink its neighbours
+            print(f"\n⚠️  Batch OCR request failed ({e}); retrying {len(contents)} images individually")
+            for index, content in contents.items():
+                try:
+                    chunk_results.append((index, _annotate_image_content(content, vision_client, OCR_TIMEOUT_SECONDS)))
+                except Exception as image_error:
+                    chunk_results.append((index, image_error))
+            return chunk_results
+        
+        for (index, content), response in zip(contents.items(), batch_response.responses):
+            if response.error.message:
+                chunk_results.append((index, Exception(f"Vision API error: {response.error.message}")))
+            else:
+                store_annotation(content, response.full_text_annotation, variant)
+                chunk_results.append((index, response.full_text_annotation))
+        return chunk_results
+    
+    chunks = [range(start, min(start + batch_size, len(images))) for start in range(0, len(images), batch_size)]
+    if max_workers:
+        chunk_results = map_ordered(annotate_chunk, chunks, max_workers, desc="OCR batches")
+    else:
+        chunk_results = [annotate_chunk(chunk) for chunk in tqdm(chunks, desc="OCR batches")]
+    
+    for chunk, annotations in zip(chunks, chunk_results):
+        if isinstance(annotations, Exception):
+            annotations = [(index, annotations) for index in chunk]
+        for index, annotation in annotations:
+            results[index] = annotation
+    
+    return results
+
+def _ocr_images(images, client, batch_size=None, max_workers=None):
+    """
+    OCR stage for process_all_images_enhanced.
+    Returns a vision.TextAnnotation or the Exception for each image, in input order.
+    """
+    if batch_size:
+        return _batch_annotate_images(images, client, batch_size, max_workers)
+    
+    if max_workers:
+        def ocr_image(image):
+            content = _read_image(image)
+            return call_with_retry(_annotate_image_content, content, client, OCR_TIMEOUT_SECONDS,
+                                   retry_on=RETRYABLE_ERRORS, max_retries=OCR_MAX_RETRIES)
+        
+        return map_ordered(ocr_image, images, max_workers, desc="Processing images")
+    
+    results = []
+    for image in tqdm(images, desc="Processing images"):
+        try:
+            results.append(_annotate_image_content(_read_image(image), client))
+        except Exception as e:
+            results.append(e)
+    return results
+
+def _build_card_result(image_path, text, card_details):
+    # Calculate confidence based on extracted fields
+    required_fields = ['player', 'set', 'year']
+    found_fields = [k for k in required_fields if card_details.get(k)]
+    confidence = len(found_fields) / len(required_fields)
+    
+    # Add bonus confidence for parallel/special features
+    if card_details.get('parallel') or card_details.get('features'):
+        confidence = min(1.0, confidence + 0.2)
+
+    return {
+        'image_path': image_path,
+        'player': card_details.get('player'),
+        'set': card_details.get('set'),
+        'year': card_details.get('year'),
+        'card_number': card_details.get('card_number'),
+        'parallel': card_details.get('parallel'),
+        'manufacturer': card_details.get('manufacturer'),
+        'features': card_details.get('features'),
+        'graded': card_details.get('graded', False),
+        'grade': card_details.get('grade'),
+        'grading_company': card_details.get('grading_company'),
+        'cert_number': card_details.get('cert_number'),
+        'extraction_confidence': round(confidence, 2),
+        'extraction_method': 'filename + OCR',
+        'full_ocr_text': text
+    }
+
+def _build_error_result(image_path, error):
+    # Still try to get player name from filename
+    player_name = _extract_player_from_filename(image_path)
+    return {
+        'image_path': image_path, 
+        'player': player_name, 
+        'set': None, 
+        'year': None, 
+        'card_number': None,
+        'parallel': None,
+        'manufacturer': None,
+        'features': None,
+        'graded': False,
+        'grade': None,
+        'grading_company': None,
+        'cert_number': None,
+        'extraction_confidence': 0.3 if player_name else 0.0, 
+        'extraction_method': 'filename only',
+        'full_ocr_text': f"Error: {error}"
+    }
+
+def process_all_images_enhanced(image_paths, batch_size=None, max_workers=None):
     """
     Enhanced processing that uses filename for player names and OCR for card details.
     Includes quick graded card detection for optimized processing.
+    
+    batch_size: when set, images are OCR'd with batch_annotate_images, up to
+    VISION_BATCH_LIMIT images per request, instead of one request per image.
+    A failed image never fails the rest of its batch.
+    max_workers: when set, up to that many OCR requests (or batches) run
+    concurrently, with per-call timeouts and jittered retries on quota errors.
+    Results keep the input order either way.
+    
+    Each entry is a file path, or a (filename, image) pair where image is bytes
+    or a binary buffer, so uploads can be OCR'd without touching disk. The
+    filename supplies the player name and the result's image_path.
     """
     print("Step 2: Processing images with enhanced extraction...")
 
-    # Use OAuth credentials from token.json
     try:
-        import json
-        from google.oauth2.credentials import Credentials
-        
-        if not os.path.exists('token.json'):
-            print("Error: token.json not found. Please run authentication first.")
-            return []
-            
-        with open('token.json', 'r') as f:
-            token_data = json.load(f)
-        
-        # Create credentials with Vision API scope
-        SCOPES = [
-            'https://www.googleapis.com/auth/drive.readonly',
-            'https://www.googleapis.com/auth/cloud-platform'
-        ]
-        creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-        
-        client = vision.ImageAnnotatorClient(credentials=creds)
+        client = get_vision_client()
     except Exception as e:
         print(f"Error initializing Google Vision client: {e}")
         return []
@@ -704,78 +689,31 @@ def process_all_images_enhanced(image_paths):
         print("No images found to process.")
         return []
 
-    for image_path in tqdm(image_paths, desc="Processing images"):
+    # Extract player names from filenames first
+    cards_to_scan = []
+    for entry in image_paths:
+        image_path, image = entry if isinstance(entry, tuple) else (entry, entry)
+        player_name = _extract_player_from_filename(image_path)
+        if not player_name:
+            print(f"\nWarning: Could not extract player name from {image_path}")
+            continue
+        cards_to_scan.append((image_path, image, player_name))
+    
+    annotations = _ocr_images([image for _, image, _ in cards_to_scan], client, batch_size, max_workers)
+    
+    for (image_path, _, player_name), annotation in zip(cards_to_scan, annotations):
         try:
-            # Extract player name from filename first
-            player_name = _extract_player_from_filename(image_path)
-            
-            if not player_name:
-                print(f"\nWarning: Could not extract player name from {image_path}")
-                continue
-            
-            # Get OCR text for set/year/parallel extraction
-            with io.open(image_path, 'rb') as image_file:
-                content = image_file.read()
+            if isinstance(annotation, Exception):
+                raise annotation
             
-            image = vision.Image(content=content)
-            response = client.document_text_detection(image=image)
-            text = response.full_text_annotation.text if response.full_text_annotation else ""
-
-            if response.error.message:
-                raise Exception(f"{response.error.message}")
-
-            # Enhanced extraction using filename + OCR
-            card_details = _extract_card_details_enhanced(text, player_name)
-            
-            # Calculate confidence based on extracted fields
-            required_fields = ['player', 'set', 'year']
-            found_fields = [k for k in required_fields if card_details.get(k)]
-            confidence = len(found_fields) / len(required_fields)
-            
-            # Add bonus confidence for parallel/special features
-            if card_details.get('parallel') or card_details.get('features'):
-                confidence = min(1.0, confidence + 0.2)
-
-            result = {
-                'image_path': image_path,
-                'player': card_details.get('player'),
-                'set': card_details.get('set'),
-                'year': card_details.get('year'),
-                'card_number': card_details.get('card_number'),
-                'parallel': card_details.get('parallel'),
-                'manufacturer': card_details.get('manufacturer'),
-                'features': card_details.get('features'),
-                'graded': card_details.get('graded', False),
-                'grade': card_details.get('grade'),
-                'grading_company': card_details.get('grading_company'),
-                'cert_number': card_details.get('cert_number'),
-                'extraction_confidence': round(confidence, 2),
-                'extraction_method': 'filename + OCR',
-                'full_ocr_text': text
-            }
-            processed_cards.append(result)
+            # One OCR pass feeds graded detection and set/year/parallel extraction
+            text = annotation.text
+            card_details = analyze_card_text(text, player_name)
+            processed_cards.append(_build_card_result(image_path, text, card_details))
 
         except Exception as e:
             print(f"\nError processing {image_path}: {e}")
-            # Still try to get player name from filename
-            player_name = _extract_player_from_filename(image_path)
-            processed_cards.append({
-                'image_path': image_path, 
-                'player': player_name, 
-                'set': None, 
-                'year': None, 
-                'card_number': None,
-                'parallel': None,
-                'manufacturer': None,
-                'features': None,
-                'graded': False,
-                'grade': None,
-                'grading_company': None,
-                'cert_number': None,
-                'extraction_confidence': 0.3 if player_name else 0.0, 
-                'extraction_method': 'filename only',
-                'full_ocr_text': f"Error: {e}"
-            })
+            processed_cards.append(_build_error_result(image_path, e))
     
     print("Enhanced image processing complete.")
     
@@ -798,6 +736,36 @@ def process_all_images_enhanced(image_paths):
 # Alias for backward compatibility
 process_all_images = process_all_images_enhanced
 
+class _OcrTask:
+    """
+    A call run on the shared OCR pool whose timeout counts from when it starts
+    running, so time spent queued behind other cards' OCR is not held against it.
+    The queue wait has its own limit, after which the call is cancelled.
+    """
+
+    def __init__(self, executor, func, *args):
+        self._started = threading.Event()
+        self._started_at = None
+        self._queue_deadline = time.monotonic() + OCR_QUEUE_TIMEOUT_SECONDS
+        self._future = executor.submit(self._run, func, *args)
+
+    def _run(self, func, *args):
+        self._started_at = time.monotonic()
+        self._started.set()
+        return func(*args)
+
+    def result(self, timeout):
+        """
+        func's result; raises FutureTimeoutError once it has run for timeout
+        seconds, or if it is still queued at the queue deadline
+        """
+        if not self._started.wait(max(0, self._queue_deadline - time.monotonic())):
+            if self._future.cancel():
+                raise FutureTimeoutError(f"OCR still queued after {OCR_QUEUE_TIMEOUT_SECONDS:.0f}s")
+            # It started just as the deadline passed
+            self._started.wait()
+        return self._future.result(timeout=max(0, self._started_at + timeout - time.monotonic()))
+
 def process_dual_side_card(front_image_path, back_image_path=None, player_name=None):
     """
     Process a card with front and optionally back images for comprehensive OCR.
@@ -805,41 +773,60 @@ def process_dual_side_card(front_image_path, back_image_path=None, player_name=N
     Front side typically contains: player name, team, parallel info
     Back side typically contains: year, card number, set info, stats
     
+    Either side may be a file path, bytes, or a binary buffer; for in-memory
+    images pass player_name, since there is no filename to read it from.
+    
     Returns merged card details with confidence scoring.
     """
     print(f"🔍 Processing dual-side card...")
     
     # Extract player name from filename if not provided
-    if not player_name:
+    if not player_name and isinstance(front_image_path, (str, os.PathLike)):
         player_name = _extract_player_from_filename(front_image_path)
     
     front_details = {}
     back_details = {}
+    front_timed_out = back_timed_out = False
+    
+    # The sides are independent until the merge, so OCR both at once:
+    # dual-side latency is one Vision round trip instead of two
+    executor = get_ocr_executor()
+    print(f"📄 Processing front: {_image_label(front_image_path)}")
+    front_task = _OcrTask(executor, perform_ocr_on_image, front_image_path)
+    back_task = None
+    if back_image_path is not None and (not isinstance(back_image_path, (str, os.PathLike)) or os.path.exists(back_image_path)):
+        print(f"📄 Processing back: {_image_label(back_image_path)}")
+        back_task = _OcrTask(executor, perform_ocr_on_image, back_image_path)
     
     # Process front side
     try:
-        print(f"📄 Processing front: {os.path.basename(front_image_path)}")
-        front_text = perform_ocr_on_image(front_image_path)
+        front_text = front_task.result(timeout=OCR_TIMEOUT_SECONDS)
         if front_text:
-            front_details = _extract_card_details_enhanced(front_text, player_name)
+            front_details = analyze_card_text(front_text, player_name)
             front_details['ocr_source'] = 'front'
             print(f"   Front extracted: {len([k for k,v in front_details.items() if v])} fields")
         else:
             print("   ⚠️  No text from front side")
+    except FutureTimeoutError as e:
+        front_timed_out = True
+        print(f"   ⚠️  Front side OCR timed out: {e or f'ran past {OCR_TIMEOUT_SECONDS:.0f}s'}")
     except Exception as e:
         print(f"   ❌ Front side error: {e}")
     
-    # Process back side if provided
-    if back_image_path and os.path.exists(back_image_path):
+    # Process back side if provided; a slow back degrades to front-only
+    if back_task is not None:
         try:
-            print(f"📄 Processing back: {os.path.basename(back_image_path)}")
-            back_text = perform_ocr_on_image(back_image_path)
+            back_text = back_task.result(timeout=OCR_BACK_SIDE_TIMEOUT_SECONDS)
             if back_text:
-                back_details = _extract_card_details_enhanced(back_text, player_name)
+                back_details = analyze_card_text(back_text, player_name)
                 back_details['ocr_source'] = 'back'
                 print(f"   Back extracted: {len([k for k,v in back_details.items() if v])} fields")
             else:
                 print("   ⚠️  No text from back side")
+        except FutureTimeoutError as e:
+            # An OCR call that had started keeps running and lands in the OCR cache for the next attempt
+            back_timed_out = True
+            print(f"   ⚠️  Back side OCR timed out: {e or f'ran past {OCR_BACK_SIDE_TIMEOUT_SECONDS:.0f}s'} - using front only")
         except Exception as e:
             print(f"   ❌ Back side error: {e}")
     
@@ -849,7 +836,12 @@ def process_dual_side_card(front_image_path, back_image_path=None, player_name=N
     # Calculate confidence based on critical fields found
     confidence_score = _calculate_dual_side_confidence(merged_details)
     merged_details['confidence_score'] = confidence_score
-    merged_details['dual_side'] = back_image_path is not None
+    # Only a back side that was read counts; a failed or timed-out one leaves front-only details
+    merged_details['dual_side'] = bool(back_details)
+    if front_timed_out:
+        merged_details['front_side_timed_out'] = True
+    if back_timed_out:
+        merged_details['back_side_timed_out'] = True
     
     print(f"✅ Merged card details (confidence: {confidence_score:.1%})")
     return merged_details
@@ -0,0 +1,160 @@
+import io
+import os
+import threading
+
+try:
+    from PIL import Image, ImageChops, ImageFilter, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Optional client-side preprocessing before Vision OCR. Phone photos are often
+# 3-5 MB; bounding the long edge and re-encoding as JPEG cuts the upload, which
+# dominates request latency, while keeping card text legible to Vision.
+OCR_PREPROCESS_ENABLED = os.getenv('OCR_PREPROCESS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+OCR_MAX_LONG_EDGE = int(os.getenv('OCR_MAX_LONG_EDGE', '1600'))
+OCR_JPEG_QUALITY = int(os.getenv('OCR_JPEG_QUALITY', '85'))
+OCR_CROP_TO_CARD = os.getenv('OCR_CROP_TO_CARD', 'false').lower() in ('1', 'true', 'yes')
+
+# Card detection: pixels differing from the border color by more than this
+# (0-255 grayscale) count as card/slab; the crop keeps a small margin around them.
+CROP_THRESHOLD = 40
+CROP_MARGIN = 0.03
+CROP_MIN_AREA = 0.2  # Ignore detections covering less than 20% of the photo
+
+_stats = {
+    "images": 0,
+    "original_bytes": 0,
+    "payload_bytes": 0,
+}
+_stats_lock = threading.Lock()
+
+def preprocessing_signature():
+    """
+    Short string identifying the preprocessing settings, or None when disabled.
+    OCR results are cached per signature so different settings never share results.
+    """
+    if not OCR_PREPROCESS_ENABLED:
+        return None
+    return f"edge{OCR_MAX_LONG_EDGE}-q{OCR_JPEG_QUALITY}{'-crop' if OCR_CROP_TO_CARD else ''}"
+
+def _border_color(gray):
+    """Median grayscale value of the outermost pixels (the background behind the card)."""
+    width, height = gray.size
+    pixels = gray.load()
+    border = [pixels[x, 0] for x in range(width)] + [pixels[x, height - 1] for x in range(width)]
+    border += [pixels[0, y] for y in range(height)] + [pixels[width - 1, y] for y in range(height)]
+    border.sort()
+    return border[len(border) // 2]
+
+def find_card_region(image):
+    """
+    Bounding box (left, top, right, bottom) of the card or slab in a photo, or None.
+    Works on a small grayscale thumbnail: anything that differs clearly from the
+    background color along the photo border is treated as card.
+    """
+    gray = image.convert('L')
+    gray.thumbnail((256, 256))
+    background = Image.new('L', gray.size, _border_color(gray))
+    mask = ImageChops.difference(gray, background).point(lambda v: 255 if v > CROP_THRESHOLD else 0)
+    bbox = mask.filter(ImageFilter.MedianFilter(5)).getbbox()
+    if not bbox:
+        return None
+
+    left, top, right, bottom = bbox
+    area = (right - left) * (bottom - top) / float(gray.size[0] * gray.size[1])
+    if area < CROP_MIN_AREA:
+        return None
+
+    # Scale back to full resolution and pad so edge text is not clipped
+    scale_x = image.size[0] / float(gray.size[0])
+    scale_y = image.size[1] / float(gray.size[1])
+    pad_x = image.size[0] * CROP_MARGIN
+    pad_y = image.size[1] * CROP_MARGIN
+    return (
+        max(0, int(left * scale_x - pad_x)),
+        max(0, int(top * scale_y - pad_y)),
+        min(image.size[0], int(right * scale_x + pad_x)),
+        min(image.size[1], int(bottom * scale_y + pad_y)),
+    )
+
+def preprocess_image_bytes(content, max_long_edge=None, quality=None, crop=None):
+    """
+    Downscale, optionally crop and re-encode image bytes as JPEG for OCR.
+    Returns (payload_bytes, info) where info reports original/payload byte counts
+    and pixel sizes. The original bytes are returned unchanged when Pillow is
+    missing, the image cannot be decoded, or re-encoding would not make it smaller.
+    """
+    max_long_edge = max_long_edge or OCR_MAX_LONG_EDGE
+    quality = quality or OCR_JPEG_QUALITY
+    crop = OCR_CROP_TO_CARD if crop is None else crop
+
+    info = {
+        "original_bytes": len(content),
+        "payload_bytes": len(content),
+        "original_size": None,
+        "payload_size": None,
+        "cropped": False,
+        "preprocessed": False,
+    }
+    if not PIL_AVAILABLE:
+        return content, info
+
+    try:
+        image = Image.open(io.BytesIO(content))
+        image = ImageOps.exif_transpose(image)  # Phone photos carry rotation in EXIF
+        info["original_size"] = image.size
+
+        if crop:
+            region = find_card_region(image)
+            if region:
+                image = image.crop(region)
+                info["cropped"] = True
+
+        if max(image.size) > max_long_edge:
+            image.thumbnail((max_long_edge, max_long_edge), Image.LANCZOS)
+
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=quality, optimize=True)
+        payload = buffer.getvalue()
+    except Exception as e:
+        print(f"⚠️  Image preprocessing failed, sending original: {e}")
+        return content, info
+
+    if len(payload) >= len(content) and not info["cropped"]:
+        return content, info
+
+    info.update(payload_bytes=len(payload), payload_size=image.size, preprocessed=True)
+    return payload, info
+
+def prepare_ocr_payload(content):
+    """
+    Bytes to send to Vision for this image, honoring the OCR_PREPROCESS_* settings.
+    Byte savings are added to the running totals in get_preprocessing_stats().
+    """
+    if not OCR_PREPROCESS_ENABLED:
+        return content
+
+    payload, info = preprocess_image_bytes(content)
+    with _stats_lock:
+        _stats["images"] += 1
+        _stats["original_bytes"] += info["original_bytes"]
+        _stats["payload_bytes"] += info["payload_bytes"]
+    if info["preprocessed"]:
+        print(f"🗜️  OCR payload {info['original_bytes'] / 1024:.0f}KB -> {info['payload_bytes'] / 1024:.0f}KB "
+              f"({info['original_size'][0]}x{info['original_size'][1]} -> "
+              f"{info['payload_size'][0]}x{info['payload_size'][1]}{', cropped' if info['cropped'] else ''})")
+    return payload
+
+def get_preprocessing_stats():
+    """Running totals of images preprocessed and bytes before/after."""
+    with _stats_lock:
+        stats = dict(_stats)
+    if stats["original_bytes"]:
+        stats["bytes_saved_pct"] = round(100.0 * (1 - stats["payload_bytes"] / stats["original_bytes"]), 1)
+    else:
+        stats["bytes_saved_pct"] = 0.0
+    return stats
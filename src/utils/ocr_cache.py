@@ -0,0 +1,65 @@
+import os
+import hashlib
+import threading
+from diskcache import Cache
+from google.cloud import vision
+
+# Persistent OCR results keyed by the SHA-256 of the image bytes, so retries,
+# re-uploads and dual-side reprocessing of the same image never hit Vision again.
+# diskcache stores entries in SQLite and evicts least-recently-used entries
+# once the directory grows past the size limit.
+OCR_CACHE_DIR = os.getenv('OCR_CACHE_DIR', os.path.join('.cache', 'ocr'))
+OCR_CACHE_SIZE_LIMIT = int(os.getenv('OCR_CACHE_SIZE_LIMIT', str(512 * 1024 * 1024)))  # 512 MB
+OCR_CACHE_ENABLED = os.getenv('OCR_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = Cache(
+                    OCR_CACHE_DIR,
+                    size_limit=OCR_CACHE_SIZE_LIMIT,
+                    eviction_policy='least-recently-used'
+                )
+    return _cache
+
+def image_cache_key(content, variant=None):
+    """
+    Content address for an image: the hex SHA-256 of its bytes.
+    variant distinguishes OCR of the same image under different preprocessing.
+    """
+    key = f"ocr::{hashlib.sha256(content).hexdigest()}"
+    return f"{key}::{variant}" if variant else key
+
+def get_cached_annotation(content, variant=None):
+    """
+    Return the cached vision.TextAnnotation for these image bytes, or None on a miss.
+    The annotation carries both the full text and the page/block/word layout.
+    """
+    if not OCR_CACHE_ENABLED:
+        return None
+    try:
+        layout = _get_cache().get(image_cache_key(content, variant))
+    except Exception as e:
+        print(f"⚠️  OCR cache read failed: {e}")
+        return None
+    if layout is None:
+        return None
+    return vision.TextAnnotation.deserialize(layout)
+
+def store_annotation(content, annotation, variant=None):
+    """Persist a successful OCR result for these image bytes."""
+    if not OCR_CACHE_ENABLED:
+        return
+    try:
+        _get_cache().set(image_cache_key(content, variant), vision.TextAnnotation.serialize(annotation))
+    except Exception as e:
+        print(f"⚠️  OCR cache write failed: {e}")
+
+def clear_ocr_cache():
+    """Remove every cached OCR result."""
+    _get_cache().clear()
@@ -0,0 +1,276 @@
+import re
+
+# Compiled patterns for OCR card-text parsing. Everything is compiled once at
+# import instead of going through re's pattern cache on every call.
+#
+# Field families that are first-match-wins by pattern priority (grade, cert,
+# year, set, card number, parallel) stay ordered lists: folding them into one
+# alternation would pick the leftmost match in the text instead of the
+# highest-priority pattern. Instead each pattern carries the literals it needs,
+# and a substring prefilter skips the regex scan when they are absent. Families
+# where only "does anything match" matters are combined into one alternation.
+
+class KeywordMatcher:
+    """
+    Aho-Corasick style matcher for a fixed keyword list.
+    Keywords are linked to the shorter keywords they contain, like the automaton's
+    output links: a missing keyword rules out every keyword that contains it
+    (no AUTO means no AUTOGRAPH), so each text gets one substring test per
+    keyword at most. Matching is case-sensitive; fold or upper-case the text.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        self._ordered = sorted(set(self.keywords), key=len)
+        self._contained = {
+            keyword: tuple(other for other in self._ordered if other != keyword and other in keyword)
+            for keyword in self._ordered
+        }
+        # A keyword containing another is only present if the shorter one is,
+        # so testing the minimal keywords answers "any present?"
+        self._minimal = tuple(keyword for keyword in self._ordered if not self._contained[keyword])
+
+    def find_all(self, text):
+        """Return the set of keywords that occur anywhere in text."""
+        found = set()
+        missing = set()
+        for keyword in self._ordered:
+            contained = self._contained[keyword]
+            if contained and not missing.isdisjoint(contained):
+                missing.add(keyword)
+            elif keyword in text:
+                found.add(keyword)
+            else:
+                missing.add(keyword)
+        return found
+
+    def find_ordered(self, text):
+        """Keywords present in text, in keyword-list order."""
+        found = self.find_all(text)
+        return [keyword for keyword in self.keywords if keyword in found]
+
+    def contains_any(self, text):
+        for keyword in self._minimal:
+            if keyword in text:
+                return True
+        return False
+
+def fold_for_prefilter(text):
+    """
+    Case-fold text for literal prefilters. re.IGNORECASE also equates the dotless
+    \u0131 with i, which casefold() keeps distinct.
+    """
+    return text.casefold().replace('\u0131', 'i')
+
+class PrefilteredPattern:
+    """
+    A compiled pattern guarded by the literals it cannot match without.
+    Each entry in required is a list of lower-case literals of which at least one
+    must appear in the folded text; a cheap substring test then skips regex scans
+    that cannot succeed. The guard never rejects text the pattern would match.
+    """
+
+    def __init__(self, pattern, *required, flags=re.IGNORECASE):
+        self.regex = re.compile(pattern, flags)
+        self.required = tuple(tuple(any_of) for any_of in required)
+
+    def could_match(self, folded):
+        # Plain loops: this runs for every pattern on every card
+        for literals in self.required:
+            for literal in literals:
+                if literal in folded:
+                    break
+            else:
+                return False
+        return True
+
+    def search(self, text, folded):
+        return self.regex.search(text) if self.could_match(folded) else None
+
+    def findall(self, text, folded):
+        return self.regex.findall(text) if self.could_match(folded) else []
+
+    def finditer(self, text, folded):
+        return self.regex.finditer(text) if self.could_match(folded) else iter(())
+
+# --- Graded card detection ---------------------------------------------------
+
+# Any one primary indicator marks the card as graded
+GRADED_PRIMARY = PrefilteredPattern(
+    r'\bPSA\s+\d+\b'  # PSA 10, PSA 9, etc.
+    r'|\bPROFESSIONAL\s+SPORTS\s+AUTHENTICATOR\b'
+    r'|\bCERT\s*#?\s*\d{8,}\b'  # PSA cert numbers are typically 8+ digits
+    r'|\bCERTIFICATION\s*#?\s*\d{8,}\b',
+    ['psa', 'professional', 'cert']
+)
+
+# Secondary indicators are counted, so each branch is a named group. The branches
+# cannot overlap in the text, so one finditer sees every indicator present.
+GRADED_SECONDARY = PrefilteredPattern(
+    r'(?P<psa>\bPSA\b)'
+    r'|(?P<grade>\bGRADE\s*:?\s*\d+\b)'
+    r'|(?P<authentic>\bAUTHENTIC\b)'
+    r'|(?P<graded>\bGRADED\b)',
+    ['psa', 'grade', 'authentic']
+)
+
+# QR code indicators (PSA slabs carry a QR code)
+GRADED_QR = KeywordMatcher(['qr', 'scan', 'code'])
+
+# --- PSA label extraction ----------------------------------------------------
+
+MANUFACTURER_LITERALS = ['topps', 'panini', 'bowman', 'donruss', 'fleer', 'upper']
+COLOR_LITERALS = ['gold', 'silver', 'black', 'red', 'blue', 'green', 'orange', 'purple']
+
+PSA_GRADE_PATTERNS = [
+    PrefilteredPattern(r'PSA\s+(\d+(?:\.\d+)?)\s+GEM\s+MINT', ['psa'], ['gem'], ['mint']),  # PSA 10 GEM MINT
+    PrefilteredPattern(r'PSA\s+(\d+(?:\.\d+)?)', ['psa']),  # PSA 10, PSA 9.5
+    PrefilteredPattern(r'GRADE\s*:?\s*(\d+(?:\.\d+)?)', ['grade']),  # GRADE: 10
+    PrefilteredPattern(r'(\d+(?:\.\d+)?)\s+PSA(?:\s|$)', ['psa']),   # 10 PSA (reverse order)
+    PrefilteredPattern(r'MINT\s+(\d+)(?!\d)', ['mint']),  # MINT 10 (but not MINT 125 etc)
+    PrefilteredPattern(r'GEM\s+MINT\s+(\d+)(?!\d)', ['gem'], ['mint'])  # GEM MINT 10
+]
+
+PSA_CERT_PATTERNS = [
+    PrefilteredPattern(r'CERT\s*#?\s*(\d{8,})', ['cert']),  # CERT #12345678
+    PrefilteredPattern(r'CERTIFICATION\s*#?\s*(\d{8,})', ['certification']),
+    PrefilteredPattern(r'PSA\s*#\s*(\d{8,})', ['psa'], ['#']),  # PSA #12345678
+    PrefilteredPattern(r'#\s*(\d{8,})', ['#']),  # Simple # followed by long number
+    PrefilteredPattern(r'(\d{8,})')  # Any 8+ digit number (fallback)
+]
+
+PSA_YEAR_PATTERNS = [
+    PrefilteredPattern(r'\b(20[0-2]\d)\s+(?:TOPPS|PANINI|BOWMAN|DONRUSS|FLEER|UPPER)', MANUFACTURER_LITERALS),  # Year before manufacturer
+    PrefilteredPattern(r'(?:TOPPS|PANINI|BOWMAN|DONRUSS|FLEER|UPPER)\s+(20[0-2]\d)', MANUFACTURER_LITERALS),    # Year after manufacturer
+    PrefilteredPattern(r'©\s*(20[0-2]\d)', ['©']),  # Copyright year
+    PrefilteredPattern(r'\b(20[0-2]\d)\b')  # Any recent year (fallback)
+]
+
+PSA_SET_PATTERNS = [
+    # Full set names with manufacturer (more specific patterns)
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(TOPPS\s+CHROME)(?:\s+(?:ROOKIE|RC|AUTO|GOLD|REFRACTOR))*', ['topps'], ['chrome']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(BOWMAN\s+CHROME)(?:\s+(?:ROOKIE|RC|AUTO|PROSPECTS))*', ['bowman'], ['chrome']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(PANINI\s+PRIZM)(?:\s+(?:BASKETBALL|FOOTBALL|ROOKIE))*', ['panini'], ['prizm']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(TOPPS\s+SERIES)(?:\s+\d+)*', ['topps'], ['series']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(BOWMAN\s+STERLING)(?:\s+(?:ROOKIE|RC|AUTO))*', ['bowman'], ['sterling']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(TOPPS\s+FINEST)(?:\s+(?:ROOKIE|RC|AUTO))*', ['topps'], ['finest']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(TOPPS\s+HERITAGE)(?:\s+(?:ROOKIE|RC))*', ['topps'], ['heritage']),
+    # Standalone premium set names
+    PrefilteredPattern(r'\b(CHROME)(?:\s+(?:ROOKIE|RC|AUTO|CARD))*\b', ['chrome']),
+    PrefilteredPattern(r'\b(PRIZM)(?:\s+(?:BASKETBALL|FOOTBALL|ROOKIE))*\b', ['prizm']),
+    PrefilteredPattern(r'\b(SELECT|MOSAIC|OPTIC|STERLING|FINEST|HERITAGE)(?:\s+(?:ROOKIE|RC))*\b',
+                       ['select', 'mosaic', 'optic', 'sterling', 'finest', 'heritage']),
+    # Manufacturer only (fallback)
+    PrefilteredPattern(r'\b(TOPPS|PANINI|BOWMAN|DONRUSS|FLEER|UPPER\s+DECK)\b', MANUFACTURER_LITERALS)
+]
+
+PSA_CARD_NUMBER_PATTERNS = [
+    PrefilteredPattern(r'#\s*([A-Z]*\d{1,4}[A-Z]?)(?:\s|$)', ['#']),  # #150, #RC150, #150A (with word boundary)
+    PrefilteredPattern(r'NO\.\s*([A-Z]*\d{1,4}[A-Z]?)(?:\s|$)', ['no.']),  # NO. 150, NO. RC150
+    PrefilteredPattern(r'CARD\s*#?\s*([A-Z]*\d{1,4}[A-Z]?)(?:\s|$)', ['card']),  # CARD #150
+    PrefilteredPattern(r'\b([A-Z]{1,3}-?\d{1,4})(?:\s|$)')  # RC-1, BDP-15, etc.
+]
+
+PSA_PARALLEL_PATTERNS = [
+    PrefilteredPattern(r'\b(\d+/\d+)\b', ['/']),  # Numbered parallels like 24/99, 1/1
+    PrefilteredPattern(r'\b(SUPERFRACTOR|GOLD\s+REFRACTOR|SILVER\s+REFRACTOR|BLACK\s+REFRACTOR|REFRACTOR)\b', ['fractor']),
+    PrefilteredPattern(r'\b(AUTO|AUTOGRAPH|SIGNATURE)\b', ['auto', 'signature']),
+    PrefilteredPattern(r'\b(PATCH|JERSEY|RELIC|MEMORABILIA)\b', ['patch', 'jersey', 'relic', 'memorabilia']),
+    PrefilteredPattern(r'\b(RC|ROOKIE|1ST\s+BOWMAN|ROOKIE\s+PATCH\s+AUTO|RPA)\b', ['rc', 'rookie', '1st', 'rpa']),
+    PrefilteredPattern(r'\b(GOLD|SILVER|BLACK|RED|BLUE|GREEN|ORANGE|PURPLE)\s+(?:REFRACTOR|PARALLEL|PRIZM)\b',
+                       COLOR_LITERALS, ['refractor', 'parallel', 'prizm']),
+    PrefilteredPattern(r'\b(CHROME|PRIZM)(?!\s+(?:CARD|ROOKIE\s+CARD))\b', ['chrome', 'prizm'])  # Avoid "Chrome Card" or "Chrome Rookie Card"
+]
+
+PSA_PARALLEL_PRIORITY = ['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'GOLD', 'SILVER', 'BLACK', 'RED', 'BLUE', 'GREEN', 'ORANGE', 'PURPLE', 'REFRACTOR', 'CHROME', 'PRIZM']
+
+PSA_FEATURE_MATCHER = KeywordMatcher(['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'RELIC', 'MEMORABILIA', '1ST BOWMAN', 'FIRST BOWMAN'])
+
+# --- Raw card extraction -----------------------------------------------------
+
+RECENT_YEAR = re.compile(r'\b(20[0-2]\d)\b')
+VINTAGE_YEAR = re.compile(r'\b(19[8-9]\d)\b')
+
+CARD_NUMBER_PATTERNS = [
+    PrefilteredPattern(r'(?:No\.|#|Card\s*#)\s*([A-Z0-9-]+)', ['no.', '#']),  # Explicit card number indicators
+    PrefilteredPattern(r'\b([A-Z]{1,3}-?\d{1,4}[A-Z]?)\b'),     # Like RC-1, BDP-15, etc.
+    PrefilteredPattern(r'CODE#([A-Z0-9]+)', ['code#']),                     # CODE# format
+]
+
+MEASUREMENT_VALUE = re.compile(r'^\d+["\']$')  # Height like 6'2"
+SIMPLE_NUMBER = re.compile(r'\b(\d{1,4})\b')
+MEASUREMENT_KEYWORDS = KeywordMatcher(['HEIGHT', 'WEIGHT', 'LBS', 'KG', 'FT', 'IN'])
+
+PARALLEL_PATTERNS = [
+    PrefilteredPattern(r'\b(\d+/\d+)\b', ['/']),  # Numbered parallels like 24/99, 1/1
+    PrefilteredPattern(r'\b(SUPERFRACTOR|GOLD\s+REFRACTOR|SILVER\s+REFRACTOR|BLACK\s+REFRACTOR|REFRACTOR)\b', ['fractor']),
+    PrefilteredPattern(r'\b(AUTO|AUTOGRAPH|SIGNATURE)\b', ['auto', 'signature']),
+    PrefilteredPattern(r'\b(PATCH|JERSEY|RELIC|MEMORABILIA)\b', ['patch', 'jersey', 'relic', 'memorabilia']),
+    PrefilteredPattern(r'\b(RC|ROOKIE|RPA|ROOKIE\s+PATCH\s+AUTO)\b', ['rc', 'rookie', 'rpa']),
+    PrefilteredPattern(r'\b(GOLD|SILVER|BLACK|RED|BLUE|GREEN|ORANGE|PURPLE)\s+(?:REFRACTOR|PARALLEL|PRIZM)\b',
+                       COLOR_LITERALS, ['refractor', 'parallel', 'prizm']),
+    PrefilteredPattern(r'\b(PRIZM|OPTIC|SELECT|MOSAIC)(?!\s+(?:CARD|ROOKIE\s+CARD))\b', ['prizm', 'optic', 'select', 'mosaic'])
+]
+
+PARALLEL_PRIORITY = ['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'GOLD', 'SILVER', 'BLACK', 'RED', 'BLUE', 'GREEN', 'ORANGE', 'PURPLE', 'REFRACTOR', 'CHROME', 'PRIZM', 'OPTIC', 'SELECT', 'MOSAIC']
+
+NUMBERED_PARALLEL = re.compile(r'\d+/\d+')
+
+SET_PATTERNS = [
+    # Full set names with manufacturer (more specific patterns)
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(TOPPS\s+CHROME)(?:\s+(?:ROOKIE|RC|AUTO|GOLD|REFRACTOR|CARD))*', ['topps'], ['chrome']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(BOWMAN\s+CHROME)(?:\s+(?:ROOKIE|RC|AUTO|PROSPECTS|CARD))*', ['bowman'], ['chrome']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(PANINI\s+PRIZM)(?:\s+(?:BASKETBALL|FOOTBALL|ROOKIE|CARD))*', ['panini'], ['prizm']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(TOPPS\s+SERIES)(?:\s+\d+)*', ['topps'], ['series']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(BOWMAN\s+STERLING)(?:\s+(?:ROOKIE|RC|AUTO|CARD))*', ['bowman'], ['sterling']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(TOPPS\s+FINEST)(?:\s+(?:ROOKIE|RC|AUTO|CARD))*', ['topps'], ['finest']),
+    PrefilteredPattern(r'(?:20\d{2}\s+)?(TOPPS\s+HERITAGE)(?:\s+(?:ROOKIE|RC|CARD))*', ['topps'], ['heritage']),
+    # Standalone premium set names (without player names)
+    PrefilteredPattern(r'\b(CHROME)(?:\s+(?:ROOKIE|RC|AUTO|CARD))*\b', ['chrome']),
+    PrefilteredPattern(r'\b(PRIZM)(?:\s+(?:BASKETBALL|FOOTBALL|ROOKIE|CARD))*\b', ['prizm']),
+    PrefilteredPattern(r'\b(SELECT|MOSAIC|OPTIC|STERLING|FINEST|HERITAGE)(?:\s+(?:ROOKIE|RC|CARD))*\b',
+                       ['select', 'mosaic', 'optic', 'sterling', 'finest', 'heritage']),
+    # Simple manufacturer
+    PrefilteredPattern(r'\b(TOPPS|PANINI|BOWMAN|DONRUSS|FLEER)(?!\s+(?:[A-Z]+\s+){2,})\b',
+                       ['topps', 'panini', 'bowman', 'donruss', 'fleer'])
+]
+
+# Line-based set fallback: manufacturer -> keywords that identify it on a line
+MANUFACTURER_KEYWORDS = {
+    'TOPPS': ['TOPPS', 'BOWMAN', 'CHROME'],
+    'PANINI': ['PANINI', 'PRIZM', 'SELECT', 'MOSAIC', 'OPTIC', 'DONRUSS'],
+    'UPPER DECK': ['UPPER DECK', 'UD'],
+    'FLEER': ['FLEER'],
+    'SCORE': ['SCORE'],
+    'WILD CARD': ['WILD CARD'],
+    'LEAF': ['LEAF'],
+    'SAGE': ['SAGE'],
+    'PRESS PASS': ['PRESS PASS']
+}
+MANUFACTURER_MATCHER = KeywordMatcher(
+    [keyword for keywords in MANUFACTURER_KEYWORDS.values() for keyword in keywords]
+)
+
+# Clean-up applied to a candidate set line, in order
+LINE_LEADING_SYMBOL = re.compile(r'^[@#&*]')
+LINE_CARDS_SUFFIX = re.compile(r'Cards?$', re.IGNORECASE)
+LINE_YEAR = re.compile(r'\d{4}')  # Remove years
+LINE_CARD_NUMBER = re.compile(r'#\d+')  # Remove card numbers
+LINE_CARD_TERMS = re.compile(r'\b(RC|ROOKIE|AUTO|AUTOGRAPH|CARD)\b', re.IGNORECASE)
+WHITESPACE_RUN = re.compile(r'\s+')
+
+COPYRIGHT_PATTERNS = [
+    PrefilteredPattern(r'Copyright\s+\d{4}\s+([^,\.]+)', ['copyright']),  # "Copyright 2024 Wild Card, Inc."
+    PrefilteredPattern(r'©\s*\d{4}\s+([^,\.]+)', ['©']),          # "© 2024 Wild Card"
+]
+COMPANY_SUFFIX = re.compile(r'\s+(Inc\.?|LLC\.?|Corp\.?)', re.IGNORECASE)
+
+FEATURE_MATCHER = KeywordMatcher(['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'RELIC', 'MEMORABILIA', 'SERIAL', 'NUMBERED'])
+
+# Brand keywords in an extracted set name -> manufacturer, checked in order
+SET_BRAND_MANUFACTURERS = [
+    (KeywordMatcher(['TOPPS', 'BOWMAN']), "TOPPS"),
+    (KeywordMatcher(['PANINI', 'PRIZM', 'SELECT', 'MOSAIC', 'OPTIC']), "PANINI"),
+    (KeywordMatcher(['DONRUSS']), "DONRUSS"),
+    (KeywordMatcher(['FLEER', 'UPPER']), "UPPER DECK"),
+]
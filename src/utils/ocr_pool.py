@@ -0,0 +1,37 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core import exceptions as google_exceptions
+
+# OCR is bound by network wait, not CPU, so a small thread pool keeps several
+# Vision requests in flight. The pool size caps concurrent requests.
+OCR_MAX_WORKERS = int(os.getenv('OCR_MAX_WORKERS', '8'))
+OCR_TIMEOUT_SECONDS = float(os.getenv('OCR_TIMEOUT_SECONDS', '30'))
+OCR_MAX_RETRIES = int(os.getenv('OCR_MAX_RETRIES', '4'))
+# How long dual-side processing waits for the back image before using the front alone
+OCR_BACK_SIDE_TIMEOUT_SECONDS = float(os.getenv('OCR_BACK_SIDE_TIMEOUT_SECONDS', '10'))
+# How long a call may wait for a free worker on the shared pool before it is cancelled
+OCR_QUEUE_TIMEOUT_SECONDS = float(os.getenv('OCR_QUEUE_TIMEOUT_SECONDS', '30'))
+
+# Quota and overload responses from Vision that are worth retrying
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+)
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+def get_ocr_executor():
+    """
+    Process-wide OCR thread pool for callers that submit work and wait with their
+    own timeouts. Unlike a per-call `with ThreadPoolExecutor()`, abandoning a slow
+    future here never blocks the caller; the call finishes in the background.
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                _shared_executor = ThreadPoolExecutor(max_workers=OCR_MAX_WORKERS, thread_name_prefix="ocr")
+    return _shared_executor
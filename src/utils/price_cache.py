@@ -0,0 +1,204 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from diskcache import Cache
+
+# eBay sold-price results, shared by every pricing path. A bounded in-memory
+# LRU answers hot queries without I/O; the diskcache tier (SQLite) survives
+# restarts and is shared by all uvicorn workers on the host. Entries expire
+# after PRICE_CACHE_TTL_SECONDS in both tiers.
+#   PRICE_CACHE_BACKEND: tiered (memory + disk), memory, disk, or none
+PRICE_CACHE_BACKEND = os.getenv('PRICE_CACHE_BACKEND', 'tiered').lower()
+PRICE_CACHE_DIR = os.getenv('PRICE_CACHE_DIR', os.path.join('.cache', 'prices'))
+PRICE_CACHE_SIZE_LIMIT = int(os.getenv('PRICE_CACHE_SIZE_LIMIT', str(64 * 1024 * 1024)))  # 64 MB
+PRICE_CACHE_MEMORY_ENTRIES = int(os.getenv('PRICE_CACHE_MEMORY_ENTRIES', '2048'))
+PRICE_CACHE_TTL_SECONDS = float(os.getenv('PRICE_CACHE_TTL_SECONDS', str(60 * 60 * 24)))  # 24 hours
+# "No sold listings" (and pages eBay refused outright) expire sooner, so an
+# obscure card is not re-scraped on every request but is re-checked the same day
+PRICE_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv('PRICE_CACHE_NEGATIVE_TTL_SECONDS', str(60 * 60)))  # 1 hour
+
+class CacheStats:
+    """Thread-safe hit/miss counters, reported per tier"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "errors": 0}
+
+    def record(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+        counts["hits"] = counts["memory_hits"] + counts["disk_hits"]
+        counts["lookups"] = lookups
+        counts["hit_rate"] = round(counts["hits"] / lookups, 3) if lookups else 0.0
+        return counts
+
+class MemoryLRUCache:
+    """Bounded in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries=PRICE_CACHE_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (found, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remaining_ttl(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return max(0.0, entry[0] - time.time()) if entry else 0.0
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class DiskCache:
+    """diskcache tier: SQLite-backed, size-bounded with LRU eviction, shared across processes"""
+
+    def __init__(self, directory=PRICE_CACHE_DIR, size_limit=PRICE_CACHE_SIZE_LIMIT):
+        self._cache = Cache(directory, size_limit=size_limit, eviction_policy='least-recently-used')
+
+    def get(self, key):
+        """Return (found, value, remaining_ttl)"""
+        value, expire_time = self._cache.get(key, default=None, expire_time=True)
+        if value is None:
+            return False, None, 0.0
+        remaining = expire_time - time.time() if expire_time else PRICE_CACHE_TTL_SECONDS
+        return True, value, remaining
+
+    def set(self, key, value, ttl):
+        self._cache.set(key, value, expire=ttl)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+    def clear(self):
+        self._cache.clear()
+
+class PriceCache:
+    """
+    Read-through lookup over an optional memory tier and an optional disk tier.
+    Disk hits are promoted to memory for the rest of their TTL. Errors from
+    the disk tier are logged and treated as misses, so pricing never fails
+    because of the cache.
+    """
+
+    def __init__(self, memory=None, disk=None, ttl=PRICE_CACHE_TTL_SECONDS):
+        self.memory = memory
+        self.disk = disk
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    def get(self, key):
+        """Return (found, value); a cached empty result still counts as found"""
+        if self.memory is not None:
+            found, value = self.memory.get(key)
+            if found:
+                self.stats.record("memory_hits")
+                return True, value
+
+        if self.disk is not None:
+            try:
+                found, value, remaining = self.disk.get(key)
+            except Exception as e:
+                print(f"⚠️  Price cache read failed: {e}")
+                self.stats.record("errors")
+                found = False
+            if found:
+                self.stats.record("disk_hits")
+                if self.memory is not None and remaining > 0:
+                    self.memory.set(key, value, remaining)
+                return True, value
+
+        self.stats.record("misses")
+        return False, None
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        self.stats.record("sets")
+        if self.memory is not None:
+            self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, ttl)
+            except Exception as e:
+                print(f"⚠️  Price cache write failed: {e}")
+                self.stats.record("errors")
+
+    def delete(self, key):
+        if self.memory is not None:
+            self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        if self.memory is not None:
+            self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def get_stats(self):
+        stats = self.stats.snapshot()
+        stats["memory_entries"] = len(self.memory) if self.memory is not None else 0
+        return stats
+
+def build_price_cache(backend=PRICE_CACHE_BACKEND):
+    if backend == 'none':
+        return PriceCache()
+    if backend == 'memory':
+        return PriceCache(memory=MemoryLRUCache())
+    if backend == 'disk':
+        return PriceCache(disk=DiskCache())
+    if backend != 'tiered':
+        print(f"⚠️  Unknown PRICE_CACHE_BACKEND '{backend}', using tiered")
+    return PriceCache(memory=MemoryLRUCache(), disk=DiskCache())
+
+_price_cache = None
+_price_cache_lock = threading.Lock()
+
+def get_price_cache():
+    global _price_cache
+    if _price_cache is None:
+        with _price_cache_lock:
+            if _price_cache is None:
+                _price_cache = build_price_cache()
+    return _price_cache
+
+def set_price_cache(cache):
+    """Swap in another PriceCache (e.g. a different backend, or a test double)."""
+    global _price_cache
+    with _price_cache_lock:
+        _price_cache = cache
+
+def get_price_cache_stats():
+    return get_price_cache().get_stats()
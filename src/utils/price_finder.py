@@ -1,15 +1,51 @@
-import time
+import os
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from urllib.parse import quote_plus
-from tqdm import tqdm
-import re
 
-# In-memory cache (temporary solution for deployment)
-# Using a simple dictionary for in-memory caching.
-# This is not persistent and will be cleared on app restart.
-# TODO: Replace with a proper Redis cache for production.
-cache = {}
+from src.utils.price_cache import get_price_cache, get_price_cache_stats, PRICE_CACHE_NEGATIVE_TTL_SECONDS
+from src.utils.rate_limiter import get_ebay_rate_limiter, get_ebay_error_backoff, parse_retry_after, EBAY_BURST
+from src.utils.concurrency import map_ordered
+from src.utils.single_flight import SingleFlight
+from src.utils.ebay_listing_parser import parse_sold_listings
+
+# eBay answers these when we are going too fast
+THROTTLE_STATUS_CODES = (429, 503)
+# Failures worth retrying later (back off per query) rather than caching as "no result"
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+# Batch pricing fetches several queries at once over pooled keep-alive
+# connections. The rate limiter still paces requests; concurrency defaults to
+# the limiter's burst so in-flight requests never exceed what it can release.
+EBAY_FETCH_CONCURRENCY = int(os.getenv('EBAY_FETCH_CONCURRENCY', str(max(1, int(EBAY_BURST)))))
+EBAY_CONNECT_TIMEOUT_SECONDS = float(os.getenv('EBAY_CONNECT_TIMEOUT_SECONDS', '5'))
+EBAY_READ_TIMEOUT_SECONDS = float(os.getenv('EBAY_READ_TIMEOUT_SECONDS', '15'))
+
+EBAY_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+# One outbound fetch per distinct query at a time: concurrent requests for the
+# same card wait for the fetch already running instead of racing past the cache
+_inflight_fetches = SingleFlight()
+
+def _get_ebay_session():
+    """Process-wide requests.Session, so queries reuse TLS connections to eBay."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(EBAY_FETCH_CONCURRENCY, 4))
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(EBAY_HEADERS)
+                _session = session
+    return _session
 
 def _build_search_query(card):
     """Build eBay search query from card data, prioritizing player names and handling graded cards."""
@@ -68,54 +104,86 @@ def _build_search_query(card):
 
 def _scrape_ebay_sold_listings(search_query, max_results=5):
     """Scrape eBay sold listings for a given search query."""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
     # eBay sold listings URL
     encoded_query = quote_plus(search_query)
     url = f"https://www.ebay.com/sch/i.html?_from=R40&_nkw={encoded_query}&_sacat=0&LH_Sold=1&LH_Complete=1&_sop=13"
     
-    # Caching layer first
+    # Caching layer first (memory LRU, then the shared on-disk tier; entries expire after 24 hours)
+    price_cache = get_price_cache()
     cached_key = f"sold_prices::{search_query}::{max_results}"
-    if cached_key in cache:
-        # Check for expiration (TTL of 24 hours)
-        timestamp, cached_data = cache[cached_key]
-        if time.time() - timestamp < (60 * 60 * 24):
-            return cached_data
+    found, cached_data = price_cache.get(cached_key)
+    if found:
+        return cached_data
+
+    return _inflight_fetches.do(cached_key, _fetch_sold_listings, url, search_query, cached_key, max_results)
+
+def _fetch_sold_listings(url, search_query, cached_key, max_results):
+    """Cache-miss path of _scrape_ebay_sold_listings; runs once per key at a time."""
+    price_cache = get_price_cache()
+    # A fetch for this key may have finished between our cache miss and taking the lead
+    found, cached_data = price_cache.get(cached_key)
+    if found:
+        return cached_data
+
+    backoff = get_ebay_error_backoff()
+    retry_in = backoff.retry_in(cached_key)
+    if retry_in > 0:
+        print(f"⏳ Skipping eBay for '{search_query}': backing off {retry_in:.0f}s after errors")
+        return []
 
+    status_code = None
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        # Only real outbound requests spend rate-limit tokens; cache hits returned above
+        limiter = get_ebay_rate_limiter()
+        limiter.acquire()
+        response = _get_ebay_session().get(
+            url, timeout=(EBAY_CONNECT_TIMEOUT_SECONDS, EBAY_READ_TIMEOUT_SECONDS)
+        )
+        status_code = response.status_code
+        if status_code in THROTTLE_STATUS_CODES:
+            limiter.penalize(parse_retry_after(response.headers.get('Retry-After')))
         response.raise_for_status()
+        limiter.reward()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find sold listing items
-        items = soup.find_all('div', class_='s-item__wrapper clearfix')
-        
-        prices = []
-        for item in items[:max_results]:
-            # Extract price
-            price_elem = item.find('span', class_='s-item__price')
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                # Extract numeric price
-                price_match = re.search(r'\$?([\d,]+\.?\d*)', price_text)
-                if price_match:
-                    try:
-                        price = float(price_match.group(1).replace(',', ''))
-                        prices.append(price)
-                    except ValueError:
-                        continue
-        
-        # Store to cache with a timestamp
-        cache[cached_key] = (time.time(), prices)
-        return prices
+        # Prices from the first max_results sold listings
+        listings = parse_sold_listings(response.content, max_results)
+        prices = [listing['price'] for listing in listings]
     
     except Exception as e:
-        print(f"Error scraping eBay for '{search_query}': {e}")
+        if _is_transient_error(e, status_code):
+            delay = backoff.record_failure(cached_key)
+            print(f"Error scraping eBay for '{search_query}': {e} (retrying this query in {delay:.0f}s)")
+        else:
+            # eBay refused the query or the page did not parse: retrying now would fail the same way
+            print(f"Error scraping eBay for '{search_query}': {e}")
+            price_cache.set(cached_key, [], ttl=PRICE_CACHE_NEGATIVE_TTL_SECONDS)
         return []
 
+    backoff.record_success(cached_key)
+    price_cache.set(cached_key, prices, ttl=None if prices else PRICE_CACHE_NEGATIVE_TTL_SECONDS)
+    return prices
+
+def _is_transient_error(error, status_code):
+    """Connection failures, timeouts, throttling and eBay server errors"""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    return status_code is not None and (status_code in THROTTLE_STATUS_CODES or status_code >= 500)
+
+def fetch_sold_prices(search_queries, max_results=5, max_workers=None):
+    """
+    Sold prices for many search queries, up to max_workers fetched at once.
+    A query repeated in the batch is fetched once.
+    Returns one entry per query in input order: the price list, or the
+    exception that query raised.
+    """
+    unique_queries = list(dict.fromkeys(search_queries))
+    results = map_ordered(
+        lambda search_query: _scrape_ebay_sold_listings(search_query, max_results),
+        unique_queries, max_workers or EBAY_FETCH_CONCURRENCY, desc="Researching prices"
+    )
+    results_by_query = dict(zip(unique_queries, results))
+    return [results_by_query[search_query] for search_query in search_queries]
+
 def _calculate_listing_price(sold_prices, markup_percent=18):
     """Calculate listing price from sold prices with markup."""
     if not sold_prices:
@@ -148,7 +216,8 @@ def research_all_prices(cards):
     - Scrapes the last 5 sold listings from the last 90 days.
     - Calculates the average price.
     - Adds an 18% markup to determine the listing price.
-    - Includes rate limiting to avoid being blocked.
+    - eBay requests share a token-bucket rate limiter (see rate_limiter.py)
+      to avoid being blocked; cached queries are answered without waiting.
     - Returns the list of cards with pricing information added.
     """
     print("Step 3: Researching prices on eBay...")
@@ -187,9 +256,13 @@ def research_all_prices(cards):
     
     priced_cards = []
     
-    for card in tqdm(valid_cards, desc="Researching prices"):
-        search_query = _build_search_query(card)
-        
+    # Fetch every searchable card's sold listings concurrently, then assemble in order
+    search_queries = [_build_search_query(card) for card in valid_cards]
+    searchable = list(dict.fromkeys(query for query in search_queries if query and query != "sold"))
+    print(f"{len(search_queries)} cards share {len(searchable)} distinct search queries")
+    sold_prices_by_query = dict(zip(searchable, fetch_sold_prices(searchable)))
+    
+    for card, search_query in zip(valid_cards, search_queries):
         if not search_query or search_query == "sold":
             # Skip cards with insufficient data
             card_with_price = card.copy()
@@ -202,7 +275,9 @@ def research_all_prices(cards):
             continue
         
         try:
-            sold_prices = _scrape_ebay_sold_listings(search_query)
+            sold_prices = sold_prices_by_query[search_query]
+            if isinstance(sold_prices, Exception):
+                raise sold_prices
             pricing_data = _calculate_listing_price(sold_prices)
             
             card_with_price = card.copy()
@@ -221,9 +296,6 @@ def research_all_prices(cards):
                 'pricing_error': str(e)
             })
             priced_cards.append(card_with_price)
-        
-        # Rate limiting to avoid being blocked
-        time.sleep(2)
     
     # Add skipped cards to the result without pricing data
     for card in skipped_cards:
@@ -236,6 +308,18 @@ def research_all_prices(cards):
         priced_cards.append(card_with_price)
     
     print("Price research complete.")
+    cache_stats = get_price_cache_stats()
+    print(f"Price cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+          f"(hit rate {cache_stats['hit_rate']:.0%})")
+    limiter_stats = get_ebay_rate_limiter().get_stats()
+    print(f"eBay rate limiter: {limiter_stats['current_rate']:.2f} requests/s, "
+          f"{limiter_stats['wait_seconds']:.1f}s spent waiting, {limiter_stats['throttled']} throttled responses")
+    flight_stats = _inflight_fetches.get_stats()
+    print(f"eBay fetches shared with an in-flight request: {flight_stats['shared']}")
+    backoff_stats = get_ebay_error_backoff().get_stats()
+    if backoff_stats['failures']:
+        print(f"eBay transport errors: {backoff_stats['failures']}, "
+              f"{backoff_stats['backing_off']} queries backing off, {backoff_stats['skipped']} lookups skipped")
     print(f"Processed {len(valid_cards)} cards for pricing")
     print(f"Skipped {len(skipped_cards)} cards due to incomplete data")
     return priced_cards
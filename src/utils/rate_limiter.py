@@ -0,0 +1,226 @@
+import os
+import time
+import threading
+from diskcache import Cache
+
+# Outbound eBay requests go through one token bucket: EBAY_REQUESTS_PER_SECOND
+# sustained, with bursts of up to EBAY_BURST back-to-back requests. On HTTP
+# 429/503 the rate is cut (multiplicative decrease, down to
+# EBAY_MIN_REQUESTS_PER_SECOND) and requests pause for Retry-After; each
+# successful response wins back part of the configured rate.
+#   EBAY_RATE_LIMIT_BACKEND: shared (diskcache/SQLite state, one budget for all
+#   worker processes on the host) or local (this process only)
+EBAY_REQUESTS_PER_SECOND = float(os.getenv('EBAY_REQUESTS_PER_SECOND', '0.5'))
+EBAY_BURST = float(os.getenv('EBAY_BURST', '3'))
+EBAY_MIN_REQUESTS_PER_SECOND = float(os.getenv('EBAY_MIN_REQUESTS_PER_SECOND', '0.05'))
+EBAY_RATE_BACKOFF_FACTOR = float(os.getenv('EBAY_RATE_BACKOFF_FACTOR', '0.5'))
+EBAY_RATE_RECOVERY_STEP = float(os.getenv('EBAY_RATE_RECOVERY_STEP', '0.1'))  # fraction of the full rate per success
+EBAY_RATE_LIMIT_BACKEND = os.getenv('EBAY_RATE_LIMIT_BACKEND', 'shared').lower()
+EBAY_RATE_LIMIT_DIR = os.getenv('EBAY_RATE_LIMIT_DIR', os.path.join('.cache', 'ratelimit'))
+
+# A query whose fetch failed in transit (connection error, timeout, 429/5xx)
+# is not retried for EBAY_ERROR_BACKOFF_SECONDS, doubling with each further
+# failure up to EBAY_ERROR_BACKOFF_MAX_SECONDS; a success clears it.
+EBAY_ERROR_BACKOFF_SECONDS = float(os.getenv('EBAY_ERROR_BACKOFF_SECONDS', '30'))
+EBAY_ERROR_BACKOFF_MAX_SECONDS = float(os.getenv('EBAY_ERROR_BACKOFF_MAX_SECONDS', '1800'))  # 30 minutes
+
+class LocalStateStore:
+    """Bucket state guarded by a lock: shared by the threads of one process"""
+
+    def __init__(self):
+        self._state = None
+        self._lock = threading.Lock()
+
+    def update(self, func):
+        """Run func(state) -> (new_state, result) atomically and return result"""
+        with self._lock:
+            self._state, result = func(self._state)
+            return result
+
+class DiskStateStore:
+    """Bucket state in a diskcache (SQLite) transaction: shared across processes"""
+
+    def __init__(self, directory=EBAY_RATE_LIMIT_DIR, key="ebay"):
+        self._cache = Cache(directory)
+        self._key = f"token_bucket::{key}"
+
+    def update(self, func):
+        with self._cache.transact():
+            state, result = func(self._cache.get(self._key))
+            self._cache.set(self._key, state)
+            return result
+
+class TokenBucket:
+    """
+    Token bucket with adaptive rate. acquire() blocks until a request may go
+    out; penalize() and reward() feed back what the server answered.
+    """
+
+    def __init__(self, rate=EBAY_REQUESTS_PER_SECOND, burst=EBAY_BURST, min_rate=EBAY_MIN_REQUESTS_PER_SECOND,
+                 store=None, backoff_factor=EBAY_RATE_BACKOFF_FACTOR, recovery_step=EBAY_RATE_RECOVERY_STEP):
+        self.max_rate = rate
+        self.burst = max(1.0, burst)
+        self.min_rate = min(min_rate, rate)
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.store = store or LocalStateStore()
+        self._stats_lock = threading.Lock()
+        self._stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "throttled": 0}
+
+    def _fresh_state(self, now):
+        return {"tokens": self.burst, "updated": now, "rate": self.max_rate, "paused_until": 0.0}
+
+    def _refill(self, state, now):
+        state = dict(state) if state else self._fresh_state(now)
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(self.burst, state["tokens"] + elapsed * state["rate"])
+        state["updated"] = now
+        return state
+
+    def _try_take(self, state):
+        """Take a token if one is available; returns (state, seconds to wait)"""
+        now = time.time()
+        state = self._refill(state, now)
+        if now < state["paused_until"]:
+            return state, state["paused_until"] - now
+        if state["tokens"] >= 1.0:
+            state["tokens"] -= 1.0
+            return state, 0.0
+        return state, (1.0 - state["tokens"]) / state["rate"]
+
+    def acquire(self):
+        """Block until a token is available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            wait = self.store.update(self._try_take)
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+        with self._stats_lock:
+            self._stats["acquired"] += 1
+            if waited:
+                self._stats["waited"] += 1
+                self._stats["wait_seconds"] += waited
+        return waited
+
+    def penalize(self, retry_after=None):
+        """The server pushed back (429/503): slow down and pause new requests."""
+        def slow_down(state):
+            now = time.time()
+            state = self._refill(state, now)
+            state["rate"] = max(self.min_rate, state["rate"] * self.backoff_factor)
+            state["tokens"] = 0.0
+            pause = retry_after if retry_after else 1.0 / state["rate"]
+            state["paused_until"] = max(state["paused_until"], now + pause)
+            return state, state["rate"]
+
+        rate = self.store.update(slow_down)
+        with self._stats_lock:
+            self._stats["throttled"] += 1
+        print(f"🐢 eBay throttled us; slowing to {rate:.2f} requests/s")
+
+    def reward(self):
+        """A request succeeded: recover part of the configured rate."""
+        def speed_up(state):
+            state = self._refill(state, time.time())
+            state["rate"] = min(self.max_rate, state["rate"] + self.max_rate * self.recovery_step)
+            return state, None
+
+        self.store.update(speed_up)
+
+    def current_rate(self):
+        return self.store.update(lambda state: (state, (state or {}).get("rate", self.max_rate)))
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 2)
+        stats["current_rate"] = round(self.current_rate(), 3)
+        stats["max_rate"] = self.max_rate
+        return stats
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds form only), or None"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+class ErrorBackoff:
+    """Per-key exponential backoff after failures, for this process"""
+
+    def __init__(self, base=EBAY_ERROR_BACKOFF_SECONDS, max_delay=EBAY_ERROR_BACKOFF_MAX_SECONDS):
+        self.base = base
+        self.max_delay = max(base, max_delay)
+        self._lock = threading.Lock()
+        self._failures = {}  # key -> (consecutive failures, retry_at)
+        self._stats = {"failures": 0, "skipped": 0}
+
+    def retry_in(self, key):
+        """Seconds until key may be tried again (0 if it may go now)"""
+        with self._lock:
+            entry = self._failures.get(key)
+            wait = entry[1] - time.time() if entry else 0.0
+            if wait > 0:
+                self._stats["skipped"] += 1
+                return wait
+            return 0.0
+
+    def record_failure(self, key):
+        """Count a failure for key; returns the delay before it is tried again"""
+        now = time.time()
+        with self._lock:
+            # Forget keys that have not failed again for a full max_delay
+            expired = [k for k, (_, retry_at) in self._failures.items() if retry_at + self.max_delay < now]
+            for k in expired:
+                del self._failures[k]
+            failures = self._failures.get(key, (0, 0.0))[0] + 1
+            delay = min(self.max_delay, self.base * 2 ** (failures - 1))
+            self._failures[key] = (failures, now + delay)
+            self._stats["failures"] += 1
+            return delay
+
+    def record_success(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def get_stats(self):
+        now = time.time()
+        with self._lock:
+            stats = dict(self._stats)
+            stats["backing_off"] = sum(1 for _, retry_at in self._failures.values() if retry_at > now)
+        return stats
+
+_ebay_limiter = None
+_ebay_limiter_lock = threading.Lock()
+
+def get_ebay_rate_limiter():
+    global _ebay_limiter
+    if _ebay_limiter is None:
+        with _ebay_limiter_lock:
+            if _ebay_limiter is None:
+                store = None
+                if EBAY_RATE_LIMIT_BACKEND == 'shared':
+                    try:
+                        store = DiskStateStore()
+                    except Exception as e:
+                        print(f"⚠️  Shared rate limiter unavailable ({e}); limiting this process only")
+                _ebay_limiter = TokenBucket(store=store)
+    return _ebay_limiter
+
+def set_ebay_rate_limiter(limiter):
+    """Swap in another limiter (e.g. different settings, or a test double)."""
+    global _ebay_limiter
+    with _ebay_limiter_lock:
+        _ebay_limiter = limiter
+
+_ebay_error_backoff = ErrorBackoff()
+
+def get_ebay_error_backoff():
+    return _ebay_error_backoff
+
+def set_ebay_error_backoff(backoff):
+    """Swap in another ErrorBackoff (e.g. different settings, or a test double)."""
+    global _ebay_error_backoff
+    _ebay_error_backoff = backoff
@@ -0,0 +1,112 @@
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Set, Tuple
+
+# Character-trigram index for short strings (player and set names). Each term
+# is split into padded trigrams ('  pau', ' pa', 'pau', ...) and every
+# trigram keeps an inverted list of the terms containing it. A lookup counts
+# shared trigrams through the inverted lists, rarest first, keeps the best
+# candidates, and ranks those by Dice similarity, so a query costs a bounded
+# number of posting reads however many terms are indexed.
+
+# Trigrams of a query read from the inverted lists (the rarest ones)
+MAX_QUERY_GRAMS = 24
+# Trigrams in more than this share of the terms ('  p', 'er ') say little
+# about which term is meant; they are skipped once MIN_QUERY_GRAMS rarer ones are read
+COMMON_GRAM_SHARE = 0.05
+MIN_QUERY_GRAMS = 4
+# Candidates scored exactly after counting
+MAX_CANDIDATES = 32
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of text ('' has none)"""
+    if not text:
+        return set()
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def dice(grams_a: Set[str], grams_b: Set[str]) -> float:
+    """Dice coefficient of two trigram sets, 0.0 to 1.0"""
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+def similarity(a: str, b: str) -> float:
+    """Dice coefficient of the trigram sets of a and b, 0.0 to 1.0"""
+    if a == b:
+        return 1.0
+    return dice(trigrams(a), trigrams(b))
+
+class TrigramIndex:
+    """Inverted trigram lists over a growing set of terms. Not thread-safe: callers lock."""
+
+    def __init__(self):
+        self._terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        self._term_grams: List[frozenset] = []
+        self._postings: Dict[str, array] = {}  # trigram -> term ids
+
+    def __len__(self):
+        return len(self._terms)
+
+    def __contains__(self, term):
+        return term in self._term_ids
+
+    def add(self, term: str) -> bool:
+        """Index term; False if it was already indexed or is empty"""
+        if not term or term in self._term_ids:
+            return False
+        term_id = len(self._terms)
+        self._terms.append(term)
+        self._term_ids[term] = term_id
+        grams = frozenset(trigrams(term))
+        self._term_grams.append(grams)
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array('I')
+            postings.append(term_id)
+        return True
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.0) -> List[Tuple[float, str]]:
+        """
+        Up to limit (score, term) pairs with Dice similarity >= min_score, best
+        first; more when several terms tie for the last place
+        """
+        if query in self._term_ids:
+            exact = [(1.0, query)]
+            if limit <= 1:
+                return exact
+        else:
+            exact = []
+        grams = trigrams(query)
+        if not grams:
+            return exact
+
+        # Shared-trigram counts from the rarest inverted lists
+        known = sorted((gram for gram in grams if gram in self._postings), key=lambda gram: len(self._postings[gram]))
+        common = max(1, int(len(self._terms) * COMMON_GRAM_SHARE))
+        selected = [gram for i, gram in enumerate(known[:MAX_QUERY_GRAMS])
+                    if i < MIN_QUERY_GRAMS or len(self._postings[gram]) <= common]
+        shared = Counter(chain.from_iterable(self._postings[gram] for gram in selected))
+        if not shared:
+            return exact
+
+        # The terms sharing the most trigrams read, scored exactly
+        results = []
+        for term_id, _ in shared.most_common(MAX_CANDIDATES):
+            term = self._terms[term_id]
+            if exact and term == query:
+                continue
+            term_grams = self._term_grams[term_id]
+            score = 2 * len(grams & term_grams) / (len(grams) + len(term_grams))
+            if score >= min_score:
+                results.append((score, term))
+        results.sort(key=lambda result: (-result[0], result[1]))
+        results = exact + results
+        # Terms tied with the last one kept are kept too, so no equally good term is hidden
+        end = limit
+        while 0 < end < len(results) and results[end][0] == results[limit - 1][0]:
+            end += 1
+        return results[:end]
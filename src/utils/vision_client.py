@@ -0,0 +1,95 @@
+import os
+import json
+import threading
+from google.cloud import vision
+from google.oauth2.credentials import Credentials
+from google.oauth2 import service_account
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+
+# Same scopes as used in drive_downloader.py
+SCOPES = [
+    'https://www.googleapis.com/auth/drive.readonly',
+    'https://www.googleapis.com/auth/cloud-platform'
+]
+
+# One Vision client per process. Building an ImageAnnotatorClient sets up a
+# gRPC channel, so every OCR entry point shares this instance instead of
+# creating its own per image.
+_client = None
+_credentials = None
+_client_lock = threading.Lock()
+
+def _load_credentials():
+    """
+    Load credentials with the same precedence as the rest of the app:
+    OAuth token.json first, then a service-account credentials.json.
+    Returns None to fall back to application default credentials.
+    """
+    # 1️⃣ Try OAuth token.json (interactive flow)
+    if os.path.exists('token.json'):
+        try:
+            with open('token.json', 'r') as f:
+                token_data = json.load(f)
+            return Credentials.from_authorized_user_info(token_data, SCOPES)
+        except Exception:
+            pass
+
+    # 2️⃣ Try service-account key
+    if os.path.exists('credentials.json'):
+        try:
+            with open('credentials.json', 'r') as f:
+                secret_data = json.load(f)
+            if secret_data.get('type') == 'service_account':
+                return service_account.Credentials.from_service_account_file(
+                    'credentials.json', scopes=SCOPES
+                )
+        except Exception:
+            pass
+
+    # 3️⃣ Fallback: default credentials (e.g., GOOGLE_APPLICATION_CREDENTIALS)
+    return None
+
+def _build_client(creds):
+    if creds:
+        return vision.ImageAnnotatorClient(credentials=creds)
+    return vision.ImageAnnotatorClient()
+
+def _needs_refresh(creds):
+    """True when explicit credentials exist but no longer hold a valid token."""
+    return creds is not None and creds.expired and getattr(creds, 'refresh_token', None) is not None
+
+def get_vision_client():
+    """
+    Return the shared Vision client, building it on first use.
+    Thread-safe; expired OAuth credentials are refreshed in place, and if the
+    refresh fails the credentials are reloaded from disk and the client rebuilt.
+    """
+    global _client, _credentials
+
+    client = _client
+    if client is not None and not _needs_refresh(_credentials):
+        return client
+
+    with _client_lock:
+        if _client is None:
+            _credentials = _load_credentials()
+            _client = _build_client(_credentials)
+        elif _needs_refresh(_credentials):
+            try:
+                _credentials.refresh(Request())
+            except RefreshError as e:
+                print(f"⚠️  Vision credential refresh failed, reloading: {e}")
+                _credentials = _load_credentials()
+                _client = _build_client(_credentials)
+        return _client
+
+def reset_vision_client():
+    """
+    Drop the shared client so the next call rebuilds it.
+    Use after token.json / credentials.json change on disk.
+    """
+    global _client, _credentials
+    with _client_lock:
+        _client = None
+        _credentials = None
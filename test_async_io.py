@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the card-processing threadpool used by async endpoints.
+Checks that blocking work leaves the event loop free and stays bounded.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+
+from src.utils import async_io
+from src.utils.async_io import run_blocking
+
+
+class TestRunBlocking:
+    """Test offloading blocking calls from the event loop"""
+
+    def setup_method(self):
+        # Limiters bind to the loop that created them; each test runs its own loop
+        async_io._limiter = None
+
+    def teardown_method(self):
+        async_io._limiter = None
+
+    def test_returns_result_and_passes_arguments(self):
+        def add(a, b, scale=1):
+            return (a + b) * scale
+
+        assert asyncio.run(run_blocking(add, 2, 3, scale=10)) == 50
+
+    def test_exceptions_propagate(self):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            asyncio.run(run_blocking(fail))
+
+    def test_event_loop_stays_responsive(self):
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            tick_task = asyncio.create_task(ticker())
+            await run_blocking(time.sleep, 0.3)
+            tick_task.cancel()
+            return ticks
+
+        # A blocking sleep on the loop would allow a single tick
+        assert asyncio.run(scenario()) >= 10
+
+    def test_concurrency_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(async_io, "CARD_PROCESSING_MAX_THREADS", 2)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+
+        async def scenario():
+            await asyncio.gather(*(run_blocking(work) for _ in range(6)))
+
+        asyncio.run(scenario())
+        assert state["peak"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batch card matching (CardDatabaseService.find_card_matches)
+and the batch pricing paths built on it.
+Uses temporary SQLite card databases; eBay research is faked.
+"""
+
+import asyncio
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from src.models import user, subscription  # noqa: F401  (Collection and Card relationships need them mapped)
+from src.utils import price_finder
+from src.services import card_catalog, card_database_service
+from src.services.card_database_service import (
+    CardDatabaseService, CardPriceWriteBack, HybridPricingService,
+)
+from src.services.card_service import CardService
+
+PLAYERS = 300
+
+
+def collection(size):
+    """card dicts as OCR reads them: mostly known cards, some year-off, some unknown"""
+    cards = []
+    for i in range(size):
+        player = f"Player {i % PLAYERS}"
+        if i % 10 == 9:
+            cards.append({"player": f"Unknown {i}", "year": "2023", "set": "Chrome"})
+        elif i % 10 == 8:
+            cards.append({"player": player.upper(), "year": str(2019 + i % PLAYERS % 6 + 1), "manufacturer": "Topps"})
+        else:
+            cards.append({"player": player, "year": str(2019 + i % PLAYERS % 6), "set": "Topps Chrome",
+                          "card_number": str(i % PLAYERS)})
+    return cards
+
+
+@pytest.fixture
+def engine(engine, make_card):
+    db = sessionmaker(bind=engine)()
+    db.add_all([make_card(f"Player {i}", year=2019 + i % 6, card_number=str(i)) for i in range(PLAYERS)])
+    db.add_all([make_card(f"Player {i}", year=2019 + i % 6, set_name="Series 1", card_number=str(i))
+                for i in range(PLAYERS)])
+    db.commit()
+    db.close()
+    return engine
+
+
+@pytest.fixture
+def queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+@pytest.fixture
+def writeback(engine, monkeypatch):
+    writeback = CardPriceWriteBack(sessionmaker(bind=engine))
+    monkeypatch.setattr(card_database_service, "_price_writeback", writeback)
+    yield writeback
+    writeback.stop()
+
+
+def match_ids(matches):
+    return [match.id if match else None for match in matches]
+
+
+class TestFindCardMatches:
+    """Test that batch matching agrees with find_card_match"""
+
+    def test_same_matches_as_one_at_a_time(self, db):
+        service = CardDatabaseService(db)
+        cards = collection(200)
+        assert match_ids(service.find_card_matches(cards)) == match_ids(service.find_card_match(c) for c in cards)
+
+    def test_without_catalog_a_collection_needs_a_handful_of_queries(self, db, queries, monkeypatch):
+        monkeypatch.setattr(card_catalog, "CARD_CATALOG_ENABLED", False)
+        service = CardDatabaseService(db)
+        cards = collection(1000)
+
+        matches = service.find_card_matches(cards)
+
+        assert len([q for q in queries if q.lstrip().upper().startswith("SELECT")]) <= 2
+        for card_data, match in zip(cards, matches):
+            if card_data["player"].startswith("Unknown"):
+                assert match is None
+            else:
+                assert match is not None
+                assert match.player_name.lower() == card_data["player"].lower()
+
+    def test_without_catalog_matches_follow_the_sql_lookups(self, db, monkeypatch):
+        monkeypatch.setattr(card_catalog, "CARD_CATALOG_ENABLED", False)
+        service = CardDatabaseService(db)
+        cards = collection(100)
+        batch = service.find_card_matches(cards)
+        for card_data, match in zip(cards, batch):
+            single = service.find_card_match(card_data)
+            assert (match is None) == (single is None)
+            if match is not None:
+                assert (match.player_name, match.year) == (single.player_name, single.year)
+
+    def test_cards_without_player_or_year(self, db, monkeypatch):
+        monkeypatch.setattr(card_catalog, "CARD_CATALOG_ENABLED", False)
+        assert CardDatabaseService(db).find_card_matches([{"player": "Player 1"}, {"year": "2020"}, {}]) == [None] * 3
+
+
+class TestBatchPricing:
+    """Test HybridPricingService.get_card_prices and CardService.price_cards"""
+
+    @pytest.fixture
+    def ebay(self, monkeypatch):
+        calls = []
+
+        def research(cards):
+            calls.append(cards[0]["player"])
+            return [dict(cards[0], pricing_data={"average_sold_price": 42.0, "sample_size": 5})]
+
+        monkeypatch.setattr(price_finder, "research_all_prices", research)
+        return calls
+
+    def test_local_hits_and_ebay_misses_in_order(self, engine, db, ebay, writeback, monkeypatch):
+        lookups = []
+        service = HybridPricingService(db, session_factory=sessionmaker(bind=engine))
+        original = service.card_db_service.find_card_matches
+        monkeypatch.setattr(service.card_db_service, "find_card_matches",
+                            lambda cards: lookups.append(len(cards)) or original(cards))
+        cards = collection(20)
+
+        results = asyncio.run(service.get_card_prices(cards, ebay_concurrency=2))
+
+        assert lookups == [20]
+        assert [r["source"] for r in results] == ["ebay_api" if c["player"].startswith("Unknown") else "local_database"
+                                                 for c in cards]
+        assert sorted(ebay) == ["Unknown 19", "Unknown 9"]
+        assert results[0]["estimated_value"] == 10.0 and results[9]["estimated_value"] == 42.0
+
+    def test_price_cards_prices_a_collection_with_one_lookup(self, engine, db, ebay, writeback, monkeypatch):
+        card_service = CardService(db)
+        lookups = []
+        original = card_service.hybrid_pricing_service.card_db_service.find_card_matches
+        monkeypatch.setattr(card_service.hybrid_pricing_service.card_db_service, "find_card_matches",
+                            lambda cards: lookups.append(len(cards)) or original(cards))
+        cards = collection(50) + collection(50)
+
+        prices = asyncio.run(card_service.price_cards(cards))
+
+        assert lookups == [50]
+        assert len(prices) == 100
+        assert prices[0]["source"] == "local_database" and prices[0]["listing_price"] == pytest.approx(11.5)
+        assert prices[59]["source"] == "ebay_api"
+        assert prices[1]["search_query"] == "Player 1 Topps Chrome"
+
+    def test_missing_fields_and_match_failures_only_affect_their_card(self, engine, db, ebay, writeback, monkeypatch):
+        # OCR leaves the fields it could not read as None
+        cards = [{"player": "Player 1", "year": "2020", "set": "Topps Chrome", "card_number": "1"},
+                 {"player": "Player 2", "year": "2021", "set": None, "manufacturer": None, "card_number": None},
+                 {"player": "Player 3", "year": "2022", "set": "Topps Chrome"}]
+        original = CardDatabaseService._catalog_match
+
+        def match(self, catalog, card_data, ocr=True):
+            if card_data["player"] == "Player 3":
+                raise ValueError("unreadable card")
+            return original(self, catalog, card_data, ocr)
+
+        monkeypatch.setattr(CardDatabaseService, "_catalog_match", match)
+        prices = asyncio.run(CardService(db).price_card_batch(cards))
+
+        assert [p["source"] for p in prices] == ["local_database", "local_database", "ebay_api"]
+        assert prices[1]["estimated_value"] == 10.0
+        assert ebay == ["Player 3"]
+
+    def test_batch_failure_falls_back_per_card(self, db, monkeypatch):
+        card_service = CardService(db)
+
+        async def broken(cards, ebay_concurrency=None):
+            raise RuntimeError("database is gone")
+
+        monkeypatch.setattr(card_service.hybrid_pricing_service, "get_card_prices", broken)
+        prices = asyncio.run(card_service.price_card_batch(collection(3)))
+        assert [p["source"] for p in prices] == ["fallback"] * 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
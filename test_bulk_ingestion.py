@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Unit tests for bulk card ingestion (CardService.process_card_batch).
+Downloads, OCR, pricing and the database write are faked; no network calls.
+"""
+
+import asyncio
+import time
+import threading
+import pytest
+from fastapi import HTTPException
+
+from src.utils import async_io
+from src.services import card_service as card_service_module
+from src.services.card_service import CardService
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = CardService(db=None)
+    calls = {"pricing": [], "saved": []}
+
+    async def fake_download(url):
+        await asyncio.sleep(0.01)
+        if "missing" in url:
+            return FakeResponse(404)
+        return FakeResponse(200, url.encode())
+
+    def fake_extract(content, filename):
+        time.sleep(0.05)  # stands in for a Vision round trip
+        player = "Paul Skenes" if b"skenes" in content else "Elly De La Cruz"
+        return {"player": player, "set": "Topps Chrome", "year": "2023"}
+
+    def fake_extract_dual(front_content, back_content, filename):
+        card_data = fake_extract(front_content, filename)
+        card_data.update({"dual_side": back_content is not None, "card_number": "124"})
+        return card_data
+
+    async def fake_price_batch(cards_data):
+        calls["pricing"].extend(card_data["player"] for card_data in cards_data)
+        return [{"estimated_value": 10.0, "source": "ebay_api"} for _ in cards_data]
+
+    def fake_save(collection_id, entries):
+        calls["saved"].append(entries)
+        return [{"card_id": f"card-{i}", "card_data": dict(card_data)} for i, (card_data, _, _) in enumerate(entries)]
+
+    monkeypatch.setattr(card_service_module, "download", fake_download)
+    monkeypatch.setattr(service, "extract_card_from_image", fake_extract)
+    monkeypatch.setattr(service, "extract_dual_side_card", fake_extract_dual)
+    monkeypatch.setattr(service, "price_card_batch", fake_price_batch)
+    monkeypatch.setattr(service, "save_processed_cards", fake_save)
+    return service, calls
+
+
+class TestProcessCardBatch:
+    """Test pipelining, pricing dedup, per-card errors and the single write"""
+
+    def test_identical_cards_share_one_pricing_query(self, service):
+        service, calls = service
+        items = [{"image_url": f"https://x/skenes-{i}.jpg"} for i in range(5)]
+        items.append({"image_url": "https://x/delacruz.jpg"})
+
+        result = asyncio.run(service.process_card_batch("c1", items))
+
+        assert result["processed"] == 6
+        assert result["distinct_pricing_queries"] == 2
+        assert sorted(calls["pricing"]) == ["Elly De La Cruz", "Paul Skenes"]
+        assert all(card["price_data"]["estimated_value"] == 10.0 for card in result["cards"])
+
+    def test_all_rows_are_saved_in_one_write(self, service):
+        service, calls = service
+        items = [{"image_url": "https://x/skenes.jpg"},
+                 {"front_image_url": "https://x/skenes-front.jpg", "back_image_url": "https://x/skenes-back.jpg"}]
+
+        result = asyncio.run(service.process_card_batch("c1", items))
+
+        assert len(calls["saved"]) == 1
+        saved_images = [images for _, _, images in calls["saved"][0]]
+        assert saved_images == [[("https://x/skenes.jpg", "front")],
+                                [("https://x/skenes-front.jpg", "front"), ("https://x/skenes-back.jpg", "back")]]
+        assert result["cards"][1]["image_urls"] == ["https://x/skenes-front.jpg", "https://x/skenes-back.jpg"]
+
+    def test_failed_card_does_not_sink_the_batch(self, service):
+        service, calls = service
+        items = [{"image_url": "https://x/skenes.jpg"}, {"image_url": "https://x/missing.jpg"}, {"filename": "x.jpg"}]
+
+        result = asyncio.run(service.process_card_batch("c1", items))
+
+        assert (result["processed"], result["failed"]) == (1, 2)
+        assert result["cards"][0]["index"] == 0
+        assert result["cards"][1] == {"index": 1, "error": "Could not download image: 404"}
+        assert "required" in result["cards"][2]["error"]
+
+    def test_ocr_runs_concurrently(self, service, monkeypatch):
+        service, _ = service
+        monkeypatch.setattr(async_io, "CARD_PROCESSING_MAX_THREADS", 8)
+        items = [{"image_url": f"https://x/skenes-{i}.jpg"} for i in range(8)]
+
+        start = time.perf_counter()
+        asyncio.run(service.process_card_batch("c1", items))
+
+        # Eight 50ms OCR calls back to back would take 400ms
+        assert time.perf_counter() - start < 0.3
+
+    def test_cards_in_flight_are_bounded(self, service, monkeypatch):
+        service, _ = service
+        monkeypatch.setattr(card_service_module, "BULK_CARDS_IN_FLIGHT", 3)
+        state = {"held": 0, "peak": 0}
+        lock = threading.Lock()
+        original_download = card_service_module.download
+
+        async def counting_download(url):
+            response = await original_download(url)
+            with lock:
+                state["held"] += 1
+                state["peak"] = max(state["peak"], state["held"])
+            return response
+
+        def slow_extract(content, filename):
+            time.sleep(0.02)
+            with lock:
+                state["held"] -= 1  # OCR is done with the image
+            return {"player": "Paul Skenes", "set": "Topps Chrome", "year": "2023"}
+
+        monkeypatch.setattr(card_service_module, "download", counting_download)
+        monkeypatch.setattr(service, "extract_card_from_image", slow_extract)
+        items = [{"image_url": f"https://x/skenes-{i}.jpg"} for i in range(20)]
+
+        result = asyncio.run(service.process_card_batch("c1", items))
+
+        # Downloads outpace OCR: without the bound every image would be held at once
+        assert result["processed"] == 20
+        assert state["peak"] <= 3
+
+    def test_batch_size_is_bounded(self, service, monkeypatch):
+        service, _ = service
+        monkeypatch.setattr(card_service_module, "BULK_MAX_CARDS", 2)
+
+        with pytest.raises(HTTPException) as too_many:
+            asyncio.run(service.process_card_batch("c1", [{"image_url": "https://x/a.jpg"}] * 3))
+        assert too_many.value.status_code == 400
+
+
+class TestPricingKey:
+    """Test which cards count as the same pricing query"""
+
+    def test_case_and_whitespace_do_not_matter(self):
+        assert CardService._pricing_key({"player": "Paul Skenes ", "set": "topps chrome"}) == \
+            CardService._pricing_key({"player": "paul skenes", "set": "Topps Chrome"})
+
+    def test_grade_and_parallel_do(self):
+        base = {"player": "Paul Skenes", "set": "Topps Chrome"}
+        assert CardService._pricing_key(base) != CardService._pricing_key(dict(base, parallel="Refractor"))
+        assert CardService._pricing_key(dict(base, graded=True, grade="10")) != \
+            CardService._pricing_key(dict(base, graded=True, grade="9"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
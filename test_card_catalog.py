@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-memory card catalog.
+Uses temporary SQLite databases; catalog answers are compared with the SQL lookups.
+"""
+
+import time
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.services import card_catalog
+from src.services.card_catalog import CardCatalog, get_card_catalog
+from src.services.card_database_service import CardDatabase, CardDatabaseService
+
+
+@pytest.fixture
+def db(db, make_card):
+    db.add_all([make_card(f"Player {i}", year=2019 + i % 6, card_number=str(i)) for i in range(200)])
+    db.add_all([
+        make_card("Ronald Acuña Jr.", card_number="1"),
+        make_card("Ronald Acuna Jr", year=2022, manufacturer="Bowman", set_name="Bowman Chrome", card_number="BCP-5"),
+        make_card("Paul Skenes", year=2024, set_name="Chrome", manufacturer="Bowman", card_number="BCP-1"),
+        make_card("Paul Skenes", year=2024, set_name="Series 1", manufacturer="Topps", card_number="100",
+                  avg_psa10_price=250.0, last_updated=datetime(2024, 5, 1, 12, 30, 15, 123456)),
+    ])
+    db.commit()
+    return db
+
+
+QUERIES = [
+    {"player": "RONALD ACUNA JR", "year": "2023", "set": "Topps Chrome", "card_number": "1"},
+    {"player": "Ronald Acuña Jr.", "year": "2023", "manufacturer": "Bowman"},
+    {"player": "ronald acuna jr", "year": "2021"},
+    {"player": "Paul Skenes", "year": "2024", "set": "Series 1", "manufacturer": "Topps", "card_number": "100"},
+    {"player": "Paul Skenes", "year": "2025", "manufacturer": "Bowman"},
+    {"player": "Paul Skenes", "year": "2024", "set": "Prizm", "manufacturer": "Panini"},
+    {"player": "Player 7", "year": "2020", "card_number": "7"},
+    {"player": "Nobody", "year": "2023"},
+]
+
+
+class TestCatalogMatches:
+    """Test that the catalog answers find_card_match like the SQL lookups"""
+
+    def sql_candidates(self, service, card_data):
+        """Ids of every row the SQL lookup could return (.first() has no ORDER BY)"""
+        player, year = card_data["player"], service._extract_year(card_data["year"])
+        set_name, manufacturer = card_data.get("set", ""), card_data.get("manufacturer", "")
+        exact = service._exact_query(player, year, set_name, manufacturer, card_data.get("card_number", "")).all()
+        return {card.id for card in exact or service._fuzzy_query(player, year, manufacturer).all()}
+
+    @pytest.mark.parametrize("card_data", QUERIES)
+    def test_same_match_as_sql(self, db, card_data):
+        service = CardDatabaseService(db)
+        candidates = self.sql_candidates(service, card_data)
+        match = service.find_card_match(card_data)
+        if candidates:
+            assert match.id in candidates
+        else:
+            assert match is None
+
+    def test_match_carries_prices_and_timestamp(self, db):
+        service = CardDatabaseService(db)
+        match = service.find_card_match({"player": "Paul Skenes", "year": "2024", "set": "Series 1", "card_number": "100"})
+        assert match.avg_psa10_price == 250.0
+        assert match.last_updated == datetime(2024, 5, 1, 12, 30, 15, 123456)
+        assert service.get_estimated_price({"player": "Paul Skenes", "year": "2024", "set": "Series 1"}, "psa 10") == 250.0
+
+    def test_disabled_uses_sql(self, db, monkeypatch):
+        monkeypatch.setattr(card_catalog, "CARD_CATALOG_ENABLED", False)
+        match = CardDatabaseService(db).find_card_match({"player": "Paul Skenes", "year": "2024", "card_number": "BCP-1"})
+        assert isinstance(match, CardDatabase)
+
+    def test_one_catalog_per_engine(self, db, engine):
+        assert get_card_catalog(db) is get_card_catalog(sessionmaker(bind=engine)())
+        other = create_engine("sqlite://")
+        assert get_card_catalog(sessionmaker(bind=other)()) is not get_card_catalog(db)
+
+
+class TestOcrMatching:
+    """Test trigram matching for OCR-noisy names"""
+
+    def test_noisy_names_match(self, db):
+        service = CardDatabaseService(db)
+        match = service.find_card_match({"player": "Pau1 Skenas", "year": "2024", "set": "Topps Serles l",
+                                         "manufacturer": "Topps"})
+        assert (match.player_name, match.set_name) == ("Paul Skenes", "Series 1")
+
+    def test_candidates_are_ranked(self, db):
+        service = CardDatabaseService(db)
+        candidates = service.find_card_candidates({"player": "Paul Skenés", "year": "2024", "set": "Bowman Chrorne"})
+        assert [card.set_name for _, card in candidates] == ["Chrome", "Series 1"]
+        assert candidates[0][0] > candidates[1][0]
+
+    def test_ambiguous_or_distant_reads_do_not_match(self, db):
+        service = CardDatabaseService(db)
+        # No 2023 'Player 1'; 'Player 10' and 'Player 16' are 2023 cards and equally close
+        assert service.find_card_match({"player": "Player 1", "year": "2023"}) is None
+        assert service.find_card_match({"player": "Jackson Holliday", "year": "2024"}) is None
+
+    def test_disabled_catalog_has_no_candidates(self, db, monkeypatch):
+        monkeypatch.setattr(card_catalog, "CARD_CATALOG_ENABLED", False)
+        assert CardDatabaseService(db).find_card_candidates({"player": "Paul Skenes", "year": "2024"}) == []
+
+
+class TestCatalogRefresh:
+    """Test that committed writes reach the catalog"""
+
+    def test_update_card_price_is_seen_on_next_lookup(self, db):
+        service = CardDatabaseService(db)
+        card_data = {"player": "Paul Skenes", "year": "2024", "card_number": "BCP-1"}
+        match = service.find_card_match(card_data)
+        assert match.avg_raw_price == 10.0
+
+        service.update_card_price(match.id, "raw", 42.0)
+        assert service.find_card_match(card_data).avg_raw_price == 42.0
+        assert get_card_catalog(db).get_stats()["loads"] == 1
+
+    def test_inserted_and_deleted_cards(self, db, make_card):
+        service = CardDatabaseService(db)
+        card_data = {"player": "Jackson Holliday", "year": "2024"}
+        assert service.find_card_match(card_data) is None
+
+        card = make_card("Jackson Holliday", year=2024)
+        db.add(card)
+        db.commit()
+        assert service.find_card_match(card_data).id == card.id
+
+        db.delete(card)
+        db.commit()
+        assert service.find_card_match(card_data) is None
+
+    def test_rolled_back_writes_are_not_tracked(self, db, make_card):
+        service = CardDatabaseService(db)
+        service.find_card_match({"player": "Paul Skenes", "year": "2024"})
+        db.add(make_card("Jackson Holliday", year=2024))
+        db.flush()
+        db.rollback()
+        assert not get_card_catalog(db)._pending_ids
+
+    def test_player_or_year_change_moves_the_card(self, db):
+        service = CardDatabaseService(db)
+        card = db.query(CardDatabase).filter(CardDatabase.card_number == "BCP-1").one()
+        service.find_card_match({"player": "Paul Skenes", "year": "2024"})
+        card.year = 2020
+        db.commit()
+        assert service.find_card_match({"player": "Paul Skenes", "year": "2020"}).id == card.id
+        assert service.find_card_match({"player": "Paul Skenes", "year": "2024"}).card_number == "100"
+
+    def test_writes_from_elsewhere_are_picked_up_by_last_updated(self, engine, db):
+        catalog = CardCatalog(engine, refresh_interval=0.05)
+        assert catalog.find_match("paul skenes", 2024, card_number="BCP-1").avg_raw_price == 10.0
+
+        # A write that bypasses this process's ORM session (another worker, a SQL script)
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE card_database SET avg_raw_price = 55.0, last_updated = :now "
+                              "WHERE card_number = 'BCP-1'"), {"now": datetime.utcnow()})
+        assert catalog.find_match("paul skenes", 2024, card_number="BCP-1").avg_raw_price == 10.0
+        time.sleep(0.06)
+        assert catalog.find_match("paul skenes", 2024, card_number="BCP-1").avg_raw_price == 55.0
+        stats = catalog.get_stats()
+        assert stats["loads"] == 1 and stats["refreshes"] == 1
+
+    def test_many_pending_rows_reload(self, engine, db, monkeypatch):
+        monkeypatch.setattr(card_catalog, "FULL_RELOAD_PENDING_ROWS", 5)
+        catalog = CardCatalog(engine)
+        catalog.find_match("paul skenes", 2024)
+        catalog.invalidate([str(i) for i in range(10)])
+        catalog.find_match("paul skenes", 2024)
+        assert catalog.get_stats()["loads"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Unit tests for normalized, indexed card_database lookups.
+Uses temporary SQLite databases; query plans are checked with EXPLAIN QUERY PLAN.
+"""
+
+import os
+import sys
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "scripts"))
+from migrate_card_database_norm import migrate
+
+from src.services.card_database_service import CardDatabase, CardDatabaseService, CardNameWord, normalize_key
+
+
+@pytest.fixture
+def db(db, make_card):
+    db.add_all([make_card(f"Player {i}", year=2019 + i % 6, card_number=str(i)) for i in range(300)])
+    db.add_all([
+        make_card("Ronald Acuña Jr.", card_number="1"),
+        make_card("Paul Skenes", year=2024, set_name="Chrome", manufacturer="Bowman", card_number="BCP-1"),
+    ])
+    db.commit()
+    return db
+
+
+class TestNormalizeKey:
+    """Test the match key for names"""
+
+    def test_keys(self):
+        assert normalize_key("Ronald Acuña Jr.") == "ronald acuna jr"
+        assert normalize_key("Bowman's Best") == "bowmans best"
+        assert normalize_key("  SHOHEI   Ohtani ") == "shohei ohtani"
+        assert normalize_key("Upper-Deck") == "upper deck"
+        assert normalize_key(None) == ""
+
+
+class TestMatchKeys:
+    """Test that keys are filled on insert/update and used by lookups"""
+
+    def test_keys_filled_on_insert_and_update(self, db):
+        card = db.query(CardDatabase).filter(CardDatabase.player_name == "Ronald Acuña Jr.").one()
+        assert (card.player_norm, card.set_norm, card.manufacturer_norm) == ("ronald acuna jr", "chrome", "topps")
+
+        card.set_name = "Topps Chrome Update"
+        db.commit()
+        assert card.set_norm == "topps chrome update"
+
+    def test_lookup_ignores_accents_case_and_brand_prefix(self, db):
+        service = CardDatabaseService(db)
+        match = service.find_card_match({"player": "RONALD ACUNA JR", "year": "2023", "set": "Topps Chrome", "card_number": "1"})
+        assert match is not None and match.player_name == "Ronald Acuña Jr."
+
+    def test_fuzzy_match_uses_year_range_and_manufacturer(self, db):
+        service = CardDatabaseService(db)
+        match = service.find_card_match({"player": "Paul Skenes", "year": "2023", "manufacturer": "Bowman"})
+        assert match is not None and match.card_number == "BCP-1"
+
+    def test_search_by_prefix(self, db):
+        service = CardDatabaseService(db)
+        assert [card.player_name for card in service.search_cards("paul sk")] == ["Paul Skenes"]
+        assert len(service.search_cards("Player 1", year=2020)) > 0
+
+    def test_search_by_any_name_word(self, db):
+        service = CardDatabaseService(db)
+        assert [card.player_name for card in service.search_cards("Skenes")] == ["Paul Skenes"]
+        assert [card.player_name for card in service.search_cards("acuña")] == ["Ronald Acuña Jr."]
+        assert [card.player_name for card in service.search_cards("sk paul")] == ["Paul Skenes"]
+        assert service.search_cards("kenes") == []
+
+    def test_name_words_follow_renames_and_deletes(self, db):
+        service = CardDatabaseService(db)
+        card = db.query(CardDatabase).filter(CardDatabase.player_name == "Paul Skenes").one()
+        card.player_name = "Paul Skenes Jr."
+        db.commit()
+        assert [card.player_name for card in service.search_cards("skenes jr")] == ["Paul Skenes Jr."]
+
+        card.avg_raw_price = 12.0
+        db.commit()
+        assert len(service.search_cards("skenes")) == 1
+
+        db.delete(card)
+        db.commit()
+        assert service.search_cards("skenes") == []
+        assert db.query(CardNameWord).filter(CardNameWord.card_id == card.id).count() == 0
+
+
+class TestQueryPlans:
+    """Test that lookups are index seeks, not table scans"""
+
+    @staticmethod
+    def plans(engine, action):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and "card_database" in statement:
+                statements.append((statement, parameters))
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            action()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert statements
+        with engine.connect() as conn:
+            return [
+                " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+                for statement, parameters in statements
+            ]
+
+    def test_exact_match_seeks_the_composite_index(self, db, engine):
+        service = CardDatabaseService(db)
+        [plan] = self.plans(engine, lambda: service._exact_match("Paul Skenes", 2024, "Chrome", "", "BCP-1"))
+        assert "USING INDEX idx_card_database_player_year_set_number" in plan
+        assert "SCAN card_database" not in plan
+
+    def test_fuzzy_match_seeks_player_and_year(self, db, engine):
+        service = CardDatabaseService(db)
+        [plan] = self.plans(engine, lambda: service._fuzzy_match("Paul Skenes", 2023, "", "Bowman"))
+        assert "USING INDEX idx_card_database_player_year" in plan
+        assert "SCAN card_database" not in plan
+
+    def test_search_is_an_index_range(self, db, engine):
+        service = CardDatabaseService(db)
+        [plan] = self.plans(engine, lambda: service.search_cards("paul sk"))
+        assert "SEARCH card_database_name_words USING COVERING INDEX" in plan
+        assert "SCAN card_database" not in plan
+
+
+class TestMigration:
+    """Test the migration on a table created before the match keys existed"""
+
+    def test_adds_fills_and_indexes(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE card_database (id VARCHAR PRIMARY KEY, sport VARCHAR NOT NULL, year INTEGER NOT NULL, "
+                "manufacturer VARCHAR NOT NULL, set_name VARCHAR NOT NULL, player_name VARCHAR NOT NULL, "
+                "card_number VARCHAR NOT NULL, parallel VARCHAR, rookie VARCHAR, avg_raw_price FLOAT, "
+                "avg_psa9_price FLOAT, avg_psa10_price FLOAT, last_updated DATETIME, sample_size INTEGER, "
+                "search_terms JSON, card_traits JSON)"
+            ))
+            conn.execute(
+                text("INSERT INTO card_database (id, sport, year, manufacturer, set_name, player_name, card_number) "
+                     "VALUES (:id, 'MLB', 2023, 'Topps', 'Chrome', :player, '1')"),
+                [{"id": f"card-{i:03d}", "player": f"Julio Rodríguez {i}"} for i in range(25)],
+            )
+
+        assert migrate(engine, batch_size=10)
+        assert migrate(engine, batch_size=10)  # re-run is a no-op
+
+        with engine.connect() as conn:
+            keys = conn.execute(text("SELECT player_norm, set_norm, manufacturer_norm FROM card_database ORDER BY id")).fetchall()
+        assert keys[0] == ("julio rodriguez 0", "chrome", "topps")
+        assert all(player_norm for player_norm, _, _ in keys)
+        assert {"idx_card_database_player_year", "idx_card_database_player_year_set_number"} <= {
+            index["name"] for index in inspect(engine).get_indexes("card_database")
+        }
+        with engine.connect() as conn:
+            words = conn.execute(text("SELECT word FROM card_database_name_words WHERE card_id = 'card-000' "
+                                      "ORDER BY word")).scalars().all()
+            assert words == ["0", "julio", "rodriguez"]
+            assert conn.execute(text("SELECT COUNT(DISTINCT card_id) FROM card_database_name_words")).scalar() == 25
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
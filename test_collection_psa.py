@@ -4,13 +4,8 @@ import os
 import sys
 from src.utils.enhanced_card_processor import (
     _extract_player_from_filename, 
-    _quick_graded_card_detection,
-    quick_graded_check
+    analyze_card_image
 )
-import io
-from google.cloud import vision
-import json
-from google.oauth2.credentials import Credentials
 from tqdm import tqdm
 
 def scan_collection_for_psa_cards():
@@ -33,26 +28,6 @@ def scan_collection_for_psa_cards():
     
     print(f"🔍 Scanning {len(image_files)} cards for PSA grading...")
     
-    # Initialize Vision API client
-    try:
-        if not os.path.exists('token.json'):
-            print("❌ token.json not found. Please run authentication first.")
-            return
-            
-        with open('token.json', 'r') as f:
-            token_data = json.load(f)
-        
-        SCOPES = [
-            'https://www.googleapis.com/auth/drive.readonly',
-            'https://www.googleapis.com/auth/cloud-platform'
-        ]
-        creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-        client = vision.ImageAnnotatorClient(credentials=creds)
-        
-    except Exception as e:
-        print(f"❌ Error initializing Vision API: {e}")
-        return
-    
     # Track results
     psa_cards = []
     raw_cards = []
@@ -66,25 +41,18 @@ def scan_collection_for_psa_cards():
             # Extract player name from filename
             player_name = _extract_player_from_filename(image_path)
             
-            # Quick OCR scan for PSA indicators
-            with io.open(image_path, 'rb') as img_file:
-                content = img_file.read()
-            
-            image = vision.Image(content=content)
-            response = client.document_text_detection(image=image)
-            
-            if response.error.message:
+            # Single OCR pass: graded detection and PSA extraction share the text
+            try:
+                text, details = analyze_card_image(image_path, player_name)
+            except Exception as ocr_error:
                 error_cards.append({
                     'file': image_file,
                     'player': player_name,
-                    'error': response.error.message
+                    'error': str(ocr_error)
                 })
                 continue
-                
-            text = response.full_text_annotation.text if response.full_text_annotation else ""
             
-            # Check for PSA grading
-            is_graded = _quick_graded_card_detection(text)
+            is_graded = details.get('graded', False)
             
             card_info = {
                 'file': image_file,
@@ -93,18 +61,11 @@ def scan_collection_for_psa_cards():
             }
             
             if is_graded:
-                # Extract additional PSA details for graded cards
-                import re
-                
-                # Look for PSA grade
-                grade_match = re.search(r'PSA\s+(\d+(?:\.\d+)?)', text, re.IGNORECASE)
-                if grade_match:
-                    card_info['grade'] = grade_match.group(1)
-                
-                # Look for cert number
-                cert_match = re.search(r'CERT\s*#?\s*(\d{8,})', text, re.IGNORECASE)
-                if cert_match:
-                    card_info['cert_number'] = cert_match.group(1)
+                # PSA details come from the same extraction pass
+                if details.get('grade'):
+                    card_info['grade'] = details['grade']
+                if details.get('cert_number'):
+                    card_info['cert_number'] = details['cert_number']
                 
                 psa_cards.append(card_info)
             else:
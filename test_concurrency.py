@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the bounded thread-pool map and the jittered retry helper.
+Retries are checked with Vision's quota errors; no Google API calls are made.
+"""
+
+import time
+import threading
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from src.utils import concurrency
+from src.utils.concurrency import call_with_retry, map_ordered
+from src.utils.ocr_pool import RETRYABLE_ERRORS
+
+
+class TestMapOrdered:
+    """Test ordering, error isolation and the concurrency cap"""
+
+    def test_results_keep_input_order(self):
+        def slow_for_small(n):
+            time.sleep(0.01 * (5 - n))
+            return n * 10
+
+        assert map_ordered(slow_for_small, range(5), max_workers=5) == [0, 10, 20, 30, 40]
+
+    def test_exception_is_returned_in_place(self):
+        def fail_on_two(n):
+            if n == 2:
+                raise ValueError("bad image")
+            return n
+
+        results = map_ordered(fail_on_two, range(4), max_workers=2)
+        assert results[:2] == [0, 1]
+        assert isinstance(results[2], ValueError)
+        assert results[3] == 3
+
+    def test_in_flight_calls_are_bounded(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def track(_):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+
+        map_ordered(track, range(12), max_workers=3)
+        assert state["peak"] <= 3
+
+    def test_empty_input(self):
+        assert map_ordered(lambda x: x, [], max_workers=4) == []
+
+
+class TestCallWithRetry:
+    """Test jittered backoff on Vision quota errors"""
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch):
+        monkeypatch.setattr(concurrency.time, "sleep", lambda seconds: None)
+
+    def test_quota_errors_are_retried(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise google_exceptions.ResourceExhausted("quota")
+            return "ok"
+
+        assert call_with_retry(flaky, max_retries=4, retry_on=RETRYABLE_ERRORS) == "ok"
+        assert len(attempts) == 3
+
+    def test_gives_up_after_max_retries(self):
+        def always_quota():
+            raise google_exceptions.ResourceExhausted("quota")
+
+        with pytest.raises(google_exceptions.ResourceExhausted):
+            call_with_retry(always_quota, max_retries=2, retry_on=RETRYABLE_ERRORS)
+
+    def test_other_errors_are_not_retried(self):
+        attempts = []
+
+        def invalid():
+            attempts.append(1)
+            raise google_exceptions.InvalidArgument("bad image")
+
+        with pytest.raises(google_exceptions.InvalidArgument):
+            call_with_retry(invalid, max_retries=4, retry_on=RETRYABLE_ERRORS)
+        assert len(attempts) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Unit tests for concurrent eBay sold-listing fetches.
+The pooled session is replaced by a slow fake; eBay is never contacted.
+"""
+
+import time
+import threading
+from types import SimpleNamespace
+import pytest
+
+from src.utils import price_cache, price_finder, rate_limiter
+from src.utils.price_cache import PriceCache, MemoryLRUCache
+from src.utils.rate_limiter import TokenBucket, ErrorBackoff
+
+LISTING_HTML = b'<div class="s-item__wrapper clearfix"><span class="s-item__price">$20.00</span></div>'
+
+
+class SlowSession:
+    """Session.get stand-in: 100ms per request, tracks peak concurrency"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.urls = []
+        self.timeouts = []
+
+    def get(self, url, timeout=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.urls.append(url)
+            self.timeouts.append(timeout)
+        time.sleep(0.1)
+        with self.lock:
+            self.active -= 1
+        return SimpleNamespace(status_code=200, headers={}, content=LISTING_HTML, raise_for_status=lambda: None)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = SlowSession()
+    monkeypatch.setattr(price_finder, "_get_ebay_session", lambda: session)
+    monkeypatch.setattr(rate_limiter, "_ebay_limiter", TokenBucket(rate=1000, burst=10))
+    monkeypatch.setattr(rate_limiter, "_ebay_error_backoff", ErrorBackoff())
+    monkeypatch.setattr(price_cache, "_price_cache", PriceCache(memory=MemoryLRUCache(), ttl=60))
+    return session
+
+
+class TestFetchSoldPrices:
+    """Test concurrency, ordering, dedup and per-query timeouts"""
+
+    def test_queries_run_concurrently_up_to_the_limit(self, session):
+        queries = [f'"Player {i}" 2023 Topps sold' for i in range(8)]
+
+        start = time.perf_counter()
+        results = price_finder.fetch_sold_prices(queries, max_workers=4)
+        elapsed = time.perf_counter() - start
+
+        assert results == [[20.0]] * 8
+        assert session.peak == 4
+        # Two waves of four instead of eight requests back to back
+        assert elapsed < 0.5
+
+    def test_repeated_queries_are_fetched_once(self, session):
+        results = price_finder.fetch_sold_prices(["a sold", "b sold", "a sold"], max_workers=4)
+        assert len(results) == 3
+        assert len(session.urls) == 2
+
+    def test_each_request_has_connect_and_read_timeouts(self, session):
+        price_finder.fetch_sold_prices(["a sold"])
+        assert session.timeouts == [(price_finder.EBAY_CONNECT_TIMEOUT_SECONDS, price_finder.EBAY_READ_TIMEOUT_SECONDS)]
+
+    def test_research_all_prices_uses_the_fetch_engine(self, session, monkeypatch):
+        monkeypatch.setattr(price_finder, "EBAY_FETCH_CONCURRENCY", 4)
+        cards = [{"player": f"Player Number{i}", "set": "Topps Chrome", "year": "2023"} for i in range(4)]
+
+        results = price_finder.research_all_prices(cards)
+
+        assert [card["player"] for card in results] == [card["player"] for card in cards]
+        assert all(card["pricing_data"]["average_sold_price"] == 20.0 for card in results)
+        assert session.peak == 4
+
+
+class TestSingleFlight:
+    """Test that concurrent callers share one outbound fetch per query"""
+
+    def test_concurrent_callers_share_one_fetch(self, session):
+        barrier = threading.Barrier(6)
+        results = []
+
+        def scrape(query):
+            barrier.wait()
+            results.append(price_finder._scrape_ebay_sold_listings(query))
+
+        threads = [threading.Thread(target=scrape, args=(query,)) for query in ["a sold"] * 4 + ["b sold"] * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [[20.0]] * 6
+        assert len(session.urls) == 2
+
+    def test_research_all_prices_fetches_each_distinct_query_once(self, session):
+        cards = [{"player": "Paul Skenes", "set": "Topps Chrome", "year": "2023"}] * 5
+
+        results = price_finder.research_all_prices(cards)
+
+        assert all(card["pricing_data"]["average_sold_price"] == 20.0 for card in results)
+        assert len(session.urls) == 1
+
+
+class TestSharedSession:
+    """Test that every query goes through one pooled session"""
+
+    def test_session_is_reused(self):
+        assert price_finder._get_ebay_session() is price_finder._get_ebay_session()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for eBay sold-listing extraction.
+The streaming parser must return exactly what the BeautifulSoup parser
+returns, on the saved result pages and on hand-written edge cases.
+"""
+
+import glob
+import gzip
+import os
+import pytest
+
+from src.utils import ebay_listing_parser
+from src.utils.ebay_listing_parser import (
+    parse_price, parse_sold_listings, parse_sold_listings_fast, parse_sold_listings_soup,
+)
+
+FIXTURES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "scripts", "fixtures", "ebay_sold", "*.html.gz")))
+
+
+def listing(price, title="", date=""):
+    title_html = f'<h3 class="s-item__title">{title}</h3>' if title else ""
+    date_html = f'<span class="s-item__endedDate">{date}</span>' if date else ""
+    return (f'<li class="s-item"><div class="s-item__wrapper clearfix"><div class="s-item__info">'
+            f'{title_html}{date_html}<div class="s-item__detail">{price}</div></div></div></li>')
+
+
+def page(*listings):
+    return f'<html><head><script>var t = "<div class=\\"s-item__wrapper clearfix\\">";</script></head><body><ul>{"".join(listings)}</ul></body></html>'
+
+
+class TestParsePrice:
+    """Test dollar amount extraction"""
+
+    def test_amounts(self):
+        assert parse_price("$1,250.00") == 1250.0
+        assert parse_price("$10.00 to $15.00") == 10.0
+        assert parse_price("Sold") is None
+
+
+class TestFixtures:
+    """Test that both parsers agree on saved result pages"""
+
+    def test_fixtures_exist(self):
+        assert len(FIXTURES) >= 4
+
+    @pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+    @pytest.mark.parametrize("max_results", [1, 5, None])
+    @pytest.mark.parametrize("fallback", [False, True])
+    def test_parsers_agree(self, path, max_results, fallback):
+        with gzip.open(path, "rb") as f:
+            html = f.read()
+        assert parse_sold_listings_fast(html, max_results, fallback) == parse_sold_listings_soup(html, max_results, fallback)
+
+
+class TestFastParser:
+    """Test the streaming parser on edge cases"""
+
+    def test_nested_price_text_and_entities(self):
+        html = page(listing('<span class="s-item__price"><span>$1,020.50</span><span> to </span>$1,200.00</span>',
+                            title="Paul Skenes &amp; Elly De La Cruz", date=" Sold  Oct 3, 2025 "))
+        expected = [{"price": 1020.5, "title": "Paul Skenes & Elly De La Cruz", "sold_date": "Sold  Oct 3, 2025"}]
+        assert parse_sold_listings_fast(html) == expected
+        assert parse_sold_listings_soup(html) == expected
+
+    def test_script_text_is_not_a_listing(self):
+        assert parse_sold_listings_fast(page()) == []
+
+    def test_listings_without_prices_count_toward_max_results(self):
+        html = page(listing("no price"), listing('<span class="s-item__price">$5.00</span>'))
+        assert parse_sold_listings_fast(html, max_results=1) == parse_sold_listings_soup(html, max_results=1) == []
+        assert [l["price"] for l in parse_sold_listings_fast(html, max_results=2)] == [5.0]
+
+    def test_notranslate_fallback(self):
+        html = page(listing('<span class="notranslate">$7.25</span>'))
+        assert parse_sold_listings_fast(html) == []
+        assert [l["price"] for l in parse_sold_listings_fast(html, fallback=True)] == [7.25]
+
+    def test_stops_reading_after_max_results(self, monkeypatch):
+        fed = []
+        feed = ebay_listing_parser._SoldListingStream.feed
+        monkeypatch.setattr(ebay_listing_parser, "FEED_CHUNK_CHARS", 256)
+        monkeypatch.setattr(ebay_listing_parser._SoldListingStream, "feed",
+                            lambda stream, data: fed.append(len(data)) or feed(stream, data))
+        html = page(*[listing(f'<span class="s-item__price">${i}.00</span>') for i in range(1, 50)])
+
+        listings = parse_sold_listings_fast(html, max_results=3)
+
+        assert [l["price"] for l in listings] == [1.0, 2.0, 3.0]
+        assert sum(fed) < len(html) / 4
+
+    def test_str_and_bytes_input(self):
+        html = page(listing('<span class="s-item__price">$9.99</span>'))
+        assert parse_sold_listings_fast(html) == parse_sold_listings_fast(html.encode())
+
+
+class TestParserSetting:
+    """Test EBAY_HTML_PARSER selection"""
+
+    def test_selects_implementation(self, monkeypatch):
+        calls = []
+        monkeypatch.setitem(ebay_listing_parser.PARSERS, "soup", lambda html, m, f: calls.append("soup") or [])
+        monkeypatch.setitem(ebay_listing_parser.PARSERS, "fast", lambda html, m, f: calls.append("fast") or [])
+
+        parse_sold_listings("", parser="soup")
+        monkeypatch.setattr(ebay_listing_parser, "EBAY_HTML_PARSER", "fast")
+        parse_sold_listings("")
+        parse_sold_listings("", parser="lxml")
+
+        assert calls == ["soup", "fast", "fast"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
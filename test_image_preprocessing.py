@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for client-side image preprocessing before OCR.
+Images are generated in memory with Pillow; no Vision calls are made.
+"""
+
+import io
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from src.utils import image_preprocessing
+from src.utils.image_preprocessing import preprocess_image_bytes, prepare_ocr_payload, find_card_region
+from src.utils.ocr_cache import image_cache_key
+
+
+def make_photo(size=(3000, 4000), card_box=None, fmt="PNG"):
+    """A synthetic photo: grey background with an optional white card"""
+    image = Image.new("RGB", size, (90, 90, 90))
+    if card_box:
+        image.paste((245, 245, 240), card_box)
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+class TestPreprocessImageBytes:
+    """Test downscaling, re-encoding and card cropping"""
+
+    def test_long_edge_is_bounded(self):
+        payload, info = preprocess_image_bytes(make_photo(), max_long_edge=1600, quality=85, crop=False)
+        resized = Image.open(io.BytesIO(payload))
+
+        assert max(resized.size) == 1600
+        assert resized.format == "JPEG"
+        assert info["original_size"] == (3000, 4000)
+        assert info["payload_bytes"] < info["original_bytes"]
+
+    def test_card_region_is_cropped(self):
+        content = make_photo(card_box=(500, 600, 2500, 3400))
+        payload, info = preprocess_image_bytes(content, max_long_edge=4000, quality=85, crop=True)
+        width, height = Image.open(io.BytesIO(payload)).size
+
+        assert info["cropped"]
+        # Card is 2000x2800; the crop keeps only a small margin around it
+        assert 2000 <= width < 2400
+        assert 2800 <= height < 3200
+
+    def test_no_card_means_no_crop(self):
+        image = Image.new("RGB", (800, 1000), (90, 90, 90))
+        assert find_card_region(image) is None
+
+    def test_undecodable_bytes_are_sent_unchanged(self):
+        payload, info = preprocess_image_bytes(b"not an image", crop=False)
+        assert payload == b"not an image"
+        assert not info["preprocessed"]
+
+    def test_small_jpeg_is_not_grown(self):
+        content = make_photo(size=(200, 300), fmt="JPEG")
+        payload, info = preprocess_image_bytes(content, max_long_edge=1600, quality=95, crop=False)
+        assert len(payload) <= len(content)
+
+
+class TestPrepareOCRPayload:
+    """Test the settings switch and the cache key per preprocessing variant"""
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setattr(image_preprocessing, "OCR_PREPROCESS_ENABLED", False)
+        content = make_photo()
+        assert prepare_ocr_payload(content) is content
+        assert image_preprocessing.preprocessing_signature() is None
+
+    def test_enabled_shrinks_payload_and_counts_bytes(self, monkeypatch):
+        monkeypatch.setattr(image_preprocessing, "OCR_PREPROCESS_ENABLED", True)
+        monkeypatch.setattr(image_preprocessing, "_stats", {"images": 0, "original_bytes": 0, "payload_bytes": 0})
+        content = make_photo()
+        payload = prepare_ocr_payload(content)
+
+        stats = image_preprocessing.get_preprocessing_stats()
+        assert len(payload) < len(content)
+        assert stats["images"] == 1
+        assert stats["payload_bytes"] == len(payload)
+        assert stats["bytes_saved_pct"] > 0
+
+    def test_variants_have_separate_cache_keys(self):
+        assert image_cache_key(b"abc", "edge1600-q85") != image_cache_key(b"abc")
+        assert image_cache_key(b"abc", "edge1600-q85") != image_cache_key(b"abc", "edge1024-q75")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit tests for OCR on in-memory images (bytes and buffers, no temp files).
+Vision is replaced by a fake annotator keyed on the image bytes.
+"""
+
+import io
+import os
+from types import SimpleNamespace
+import pytest
+
+from src.utils import enhanced_card_processor
+from src.utils.enhanced_card_processor import (
+    _read_image, perform_ocr_on_image, process_all_images_enhanced, process_dual_side_card,
+)
+
+TEXTS = {
+    b"front-bytes": "2023 TOPPS CHROME PAUL SKENES RC",
+    b"back-bytes": "© 2023 THE TOPPS COMPANY #124",
+}
+
+
+@pytest.fixture
+def fake_vision(monkeypatch, tmp_path):
+    """Fake Vision keyed on image bytes; runs in an empty cwd so stray files show up"""
+    seen = []
+
+    def annotate(content, client=None, timeout=None):
+        seen.append(content)
+        return SimpleNamespace(text=TEXTS[content])
+
+    monkeypatch.setattr(enhanced_card_processor, "_annotate_image_content", annotate)
+    monkeypatch.setattr(enhanced_card_processor, "get_vision_client", lambda: object())
+    monkeypatch.chdir(tmp_path)
+    return seen
+
+
+class TestReadImage:
+    """Test the accepted image inputs"""
+
+    def test_bytes(self):
+        assert _read_image(b"front-bytes") == b"front-bytes"
+        assert _read_image(bytearray(b"front-bytes")) == b"front-bytes"
+
+    def test_buffer_is_read_from_the_start(self):
+        buffer = io.BytesIO(b"front-bytes")
+        buffer.read()
+        assert _read_image(buffer) == b"front-bytes"
+        assert _read_image(buffer) == b"front-bytes"
+
+    def test_path(self, tmp_path):
+        image_path = tmp_path / "card.jpg"
+        image_path.write_bytes(b"front-bytes")
+        assert _read_image(str(image_path)) == b"front-bytes"
+        assert _read_image(image_path) == b"front-bytes"
+
+
+class TestInMemoryPipeline:
+    """Test that the OCR entry points work without touching disk"""
+
+    def test_perform_ocr_on_bytes(self, fake_vision):
+        assert perform_ocr_on_image(io.BytesIO(b"front-bytes")) == TEXTS[b"front-bytes"]
+        assert os.listdir(".") == []
+
+    def test_process_all_images_with_named_bytes(self, fake_vision):
+        cards = process_all_images_enhanced([
+            ("paul-skenes-front.jpg", b"front-bytes"),
+            ("paul-skenes-back.jpg", io.BytesIO(b"back-bytes")),
+        ])
+
+        assert [card["image_path"] for card in cards] == ["paul-skenes-front.jpg", "paul-skenes-back.jpg"]
+        assert cards[0]["player"] == "Paul Skenes"
+        assert cards[0]["set"] == "Topps Chrome"
+        assert fake_vision == [b"front-bytes", b"back-bytes"]
+        assert os.listdir(".") == []
+
+    def test_dual_side_with_bytes(self, fake_vision):
+        details = process_dual_side_card(b"front-bytes", b"back-bytes", player_name="Paul Skenes")
+
+        assert details["card_number"] == "124"
+        assert details["ocr_sources"] == "front, back"
+        assert details["dual_side"] is True
+        assert os.listdir(".") == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the card-processing job queue.
+Uses a throwaway SQLite database and fake pipeline handlers; no network,
+Vision or eBay calls are made.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.utils import async_io
+from src.models.job import ProcessingJob
+from src.services import job_service
+from src.services.job_service import JobService, JobWorkerPool, job_events
+
+CARD_PAYLOAD = {"image_url": "https://example.com/paul-skenes-front.jpg", "collection_id": "c1"}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    ProcessingJob.__table__.create(bind=engine)
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def jobs(session_factory):
+    db = session_factory()
+    yield JobService(db)
+    db.close()
+
+
+class TestJobService:
+    """Test submitting, claiming and recovering jobs"""
+
+    def test_submit_validates_type_and_fields(self, jobs):
+        with pytest.raises(HTTPException) as unknown:
+            jobs.submit("u1", "make-coffee", CARD_PAYLOAD)
+        assert unknown.value.status_code == 400
+
+        with pytest.raises(HTTPException) as missing:
+            jobs.submit("u1", "process-url", {"collection_id": "c1"})
+        assert missing.value.detail == "image_url is required"
+
+    def test_claims_oldest_first_and_only_once(self, jobs, session_factory):
+        first = jobs.submit("u1", "process-url", CARD_PAYLOAD)
+        second = jobs.submit("u1", "process-url", CARD_PAYLOAD)
+
+        other_worker = JobService(session_factory())
+        claimed = [jobs.claim_next(), other_worker.claim_next(), jobs.claim_next()]
+
+        assert [job.id if job else None for job in claimed] == [first.id, second.id, None]
+        assert claimed[0].status == "running"
+        assert claimed[0].attempts == 1
+
+    def test_jobs_are_scoped_to_their_owner(self, jobs):
+        job = jobs.submit("u1", "process-url", CARD_PAYLOAD)
+        assert jobs.get_job(job.id, "u1") is not None
+        assert jobs.get_job(job.id, "u2") is None
+
+    def test_stale_running_jobs_are_requeued_or_failed(self, jobs, monkeypatch):
+        monkeypatch.setattr(job_service, "JOB_MAX_ATTEMPTS", 2)
+        retry = jobs.submit("u1", "process-url", CARD_PAYLOAD)
+        exhausted = jobs.submit("u1", "process-url", CARD_PAYLOAD)
+        fresh = jobs.submit("u1", "process-url", CARD_PAYLOAD)
+
+        long_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+        for job, attempts, started_at in [(retry, 1, long_ago), (exhausted, 2, long_ago),
+                                          (fresh, 1, datetime.now(timezone.utc))]:
+            job.status, job.attempts, job.started_at = "running", attempts, started_at
+        jobs.db.commit()
+
+        assert jobs.requeue_stale(stale_seconds=600) == 1
+        assert jobs.get_job(retry.id).status == "queued"
+        assert jobs.get_job(exhausted.id).status == "failed"
+        assert jobs.get_job(fresh.id).status == "running"
+
+    def test_staleness_is_judged_by_the_heartbeat(self, jobs):
+        job = jobs.submit("u1", "process-url", CARD_PAYLOAD)
+        assert jobs.claim_next().id == job.id
+        # Started an hour ago, but its worker is still beating
+        job.started_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        jobs.db.commit()
+        jobs.heartbeat(job.id)
+
+        assert jobs.requeue_stale(stale_seconds=600) == 0
+        assert jobs.get_job(job.id).status == "running"
+
+
+class TestJobWorkerPool:
+    """Test workers running jobs end to end against fake pipelines"""
+
+    def run_pool(self, session_factory, handler, job_count=1):
+        stages = []
+
+        async def fake_handler(card_service, payload, progress):
+            for stage in ("downloading", "ocr", "pricing", "saving"):
+                await progress(stage)
+                stages.append(stage)
+            return await handler(payload)
+
+        async def scenario():
+            pool = JobWorkerPool(workers=2, session_factory=session_factory, poll_interval=0.05,
+                                 handlers={"process-url": (("image_url",), fake_handler)},
+                                 card_service_factory=lambda db: None)
+            await pool.start()
+            submit_db = session_factory()
+            job_ids = [JobService(submit_db).submit("u1", "process-url", CARD_PAYLOAD).id for _ in range(job_count)]
+            submit_db.close()
+            pool.notify()
+
+            check_db = session_factory()
+            for _ in range(100):
+                finished = [JobService(check_db).get_job(job_id) for job_id in job_ids]
+                if all(job.status in ("succeeded", "failed") for job in finished):
+                    break
+                await asyncio.sleep(0.05)
+            results = [JobService.to_dict(job) for job in finished]
+            check_db.close()
+            await pool.stop()
+            return results
+
+        return asyncio.run(scenario()), stages
+
+    def test_jobs_run_to_completion(self, session_factory):
+        async def succeed(payload):
+            return {"card_id": "card-1", "image_url": payload["image_url"]}
+
+        results, stages = self.run_pool(session_factory, succeed, job_count=3)
+
+        assert [job["status"] for job in results] == ["succeeded"] * 3
+        assert results[0]["result"] == {"card_id": "card-1", "image_url": CARD_PAYLOAD["image_url"]}
+        assert results[0]["progress"] == 1.0
+        assert stages.count("ocr") == 3
+
+    def test_long_running_job_is_not_requeued(self, session_factory):
+        runs = []
+
+        async def slow_handler(card_service, payload, progress):
+            runs.append(payload["image_url"])
+            # Longer than the stale window, with no stage changes on the way
+            await asyncio.sleep(0.6)
+            return {"card_id": "card-1"}
+
+        async def scenario():
+            pool = JobWorkerPool(workers=1, session_factory=session_factory, poll_interval=0.05,
+                                 handlers={"process-url": (("image_url",), slow_handler)},
+                                 card_service_factory=lambda db: None, heartbeat_interval=0.05)
+            await pool.start()
+            db = session_factory()
+            job_id = JobService(db).submit("u1", "process-url", CARD_PAYLOAD).id
+            pool.notify()
+
+            # A second worker process starting up while the job runs
+            requeued = []
+            for _ in range(5):
+                await asyncio.sleep(0.1)
+                requeued.append(await async_io.run_blocking(JobService(db).requeue_stale, 0.3))
+            for _ in range(40):
+                job = JobService(db).get_job(job_id)
+                if job.status == "succeeded":
+                    break
+                await asyncio.sleep(0.05)
+            db.close()
+            await pool.stop()
+            return requeued, job.status
+
+        requeued, status = asyncio.run(scenario())
+
+        assert requeued == [0] * 5
+        assert status == "succeeded"
+        assert len(runs) == 1
+
+    def test_failures_are_recorded(self, session_factory):
+        async def bad_download(payload):
+            raise HTTPException(status_code=400, detail="Could not download image: 404")
+
+        results, _ = self.run_pool(session_factory, bad_download)
+
+        assert results[0]["status"] == "failed"
+        assert results[0]["error"] == "Could not download image: 404"
+
+    def run_with_orphan(self, session_factory, saved=None):
+        """Start a pool, then leave a job 'running' under a worker that dies; returns handler runs and the job"""
+        runs = []
+
+        async def handler(card_service, payload, progress):
+            runs.append(payload["image_url"])
+            return {"card_id": "card-2"}
+
+        async def scenario():
+            pool = JobWorkerPool(workers=1, session_factory=session_factory, poll_interval=0.05,
+                                 handlers={"process-url": (("image_url",), handler)},
+                                 card_service_factory=lambda db: None, requeue_interval=0.05, stale_seconds=0.2)
+            await pool.start()
+            db = session_factory()
+            jobs = JobService(db)
+            job_id = jobs.submit("u1", "process-url", CARD_PAYLOAD).id
+            # Another worker process claims it, gets as far as saved (if given), then dies
+            job = jobs.claim_next()
+            if saved is not None:
+                jobs.update_stage(job_id, "saved", saved)
+            job.heartbeat_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+            db.commit()
+
+            for _ in range(40):
+                job = JobService(db).get_job(job_id)
+                if job.status == "succeeded":
+                    break
+                await asyncio.sleep(0.05)
+            result = JobService.to_dict(job)
+            db.close()
+            await pool.stop()
+            return runs, result
+
+        return asyncio.run(scenario())
+
+    def test_jobs_orphaned_while_running_are_requeued(self, session_factory):
+        runs, job = self.run_with_orphan(session_factory)
+
+        assert job["status"] == "succeeded"
+        assert job["attempts"] == 2
+        assert job["result"] == {"card_id": "card-2"}
+        assert len(runs) == 1
+
+    def test_retry_of_a_saved_job_does_not_save_again(self, session_factory):
+        runs, job = self.run_with_orphan(session_factory, saved={"card_id": "card-1"})
+
+        assert job["status"] == "succeeded"
+        assert job["result"] == {"card_id": "card-1"}
+        assert runs == []
+
+
+class TestJobEvents:
+    """Test the server-sent-events stream for a job"""
+
+    def test_progress_then_done(self, jobs):
+        job = jobs.submit("u1", "process-url", CARD_PAYLOAD)
+
+        async def scenario():
+            events = []
+            async for event in job_events(jobs, job.id, "u1", poll_interval=0.01):
+                events.append(event)
+                if len(events) == 1:
+                    await async_io.run_blocking(jobs.update_stage, job.id, "ocr")
+                elif len(events) == 2:
+                    await async_io.run_blocking(jobs.complete, job.id, {"card_id": "card-1"})
+            return events
+
+        events = asyncio.run(scenario())
+        names = [event.split("\n", 1)[0] for event in events]
+        assert names == ["event: progress", "event: progress", "event: done"]
+
+        done = json.loads(events[-1].split("data: ", 1)[1])
+        assert done["status"] == "succeeded"
+        assert done["result"] == {"card_id": "card-1"}
+
+    def test_unknown_job(self, jobs):
+        async def scenario():
+            return [event async for event in job_events(jobs, "missing", "u1", poll_interval=0.01)]
+
+        assert asyncio.run(scenario())[0].startswith("event: error")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the content-addressed OCR result cache.
+A fake Vision client stands in for the API, so no Google calls are made.
+"""
+
+import pytest
+from diskcache import Cache
+from google.cloud import vision
+
+from src.utils import ocr_cache, enhanced_card_processor
+from src.utils.enhanced_card_processor import _annotate_image_content, _batch_annotate_images
+
+
+class FakeVisionClient:
+    """Counts document_text_detection calls and returns a fixed annotation"""
+
+    def __init__(self, text="2023 TOPPS CHROME PAUL SKENES #124", error=None):
+        self.calls = 0
+        self.text = text
+        self.error = error
+
+    def document_text_detection(self, image, **kwargs):
+        self.calls += 1
+        response = vision.AnnotateImageResponse(
+            full_text_annotation=vision.TextAnnotation(
+                text=self.text,
+                pages=[vision.Page(width=600, height=840)]
+            )
+        )
+        if self.error:
+            response.error.message = self.error
+        return response
+
+
+class FakeBatchVisionClient:
+    """Records batch sizes and fails any image whose bytes contain b'bad'"""
+
+    def __init__(self):
+        self.batches = []
+
+    def batch_annotate_images(self, requests, **kwargs):
+        self.batches.append(len(requests))
+        responses = []
+        for request in requests:
+            response = vision.AnnotateImageResponse(
+                full_text_annotation=vision.TextAnnotation(text=request.image.content.decode())
+            )
+            if b"bad" in request.image.content:
+                response.error.message = "bad image data"
+            responses.append(response)
+        return vision.BatchAnnotateImagesResponse(responses=responses)
+
+
+@pytest.fixture(autouse=True)
+def temp_ocr_cache(tmp_path, monkeypatch):
+    """Point the OCR cache at a throwaway directory"""
+    cache = Cache(str(tmp_path / "ocr"), eviction_policy="least-recently-used")
+    monkeypatch.setattr(ocr_cache, "_cache", cache)
+    monkeypatch.setattr(ocr_cache, "OCR_CACHE_ENABLED", True)
+    yield cache
+    cache.close()
+
+
+class TestOCRCache:
+    """Test that identical image bytes are only sent to Vision once"""
+
+    def test_key_is_content_addressed(self):
+        assert ocr_cache.image_cache_key(b"abc") == ocr_cache.image_cache_key(b"abc")
+        assert ocr_cache.image_cache_key(b"abc") != ocr_cache.image_cache_key(b"abd")
+
+    def test_repeat_image_hits_cache(self):
+        client = FakeVisionClient()
+        first = _annotate_image_content(b"image-bytes", client)
+        second = _annotate_image_content(b"image-bytes", client)
+
+        assert client.calls == 1
+        assert first.text == second.text == client.text
+
+    def test_layout_is_preserved(self):
+        client = FakeVisionClient()
+        _annotate_image_content(b"image-bytes", client)
+        cached = _annotate_image_content(b"image-bytes", client)
+
+        assert cached.pages[0].width == 600
+        assert cached.pages[0].height == 840
+
+    def test_different_images_miss(self):
+        client = FakeVisionClient()
+        _annotate_image_content(b"front-bytes", client)
+        _annotate_image_content(b"back-bytes", client)
+        assert client.calls == 2
+
+    def test_errors_are_not_cached(self):
+        failing = FakeVisionClient(error="quota exceeded")
+        with pytest.raises(Exception):
+            _annotate_image_content(b"image-bytes", failing)
+
+        client = FakeVisionClient()
+        _annotate_image_content(b"image-bytes", client)
+        assert client.calls == 1
+
+
+class TestBatchOCR:
+    """Test batch_annotate_images grouping and per-image error isolation"""
+
+    @pytest.fixture
+    def image_paths(self, tmp_path):
+        def write_images(contents):
+            paths = []
+            for i, content in enumerate(contents):
+                path = tmp_path / f"card-{i}.jpg"
+                path.write_bytes(content)
+                paths.append(str(path))
+            return paths
+        return write_images
+
+    def test_images_are_grouped_by_batch_size(self, image_paths):
+        paths = image_paths([f"card {i}".encode() for i in range(40)])
+        client = FakeBatchVisionClient()
+        results = _batch_annotate_images(paths, client, batch_size=16)
+
+        assert client.batches == [16, 16, 8]
+        assert [r.text for r in results] == [f"card {i}" for i in range(40)]
+
+    def test_batch_size_is_capped_at_api_limit(self, image_paths):
+        paths = image_paths([f"card {i}".encode() for i in range(20)])
+        client = FakeBatchVisionClient()
+        _batch_annotate_images(paths, client, batch_size=100)
+        assert client.batches == [16, 4]
+
+    def test_failed_image_does_not_fail_batch(self, image_paths):
+        paths = image_paths([b"card 0", b"bad card", b"card 2"])
+        results = _batch_annotate_images(paths, FakeBatchVisionClient(), batch_size=16)
+
+        assert results[0].text == "card 0"
+        assert isinstance(results[1], Exception)
+        assert results[2].text == "card 2"
+
+    def test_cached_images_are_not_resent(self, image_paths):
+        paths = image_paths([b"card 0", b"card 1"])
+        client = FakeBatchVisionClient()
+        _batch_annotate_images(paths, client, batch_size=16)
+        _batch_annotate_images(paths, client, batch_size=16)
+        assert client.batches == [2]
+
+    def test_images_are_read_one_batch_at_a_time(self, image_paths, monkeypatch):
+        paths = image_paths([f"card {i}".encode() for i in range(40)])
+        reads = []
+        original_read = enhanced_card_processor._read_image
+        monkeypatch.setattr(enhanced_card_processor, "_read_image", lambda image: reads.append(image) or original_read(image))
+        read_before_batch = []
+
+        class CountingClient(FakeBatchVisionClient):
+            def batch_annotate_images(self, requests, **kwargs):
+                read_before_batch.append(len(reads))
+                return super().batch_annotate_images(requests, **kwargs)
+
+        results = _batch_annotate_images(paths, CountingClient(), batch_size=16)
+
+        assert read_before_batch == [16, 32, 40]
+        assert [r.text for r in results] == [f"card {i}" for i in range(40)]
+
+    def test_missing_file_is_isolated(self, image_paths):
+        paths = image_paths([b"card 0"]) + ["does-not-exist.jpg"]
+        results = _batch_annotate_images(paths, FakeBatchVisionClient(), batch_size=16)
+
+        assert results[0].text == "card 0"
+        assert isinstance(results[1], Exception)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
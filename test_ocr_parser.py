@@ -5,7 +5,8 @@ These test the parsing logic without making any Google API calls.
 """
 
 import pytest
-from src.utils.enhanced_card_processor import _extract_card_details_enhanced, _extract_psa_card_details
+from src.utils import enhanced_card_processor
+from src.utils.enhanced_card_processor import _extract_card_details_enhanced, _extract_psa_card_details, analyze_card_text
 
 
 class TestCardParserBasic:
@@ -181,6 +182,31 @@ class TestEdgeCases:
         assert result["card_number"] == "15"  # Should find real card number, not measurements
 
 
+class TestSinglePassAnalysis:
+    """Test that graded detection and extraction share one pass over the OCR text"""
+    
+    def test_graded_detection_runs_once(self, monkeypatch):
+        """analyze_card_text should not re-run graded detection inside extraction"""
+        calls = []
+        original = enhanced_card_processor._quick_graded_card_detection
+        
+        def counting_detection(text):
+            calls.append(text)
+            return original(text)
+        
+        monkeypatch.setattr(enhanced_card_processor, "_quick_graded_card_detection", counting_detection)
+        
+        result = analyze_card_text("PSA 10 GEM MINT\n2018 TOPPS CHROME SHOHEI OHTANI #1\nCERT #12345678", "Shohei Ohtani")
+        assert result["graded"] is True
+        assert result["grade"] == "10"
+        assert len(calls) == 1
+    
+    def test_raw_card_matches_direct_extraction(self):
+        """Single-pass result should equal the standalone extractor for raw cards"""
+        text = "2023 TOPPS CHROME PAUL SKENES #124 RC ROOKIE CARD"
+        assert analyze_card_text(text, "Paul Skenes") == _extract_card_details_enhanced(text, "Paul Skenes")
+
+
 class TestConfidenceScoring:
     """Test extraction confidence logic"""
     
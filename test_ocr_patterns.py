@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the precompiled OCR parsing patterns: the keyword matcher and
+the literal prefilter must agree exactly with the plain checks they replace.
+"""
+
+import pytest
+
+from src.utils.ocr_patterns import (
+    KeywordMatcher, PrefilteredPattern, fold_for_prefilter,
+    PSA_SET_PATTERNS, SET_PATTERNS, PARALLEL_PATTERNS,
+)
+
+SAMPLE_TEXTS = [
+    "2023 TOPPS CHROME PAUL SKENES #124 RC ROOKIE CARD",
+    "PSA 10 GEM MINT\n2018 TOPPS CHROME SHOHEI OHTANI #1 ROOKIE\nCERT #12345678",
+    "2024 Bowman's Best\nSERIAL NUMBERED 045/150\nOrange Refractor",
+    "Copyright 2024 Wild Card, Inc.\nAUTOGRAPH PATCH",
+    "panini prizm basketball silver prizm",
+    "ſelect mosaıc ﬁnest",
+    "",
+]
+
+
+class TestKeywordMatcher:
+    """Test that the matcher reports exactly the keywords a substring scan finds"""
+
+    KEYWORDS = ['ROOKIE', 'RC', 'AUTO', 'AUTOGRAPH', 'PATCH', 'JERSEY', 'SERIAL', 'NUMBERED']
+
+    @pytest.mark.parametrize("text", SAMPLE_TEXTS)
+    def test_matches_substring_scan(self, text):
+        matcher = KeywordMatcher(self.KEYWORDS)
+        upper = text.upper()
+        expected = [keyword for keyword in self.KEYWORDS if keyword in upper]
+
+        assert matcher.find_ordered(upper) == expected
+        assert matcher.find_all(upper) == set(expected)
+        assert matcher.contains_any(upper) == bool(expected)
+
+    def test_overlapping_keywords_are_all_found(self):
+        matcher = KeywordMatcher(['AUTO', 'AUTOGRAPH', 'GRAPH'])
+        assert matcher.find_all("SIGNED AUTOGRAPH") == {'AUTO', 'AUTOGRAPH', 'GRAPH'}
+        assert matcher.find_all("AUTO PATCH") == {'AUTO'}
+
+    def test_missing_short_keyword_rules_out_longer(self):
+        matcher = KeywordMatcher(['UPPER DECK', 'UPPER'])
+        assert matcher.find_all("TOPPS") == set()
+        assert matcher.find_all("UPPER DECK") == {'UPPER', 'UPPER DECK'}
+
+
+class TestPrefilteredPattern:
+    """Test that the literal prefilter never hides a real regex match"""
+
+    @pytest.mark.parametrize("text", SAMPLE_TEXTS)
+    def test_prefilter_agrees_with_regex(self, text):
+        folded = fold_for_prefilter(text)
+        for pattern in PSA_SET_PATTERNS + SET_PATTERNS + PARALLEL_PATTERNS:
+            assert pattern.findall(text, folded) == pattern.regex.findall(text)
+
+    def test_missing_literal_skips_search(self):
+        pattern = PrefilteredPattern(r'TOPPS\s+CHROME', ['topps'], ['chrome'])
+        assert not pattern.could_match(fold_for_prefilter("PANINI PRIZM"))
+        assert pattern.search("Topps  Chrome", fold_for_prefilter("Topps  Chrome"))
+
+    def test_fold_matches_ignorecase_equivalents(self):
+        # re.IGNORECASE treats the dotless i and long s as i and s
+        assert 'prizm' in fold_for_prefilter("PRıZM")
+        assert 'select' in fold_for_prefilter("ſELECT")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
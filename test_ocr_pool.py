@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit tests for dual-side OCR on the shared OCR worker pool.
+No Google API calls are made.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from src.utils import enhanced_card_processor
+from src.utils.enhanced_card_processor import process_dual_side_card
+
+
+class TestDualSideOCR:
+    """Test that front and back OCR overlap and a slow back degrades to front-only"""
+
+    TEXTS = {
+        "front.jpg": "2023 TOPPS CHROME PAUL SKENES RC",
+        "back.jpg": "© 2023 THE TOPPS COMPANY #124",
+    }
+
+    @pytest.fixture
+    def card_images(self, tmp_path):
+        for name in self.TEXTS:
+            (tmp_path / name).write_bytes(b"image")
+        return str(tmp_path / "front.jpg"), str(tmp_path / "back.jpg")
+
+    def fake_ocr(self, delays):
+        def perform_ocr(image_path):
+            name = image_path.rsplit("/", 1)[-1]
+            time.sleep(delays[name])
+            return self.TEXTS[name]
+        return perform_ocr
+
+    def test_sides_are_ocred_concurrently(self, card_images, monkeypatch):
+        monkeypatch.setattr(enhanced_card_processor, "perform_ocr_on_image",
+                            self.fake_ocr({"front.jpg": 0.3, "back.jpg": 0.3}))
+        start = time.perf_counter()
+        details = process_dual_side_card(*card_images, player_name="Paul Skenes")
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert details["card_number"] == "124"
+        assert details["ocr_sources"] == "front, back"
+        assert details["dual_side"] is True
+
+    def test_slow_back_degrades_to_front_only(self, card_images, monkeypatch):
+        monkeypatch.setattr(enhanced_card_processor, "OCR_BACK_SIDE_TIMEOUT_SECONDS", 0.1)
+        monkeypatch.setattr(enhanced_card_processor, "perform_ocr_on_image",
+                            self.fake_ocr({"front.jpg": 0.0, "back.jpg": 0.5}))
+        details = process_dual_side_card(*card_images, player_name="Paul Skenes")
+
+        assert details["ocr_sources"] == "front"
+        assert details["set"] == "Topps Chrome"
+        assert details["dual_side"] is False
+        assert details["back_side_timed_out"] is True
+
+    def test_back_side_timeout_counts_from_when_it_starts(self, card_images, monkeypatch):
+        # One free worker: the back queues behind the front for longer than its timeout
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(enhanced_card_processor, "get_ocr_executor", lambda: executor)
+        monkeypatch.setattr(enhanced_card_processor, "OCR_BACK_SIDE_TIMEOUT_SECONDS", 0.2)
+        monkeypatch.setattr(enhanced_card_processor, "perform_ocr_on_image",
+                            self.fake_ocr({"front.jpg": 0.4, "back.jpg": 0.05}))
+        try:
+            details = process_dual_side_card(*card_images, player_name="Paul Skenes")
+        finally:
+            executor.shutdown()
+
+        assert details["ocr_sources"] == "front, back"
+        assert details["dual_side"] is True
+        assert "back_side_timed_out" not in details
+
+    def test_slow_front_is_timed_out(self, card_images, monkeypatch):
+        monkeypatch.setattr(enhanced_card_processor, "OCR_TIMEOUT_SECONDS", 0.1)
+        monkeypatch.setattr(enhanced_card_processor, "perform_ocr_on_image",
+                            self.fake_ocr({"front.jpg": 0.5, "back.jpg": 0.0}))
+        start = time.perf_counter()
+        details = process_dual_side_card(*card_images, player_name="Paul Skenes")
+
+        assert time.perf_counter() - start < 0.4
+        assert details["front_side_timed_out"] is True
+        assert details["ocr_sources"] == "back"
+        assert details["card_number"] == "124"
+
+    def test_queued_sides_are_cancelled_at_the_queue_deadline(self, card_images, monkeypatch):
+        # The only worker is busy with another card for longer than the queue timeout
+        executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        executor.submit(release.wait)
+        monkeypatch.setattr(enhanced_card_processor, "get_ocr_executor", lambda: executor)
+        monkeypatch.setattr(enhanced_card_processor, "OCR_QUEUE_TIMEOUT_SECONDS", 0.1)
+        ocr_calls = []
+        monkeypatch.setattr(enhanced_card_processor, "perform_ocr_on_image", ocr_calls.append)
+        try:
+            start = time.perf_counter()
+            details = process_dual_side_card(*card_images, player_name="Paul Skenes")
+            elapsed = time.perf_counter() - start
+        finally:
+            release.set()
+            executor.shutdown()
+
+        assert elapsed < 0.5
+        assert details["front_side_timed_out"] is True and details["back_side_timed_out"] is True
+        assert details["dual_side"] is False
+        assert ocr_calls == []
+
+    def test_failed_back_is_not_dual_side(self, card_images, monkeypatch):
+        def perform_ocr(image_path):
+            if image_path.endswith("back.jpg"):
+                raise RuntimeError("Vision error")
+            return self.TEXTS["front.jpg"]
+
+        monkeypatch.setattr(enhanced_card_processor, "perform_ocr_on_image", perform_ocr)
+        details = process_dual_side_card(*card_images, player_name="Paul Skenes")
+
+        assert details["ocr_sources"] == "front"
+        assert details["dual_side"] is False
+        assert "back_side_timed_out" not in details
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
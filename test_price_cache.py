@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the tiered eBay sold-price cache.
+eBay is never contacted: the pooled session is replaced by a counting fake.
+"""
+
+import time
+from types import SimpleNamespace
+import pytest
+
+from src.utils import price_cache, price_finder, rate_limiter
+from src.utils.rate_limiter import TokenBucket, ErrorBackoff
+from src.utils.price_cache import PriceCache, MemoryLRUCache, DiskCache
+
+
+@pytest.fixture
+def tiered_cache(tmp_path):
+    return PriceCache(memory=MemoryLRUCache(max_entries=2), disk=DiskCache(str(tmp_path / "prices")), ttl=60)
+
+
+class TestMemoryLRUCache:
+    """Test bounding and expiry of the in-process tier"""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = MemoryLRUCache(max_entries=2)
+        cache.set("a", [1.0], ttl=60)
+        cache.set("b", [2.0], ttl=60)
+        cache.get("a")
+        cache.set("c", [3.0], ttl=60)
+
+        assert cache.get("a") == (True, [1.0])
+        assert cache.get("b") == (False, None)
+        assert len(cache) == 2
+
+    def test_entries_expire(self):
+        cache = MemoryLRUCache()
+        cache.set("a", [1.0], ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") == (False, None)
+
+
+class TestPriceCache:
+    """Test tier lookup order, persistence, TTL and metrics"""
+
+    def test_memory_then_disk_then_miss(self, tiered_cache):
+        tiered_cache.set("q", [10.0, 12.0])
+        assert tiered_cache.get("q") == (True, [10.0, 12.0])
+
+        tiered_cache.memory.clear()
+        assert tiered_cache.get("q") == (True, [10.0, 12.0])  # disk hit, promoted
+        assert tiered_cache.get("q") == (True, [10.0, 12.0])  # memory again
+        assert tiered_cache.get("other") == (False, None)
+
+        stats = tiered_cache.get_stats()
+        assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (2, 1, 1)
+        assert stats["hit_rate"] == 0.75
+
+    def test_empty_result_is_a_hit(self, tiered_cache):
+        tiered_cache.set("no sales", [])
+        assert tiered_cache.get("no sales") == (True, [])
+
+    def test_disk_tier_survives_a_new_process(self, tmp_path):
+        PriceCache(disk=DiskCache(str(tmp_path / "shared")), ttl=60).set("q", [5.0])
+        fresh = PriceCache(memory=MemoryLRUCache(), disk=DiskCache(str(tmp_path / "shared")), ttl=60)
+        assert fresh.get("q") == (True, [5.0])
+
+    def test_disk_entries_expire(self, tmp_path):
+        cache = PriceCache(disk=DiskCache(str(tmp_path / "prices")), ttl=0.01)
+        cache.set("q", [5.0])
+        time.sleep(0.05)
+        assert cache.get("q") == (False, None)
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+    content = b'<div class="s-item__wrapper clearfix"><span class="s-item__price">$12.50</span></div>'
+
+    def raise_for_status(self):
+        pass
+
+
+class TestScrapeUsesCache:
+    """Test that _scrape_ebay_sold_listings reads and fills the shared cache"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_error_backoff(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter, "_ebay_error_backoff", ErrorBackoff())
+
+    @staticmethod
+    def use_responses(monkeypatch, cache, responses):
+        requests_made = []
+
+        def fake_get(*args, **kwargs):
+            requests_made.append(args)
+            return responses.pop(0)
+
+        monkeypatch.setattr(price_finder, "_get_ebay_session", lambda: SimpleNamespace(get=fake_get))
+        monkeypatch.setattr(price_cache, "_price_cache", cache)
+        monkeypatch.setattr(rate_limiter, "_ebay_limiter", TokenBucket(rate=100, burst=10))
+        return requests_made
+
+    def test_second_lookup_skips_ebay(self, tiered_cache, monkeypatch):
+        requests_made = []
+        fake_get = lambda *args, **kwargs: requests_made.append(args) or FakeResponse()
+        monkeypatch.setattr(price_finder, "_get_ebay_session", lambda: SimpleNamespace(get=fake_get))
+        monkeypatch.setattr(price_cache, "_price_cache", tiered_cache)
+        monkeypatch.setattr(rate_limiter, "_ebay_limiter", TokenBucket(rate=100, burst=10))
+
+        first = price_finder._scrape_ebay_sold_listings('"Paul Skenes" 2023 Topps sold')
+        second = price_finder._scrape_ebay_sold_listings('"Paul Skenes" 2023 Topps sold')
+
+        assert first == second == [12.5]
+        assert len(requests_made) == 1
+        assert tiered_cache.get_stats()["memory_hits"] == 1
+
+    def test_no_sold_listings_are_cached_briefly(self, monkeypatch):
+        empty = SimpleNamespace(status_code=200, headers={}, content=b"<html></html>", raise_for_status=lambda: None)
+        cache = PriceCache(memory=MemoryLRUCache(), ttl=60)
+        requests_made = self.use_responses(monkeypatch, cache, [empty, empty, FakeResponse()])
+        monkeypatch.setattr(price_finder, "PRICE_CACHE_NEGATIVE_TTL_SECONDS", 0.05)
+
+        assert price_finder._scrape_ebay_sold_listings('"Obscure Player" sold') == []
+        assert price_finder._scrape_ebay_sold_listings('"Obscure Player" sold') == []
+        assert len(requests_made) == 1
+        assert cache.memory.remaining_ttl('sold_prices::"Obscure Player" sold::5') <= 0.05
+
+        time.sleep(0.06)
+        assert price_finder._scrape_ebay_sold_listings('"Obscure Player" sold') == []
+        assert len(requests_made) == 2
+
+    def test_refused_query_is_cached_as_no_result(self, monkeypatch):
+        def not_found():
+            raise Exception("HTTP 404")
+        refused = SimpleNamespace(status_code=404, headers={}, content=b"", raise_for_status=not_found)
+        cache = PriceCache(memory=MemoryLRUCache(), ttl=60)
+        requests_made = self.use_responses(monkeypatch, cache, [refused, FakeResponse()])
+
+        assert price_finder._scrape_ebay_sold_listings('"Bad Query" sold') == []
+        assert price_finder._scrape_ebay_sold_listings('"Bad Query" sold') == []
+        assert len(requests_made) == 1
+        assert rate_limiter.get_ebay_error_backoff().get_stats()["failures"] == 0
+
+    def test_server_errors_are_not_cached(self, monkeypatch):
+        def server_error():
+            raise Exception("HTTP 502")
+        failed = SimpleNamespace(status_code=502, headers={}, content=b"", raise_for_status=server_error)
+        cache = PriceCache(memory=MemoryLRUCache(), ttl=60)
+        self.use_responses(monkeypatch, cache, [failed])
+
+        assert price_finder._scrape_ebay_sold_listings('"Paul Skenes" sold') == []
+        assert cache.get('sold_prices::"Paul Skenes" sold::5') == (False, None)
+        assert rate_limiter.get_ebay_error_backoff().retry_in('sold_prices::"Paul Skenes" sold::5') > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the hybrid price memo.
+Uses temporary SQLite card databases; eBay research is faked.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "scripts"))
+from seed_card_database import seed_baseball_cards
+
+from src.utils import price_finder
+from src.services import card_catalog
+from src.services.card_catalog import get_card_catalog
+from src.services.card_database_service import CardDatabase, CardDatabaseService, HybridPricingService
+from src.services.price_memo import PriceMemo, get_price_memo, get_price_memo_stats
+
+SKENES = {"player": "Paul Skenes", "year": "2024", "set": "Bowman Chrome", "card_number": "BCP-1"}
+
+
+@pytest.fixture
+def engine(engine, make_card):
+    db = sessionmaker(bind=engine)()
+    db.add_all([make_card("Paul Skenes", year=2024, manufacturer="Bowman", card_number="BCP-1", avg_psa10_price=200.0,
+                          last_updated=datetime.utcnow()),
+                make_card("Mike Trout", set_name="Series 1", card_number="27", last_updated=datetime.utcnow())])
+    db.commit()
+    db.close()
+    return engine
+
+
+@pytest.fixture
+def ebay(monkeypatch):
+    calls = []
+
+    def research(cards):
+        calls.append(cards[0]["player"])
+        return [dict(cards[0], pricing_data={"average_sold_price": 42.0, "sample_size": 5})]
+
+    monkeypatch.setattr(price_finder, "research_all_prices", research)
+    # eBay prices are not written back here; the tests write rows themselves
+    monkeypatch.setattr(HybridPricingService, "_cache_price_result", lambda self, card_data, pricing_data: None)
+    return calls
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Cards passed to find_card_matches, per call"""
+    calls = []
+    original = CardDatabaseService.find_card_matches
+    monkeypatch.setattr(CardDatabaseService, "find_card_matches",
+                        lambda self, cards: calls.append([c["player"] for c in cards]) or original(self, cards))
+    return calls
+
+
+def price(session_factory, *cards):
+    async def run():
+        db = session_factory()
+        try:
+            return await HybridPricingService(db, session_factory=session_factory).get_card_prices(list(cards))
+        finally:
+            db.close()
+    return asyncio.run(run())
+
+
+class TestPriceMemo:
+    """Test the LRU itself"""
+
+    def test_bounded_lru(self):
+        memo = PriceMemo(max_entries=2)
+        memo.set("a", ("card-a", 1.0, None))
+        memo.set("b", ("card-b", 2.0, None))
+        memo.get("a")
+        memo.set("c", None)
+        assert memo.get("a") == (True, ("card-a", 1.0, None))
+        assert memo.get("b") == (False, None)
+        assert memo.get("c") == (True, None)
+        assert memo.get_stats()["evictions"] == 1
+
+    def test_entries_expire(self):
+        memo = PriceMemo(ttl=0.02)
+        memo.set("a", ("card-a", 1.0, None))
+        time.sleep(0.03)
+        assert memo.get("a") == (False, None)
+        assert len(memo) == 0
+
+    def test_invalidate_drops_the_card_and_no_price_entries(self):
+        memo = PriceMemo()
+        memo.set("a raw", ("card-a", 1.0, None))
+        memo.set("a psa 10", ("card-a", 9.0, None))
+        memo.set("b", ("card-b", 2.0, None))
+        memo.set("unknown", None)
+        assert memo.invalidate(["card-a", "card-x"]) == 3
+        assert memo.get("b")[0] and not memo.get("a raw")[0] and not memo.get("unknown")[0]
+        assert memo.invalidate() == 1 and len(memo) == 0
+
+    def test_value_read_before_an_invalidation_is_not_kept(self):
+        memo = PriceMemo()
+        version = memo.version()
+        memo.invalidate(["card-a"])
+        memo.set("a", ("card-a", 1.0, None), version)
+        assert memo.get("a") == (False, None)
+        assert memo.get_stats()["stale_sets"] == 1
+
+    def test_zero_entries_disables(self):
+        memo = PriceMemo(max_entries=0)
+        memo.set("a", ("card-a", 1.0, None))
+        assert memo.get("a") == (False, None)
+
+
+class TestMemoizedHybridPricing:
+    """Test get_card_price through the memo"""
+
+    def test_repeated_cards_are_matched_once(self, session_factory, engine, ebay, lookups):
+        first = price(session_factory, SKENES)[0]
+        again = price(session_factory, dict(SKENES, player="PAUL SKENES."), SKENES)
+
+        assert lookups == [["Paul Skenes"]]
+        assert first == again[0] == again[1]
+        assert first["source"] == "local_database" and first["estimated_value"] == 10.0
+        stats = get_price_memo(engine).get_stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+        assert get_price_memo_stats()["hits"] >= 2
+
+    def test_condition_is_part_of_the_key(self, session_factory, ebay, lookups):
+        psa10 = dict(SKENES, graded=True, grading_company="PSA", grade="10")
+        raw, graded = price(session_factory, SKENES, psa10)
+        assert (raw["estimated_value"], graded["estimated_value"]) == (10.0, 200.0)
+        assert price(session_factory, psa10)[0]["estimated_value"] == 200.0
+        assert len(lookups) == 1
+
+    def test_no_local_price_is_memoized(self, session_factory, ebay, lookups):
+        card = {"player": "Jackson Holliday", "year": "2024", "set": "Bowman Chrome"}
+        assert price(session_factory, card)[0]["source"] == "ebay_api"
+        assert price(session_factory, card)[0]["source"] == "ebay_api"
+        assert len(lookups) == 1
+        assert ebay == ["Jackson Holliday", "Jackson Holliday"]
+
+    def test_update_card_price_invalidates(self, session_factory, ebay, lookups):
+        price(session_factory, SKENES)
+        db = session_factory()
+        card_id = db.query(CardDatabase.id).filter(CardDatabase.player_name == "Paul Skenes").scalar()
+        CardDatabaseService(db).update_card_price(card_id, "raw", 55.0)
+        db.close()
+
+        assert price(session_factory, SKENES)[0]["estimated_value"] == 55.0
+        assert len(lookups) == 2
+
+    def test_seeded_cards_replace_no_price_entries(self, session_factory, ebay, lookups):
+        card = {"player": "Jackson Holliday", "year": "2024", "set": "Bowman Chrome", "card_number": "BCP-15"}
+        assert price(session_factory, card)[0]["source"] == "ebay_api"
+
+        db = session_factory()
+        seed_baseball_cards(db)
+        db.commit()
+        db.close()
+
+        result = price(session_factory, card)[0]
+        assert result["source"] == "local_database" and result["estimated_value"] == 12.0
+
+    def test_writes_from_elsewhere_reach_the_memo_with_the_catalog(self, session_factory, engine, ebay, lookups):
+        db = session_factory()
+        get_card_catalog(db).refresh_interval = 0
+        db.close()
+        price(session_factory, SKENES)
+
+        # A write that bypasses this process's ORM session (another worker, a SQL script)
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE card_database SET avg_raw_price = 66.0, last_updated = :now "
+                              "WHERE card_number = 'BCP-1'"), {"now": datetime.utcnow()})
+
+        assert price(session_factory, SKENES)[0]["estimated_value"] == 66.0
+        assert len(lookups) == 2
+
+    def test_without_catalog(self, session_factory, ebay, lookups, monkeypatch):
+        monkeypatch.setattr(card_catalog, "CARD_CATALOG_ENABLED", False)
+        assert price(session_factory, SKENES)[0]["estimated_value"] == 10.0
+        assert price(session_factory, SKENES)[0]["estimated_value"] == 10.0
+        assert len(lookups) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for writing live eBay prices back into card_database.
+Uses a temporary SQLite card database; eBay research is faked.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+
+from src.utils import price_finder
+from src.services import card_database_service
+from src.services.card_database_service import (
+    CardDatabase, CardPriceWriteBack, HybridPricingService, price_condition,
+)
+
+SKENES = {"player": "Paul Skenes", "set": "Topps Chrome", "year": "2023", "card_number": "124"}
+PRICING = {"average_sold_price": 42.0, "sample_size": 5}
+
+
+@pytest.fixture
+def writeback(session_factory, monkeypatch):
+    writeback = CardPriceWriteBack(session_factory, batch_size=50, interval=10)
+    monkeypatch.setattr(card_database_service, "_price_writeback", writeback)
+    yield writeback
+    writeback.stop()
+
+
+def rows(session_factory):
+    db = session_factory()
+    try:
+        return db.query(CardDatabase).order_by(CardDatabase.player_name).all()
+    finally:
+        db.close()
+
+
+class TestPriceCondition:
+    """Test which price column a card's price belongs in"""
+
+    def test_conditions(self):
+        assert price_condition({"graded": False}) == "raw"
+        assert price_condition({"graded": True, "grade": "10", "grading_company": "PSA"}) == "psa 10"
+        assert price_condition({"graded": True, "grade": 9.0}) == "psa 9"
+        assert price_condition({"graded": True, "grade": "8", "grading_company": "PSA"}) is None
+        assert price_condition({"graded": True, "grade": "10", "grading_company": "BGS"}) is None
+
+
+class TestCardPriceWriteBack:
+    """Test batched upserts into card_database"""
+
+    def test_new_card_is_inserted(self, writeback, session_factory):
+        assert writeback.submit(SKENES, PRICING)
+        assert writeback.flush()
+
+        [row] = rows(session_factory)
+        assert (row.player_name, row.year, row.set_name, row.card_number) == ("Paul Skenes", 2023, "Topps Chrome", "124")
+        assert row.manufacturer == "Topps"
+        assert (row.avg_raw_price, row.avg_psa9_price, row.avg_psa10_price) == (42.0, 0.0, 0.0)
+        assert row.sample_size == 5
+        assert datetime.utcnow() - row.last_updated < timedelta(minutes=1)
+
+    def test_existing_card_gets_the_graded_column(self, writeback, session_factory):
+        db = session_factory()
+        db.add(CardDatabase(id="skenes", sport="MLB", year=2023, manufacturer="Topps", set_name="Topps Chrome",
+                            player_name="Paul Skenes", card_number="124", parallel="", avg_raw_price=10.0,
+                            avg_psa9_price=0.0, avg_psa10_price=0.0, last_updated=datetime(2024, 1, 1)))
+        db.commit()
+        db.close()
+
+        writeback.submit(dict(SKENES, player="paul skenes", graded=True, grade="10", grading_company="PSA"),
+                         {"average_sold_price": 300.0, "sample_size": 3})
+        writeback.flush()
+
+        [row] = rows(session_factory)
+        assert row.id == "skenes"
+        assert (row.avg_raw_price, row.avg_psa10_price) == (10.0, 300.0)
+        assert row.last_updated > datetime(2024, 1, 1)
+        assert writeback.get_stats()["updated"] == 1
+
+    def test_queued_writes_share_one_batch(self, writeback, session_factory, engine):
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        cards = [dict(SKENES, player=f"Player {i}", card_number=str(i)) for i in range(20)]
+
+        for card in cards:
+            writeback.submit(card, PRICING)
+        # Same card again: the later price wins
+        writeback.submit(dict(SKENES, player="Player 0", card_number="0"), {"average_sold_price": 50.0, "sample_size": 7})
+        writeback.flush()
+
+        assert len(rows(session_factory)) == 20
+        stats = writeback.get_stats()
+        assert stats["batches"] == 1
+        assert stats["inserted"] == 20
+        # One lookup and one INSERT round for the whole batch
+        assert sum(sql.lstrip().upper().startswith("SELECT") for sql in statements if "card_database" in sql) <= 2
+        assert [row.avg_raw_price for row in rows(session_factory) if row.player_name == "Player 0"] == [50.0]
+
+    def test_cards_without_a_column_are_skipped(self, writeback, session_factory):
+        assert not writeback.submit(dict(SKENES, graded=True, grade="8"), PRICING)
+        assert not writeback.submit(dict(SKENES, year="unknown"), PRICING)
+        writeback.flush()
+
+        assert rows(session_factory) == []
+        assert writeback.get_stats()["skipped"] == 2
+
+    def test_stop_writes_what_is_queued(self, session_factory):
+        writeback = CardPriceWriteBack(session_factory, batch_size=50, interval=60)
+        writeback.submit(SKENES, PRICING)
+        writeback.stop()
+
+        assert len(rows(session_factory)) == 1
+
+
+class TestHybridWriteBack:
+    """Test that eBay fallbacks feed the local database"""
+
+    def test_ebay_price_becomes_a_local_hit(self, writeback, session_factory, monkeypatch):
+        calls = []
+
+        def research(cards):
+            calls.append(cards[0]["player"])
+            return [dict(cards[0], pricing_data=PRICING)]
+
+        monkeypatch.setattr(price_finder, "research_all_prices", research)
+
+        async def price():
+            db = session_factory()
+            try:
+                return await HybridPricingService(db, session_factory=session_factory).get_card_price(SKENES)
+            finally:
+                db.close()
+
+        first = asyncio.run(price())
+        writeback.flush()
+        second = asyncio.run(price())
+
+        assert first["source"] == "ebay_api"
+        assert second["source"] == "local_database"
+        assert second["estimated_value"] == 42.0
+        assert second["stale"] is False
+        assert calls == ["Paul Skenes"]
+
+    def test_write_back_does_not_block_pricing(self, session_factory, monkeypatch):
+        slow_writes = CardPriceWriteBack(session_factory, interval=0.01)
+        original = slow_writes._write_batch
+        monkeypatch.setattr(slow_writes, "_write_batch", lambda batch: time.sleep(0.3) or original(batch))
+        monkeypatch.setattr(card_database_service, "_price_writeback", slow_writes)
+        monkeypatch.setattr(price_finder, "research_all_prices", lambda cards: [dict(cards[0], pricing_data=PRICING)])
+
+        async def price():
+            db = session_factory()
+            try:
+                start = time.perf_counter()
+                result = await HybridPricingService(db, session_factory=session_factory).get_card_price(SKENES)
+                return result, time.perf_counter() - start
+            finally:
+                db.close()
+
+        result, elapsed = asyncio.run(price())
+        slow_writes.stop()
+
+        assert result["source"] == "ebay_api"
+        assert elapsed < 0.2
+        assert len(rows(session_factory)) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
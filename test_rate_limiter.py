@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the adaptive token-bucket limiter on outbound eBay requests.
+eBay is never contacted: the pooled session is replaced by scripted fakes.
+"""
+
+import time
+import threading
+import multiprocessing
+from types import SimpleNamespace
+import pytest
+
+from src.utils import price_cache, price_finder, rate_limiter
+from src.utils.price_cache import PriceCache, MemoryLRUCache
+from src.utils.rate_limiter import TokenBucket, DiskStateStore, ErrorBackoff, parse_retry_after
+
+
+@pytest.fixture(autouse=True)
+def fresh_error_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_ebay_error_backoff", ErrorBackoff(base=60, max_delay=600))
+
+
+class TestTokenBucket:
+    """Test burst, sustained rate, adaptive slowdown and recovery"""
+
+    def test_burst_goes_out_immediately(self):
+        bucket = TokenBucket(rate=1, burst=3)
+        start = time.perf_counter()
+        for _ in range(3):
+            bucket.acquire()
+        assert time.perf_counter() - start < 0.05
+
+    def test_sustained_rate_is_enforced(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        start = time.perf_counter()
+        for _ in range(5):
+            bucket.acquire()
+        # One token up front, then four more at 20/s
+        assert time.perf_counter() - start >= 0.19
+
+    def test_threads_share_one_budget(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        start = time.perf_counter()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert time.perf_counter() - start >= 0.09
+        assert bucket.get_stats()["acquired"] == 6
+
+    def test_penalize_slows_down_and_pauses(self):
+        bucket = TokenBucket(rate=10, burst=5, min_rate=1, backoff_factor=0.5)
+        bucket.penalize(retry_after=0.1)
+        assert bucket.current_rate() == 5
+
+        start = time.perf_counter()
+        bucket.acquire()
+        assert time.perf_counter() - start >= 0.09
+
+        for _ in range(10):
+            bucket.penalize(retry_after=0)
+        assert bucket.current_rate() == 1
+
+    def test_reward_recovers_up_to_the_configured_rate(self):
+        bucket = TokenBucket(rate=10, burst=5, min_rate=1, backoff_factor=0.5, recovery_step=0.2)
+        bucket.penalize(retry_after=0)
+        bucket.reward()
+        assert bucket.current_rate() == pytest.approx(7)
+        for _ in range(5):
+            bucket.reward()
+        assert bucket.current_rate() == 10
+
+    def test_retry_after_parsing(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def _take_tokens(directory, count):
+    bucket = TokenBucket(rate=1000, burst=4, store=DiskStateStore(directory))
+    for _ in range(count):
+        bucket.acquire()
+
+
+class TestErrorBackoff:
+    """Test per-key exponential backoff"""
+
+    def test_delay_doubles_up_to_the_cap(self):
+        backoff = ErrorBackoff(base=10, max_delay=35)
+        assert [backoff.record_failure("q") for _ in range(4)] == [10, 20, 35, 35]
+        assert 34 < backoff.retry_in("q") <= 35
+        assert backoff.retry_in("other") == 0
+
+    def test_success_clears_the_key(self):
+        backoff = ErrorBackoff(base=10)
+        backoff.record_failure("q")
+        backoff.record_success("q")
+        assert backoff.retry_in("q") == 0
+        assert backoff.record_failure("q") == 10
+
+    def test_key_may_retry_once_the_delay_passes(self):
+        backoff = ErrorBackoff(base=0.05)
+        backoff.record_failure("q")
+        time.sleep(0.06)
+        assert backoff.retry_in("q") == 0
+        assert backoff.get_stats() == {"failures": 1, "skipped": 0, "backing_off": 0}
+
+
+class TestSharedStore:
+    """Test that worker processes draw from one bucket"""
+
+    def test_processes_share_the_burst(self, tmp_path):
+        directory = str(tmp_path / "ratelimit")
+        _take_tokens(directory, 4)
+
+        # Another process sees the emptied bucket
+        bucket = TokenBucket(rate=1000, burst=4, store=DiskStateStore(directory))
+        process = multiprocessing.get_context("spawn").Process(target=_take_tokens, args=(directory, 1))
+        process.start()
+        process.join(timeout=30)
+        assert process.exitcode == 0
+        state = bucket.store.update(lambda state: (state, state))
+        assert state["tokens"] < 4
+
+
+class ScriptedResponses:
+    """Session.get stand-in that replays status codes and counts calls"""
+
+    def __init__(self, status_codes):
+        self.status_codes = list(status_codes)
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        status_code = self.status_codes.pop(0) if self.status_codes else 200
+        response = type("Response", (), {})()
+        response.status_code = status_code
+        response.headers = {"Retry-After": "0"} if status_code == 429 else {}
+        response.content = b'<div class="s-item__wrapper clearfix"><span class="s-item__price">$9.99</span></div>'
+
+        def raise_for_status():
+            if status_code >= 400:
+                raise Exception(f"HTTP {status_code}")
+        response.raise_for_status = raise_for_status
+        return response
+
+
+class TestPriceFinderLimiting:
+    """Test that research_all_prices only waits for real requests"""
+
+    CARDS = [{"player": "Paul Skenes", "set": "Topps Chrome", "year": "2023"}] * 4
+
+    @pytest.fixture
+    def limiter(self, monkeypatch):
+        limiter = TokenBucket(rate=100, burst=1, min_rate=1)
+        monkeypatch.setattr(rate_limiter, "_ebay_limiter", limiter)
+        monkeypatch.setattr(price_cache, "_price_cache", PriceCache(memory=MemoryLRUCache(), ttl=60))
+        return limiter
+
+    def test_cache_hits_skip_the_limiter(self, limiter, monkeypatch):
+        fake_get = ScriptedResponses([200])
+        monkeypatch.setattr(price_finder, "_get_ebay_session", lambda: SimpleNamespace(get=fake_get))
+
+        start = time.perf_counter()
+        results = price_finder.research_all_prices(self.CARDS)
+
+        assert fake_get.calls == 1
+        assert limiter.get_stats()["acquired"] == 1
+        assert all(card["pricing_data"]["average_sold_price"] == 9.99 for card in results)
+        # The old fixed sleep cost 2s per card
+        assert time.perf_counter() - start < 1.0
+
+    def test_throttled_response_slows_the_limiter(self, limiter, monkeypatch):
+        monkeypatch.setattr(price_finder, "_get_ebay_session", lambda: SimpleNamespace(get=ScriptedResponses([429])))
+
+        price_finder._scrape_ebay_sold_listings('"Paul Skenes" sold')
+
+        assert limiter.current_rate() == 50
+        assert limiter.get_stats()["throttled"] == 1
+
+    def test_throttled_query_backs_off(self, limiter, monkeypatch):
+        fake_get = ScriptedResponses([429, 200])
+        monkeypatch.setattr(price_finder, "_get_ebay_session", lambda: SimpleNamespace(get=fake_get))
+
+        assert price_finder._scrape_ebay_sold_listings('"Paul Skenes" sold') == []
+        assert price_finder._scrape_ebay_sold_listings('"Paul Skenes" sold') == []
+
+        # The retry waits out the backoff instead of going straight back to eBay
+        assert fake_get.calls == 1
+        assert rate_limiter.get_ebay_error_backoff().get_stats()["skipped"] == 1
+
+    def test_connection_errors_back_off_exponentially(self, limiter, monkeypatch):
+        def refuse(*args, **kwargs):
+            raise price_finder.requests.ConnectionError("connection refused")
+        monkeypatch.setattr(price_finder, "_get_ebay_session", lambda: SimpleNamespace(get=refuse))
+        backoff = ErrorBackoff(base=0.05, max_delay=10)
+        monkeypatch.setattr(rate_limiter, "_ebay_error_backoff", backoff)
+
+        price_finder._scrape_ebay_sold_listings('"Paul Skenes" sold')
+        time.sleep(0.06)
+        price_finder._scrape_ebay_sold_listings('"Paul Skenes" sold')
+
+        # Second consecutive failure: 0.05s doubled
+        assert 0.05 < backoff.retry_in('sold_prices::"Paul Skenes" sold::5') <= 0.1
+        assert backoff.get_stats()["failures"] == 2
+        # Transport errors are not cached as "no sold listings"
+        assert price_cache.get_price_cache().get('sold_prices::"Paul Skenes" sold::5') == (False, None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
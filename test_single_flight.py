@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SingleFlight in-flight call deduplicator.
+"""
+
+import time
+import threading
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+def run_concurrently(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestSingleFlight:
+    """Test call sharing, error propagation and key release"""
+
+    def test_concurrent_calls_with_one_key_run_once(self):
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        run_concurrently([lambda: results.append(flight.do("key", slow))] * 5)
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+        assert flight.get_stats() == {"calls": 5, "shared": 4, "in_flight": 0}
+
+    def test_different_keys_run_independently(self):
+        flight = SingleFlight()
+        calls = []
+
+        def work(key):
+            calls.append(key)
+            time.sleep(0.05)
+
+        run_concurrently([lambda key=key: flight.do(key, work, key) for key in ["a", "b", "a", "b"]])
+
+        assert sorted(set(calls)) == ["a", "b"]
+        assert len(calls) == 2
+
+    def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+        errors = []
+
+        def failing():
+            time.sleep(0.1)
+            raise ValueError("eBay down")
+
+        def call():
+            try:
+                flight.do("key", failing)
+            except ValueError as e:
+                errors.append(str(e))
+
+        run_concurrently([call] * 3)
+
+        assert errors == ["eBay down"] * 3
+        assert flight.get_stats()["in_flight"] == 0
+
+    def test_key_is_released_after_the_call(self):
+        flight = SingleFlight()
+        assert flight.do("key", lambda: 1) == 1
+        assert flight.do("key", lambda: 2) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Unit tests for stale-while-revalidate hybrid pricing.
+Uses a temporary SQLite card database; eBay research is faked.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.utils import async_io, price_finder
+from src.services import card_database_service
+from src.services.card_database_service import (
+    CARD_DATABASE_TABLES, CardDatabase, CardPriceWriteBack, HybridPricingService,
+)
+
+CARD = {"player": "Paul Skenes", "set": "Topps Chrome", "year": "2023"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_loop_state():
+    # anyio limiters and asyncio semaphores bind to the event loop that created them
+    async_io._limiter = None
+    HybridPricingService._refresh_semaphore = None
+    yield
+    async_io._limiter = None
+    HybridPricingService._refresh_semaphore = None
+    HybridPricingService._refreshing.clear()
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cards.db'}")
+    CardDatabase.metadata.create_all(bind=engine, tables=CARD_DATABASE_TABLES)
+    factory = sessionmaker(bind=engine)
+    # eBay fallbacks write back into the same temporary database
+    writeback = CardPriceWriteBack(factory)
+    monkeypatch.setattr(card_database_service, "_price_writeback", writeback)
+    yield factory
+    writeback.stop()
+
+
+@pytest.fixture
+def ebay(monkeypatch):
+    """Fake research_all_prices: 200ms per call, $42 average"""
+    calls = []
+
+    def research(cards):
+        calls.append(cards[0]["player"])
+        time.sleep(0.2)
+        return [dict(cards[0], pricing_data={"average_sold_price": 42.0, "sample_size": 5})]
+
+    monkeypatch.setattr(price_finder, "research_all_prices", research)
+    return calls
+
+
+def add_card(session_factory, age):
+    db = session_factory()
+    db.add(CardDatabase(
+        id="skenes-124", sport="MLB", year=2023, manufacturer="Topps", set_name="Topps Chrome",
+        player_name="Paul Skenes", card_number="124", avg_raw_price=10.0,
+        last_updated=datetime.utcnow() - age,
+    ))
+    db.commit()
+    db.close()
+
+
+def stored_price(session_factory):
+    db = session_factory()
+    try:
+        return db.get(CardDatabase, "skenes-124").avg_raw_price
+    finally:
+        db.close()
+
+
+async def price(session_factory, card=CARD, settle=False):
+    db = session_factory()
+    try:
+        service = HybridPricingService(db, session_factory=session_factory, freshness_seconds=3600)
+        result = await service.get_card_price(card)
+        if settle:
+            await asyncio.gather(*HybridPricingService._refresh_tasks)
+        return result
+    finally:
+        db.close()
+
+
+class TestStaleWhileRevalidate:
+    """Test fresh, stale and never-priced lookups"""
+
+    def test_fresh_price_is_served_without_refresh(self, session_factory, ebay):
+        add_card(session_factory, timedelta(minutes=5))
+
+        result = asyncio.run(price(session_factory, settle=True))
+
+        assert result["estimated_value"] == 10.0
+        assert result["stale"] is False
+        assert ebay == []
+
+    def test_stale_price_returns_at_once_and_refreshes(self, session_factory, ebay):
+        add_card(session_factory, timedelta(days=30))
+
+        async def run():
+            start = time.perf_counter()
+            result = await price(session_factory)
+            elapsed = time.perf_counter() - start
+            await asyncio.gather(*HybridPricingService._refresh_tasks)
+            return result, elapsed
+
+        result, elapsed = asyncio.run(run())
+
+        assert result["source"] == "local_database"
+        assert result["estimated_value"] == 10.0
+        assert result["stale"] is True
+        # Bounded by the local lookup, not the 200ms eBay round trip
+        assert elapsed < 0.15
+        assert ebay == ["Paul Skenes"]
+        assert stored_price(session_factory) == 42.0
+
+    def test_concurrent_stale_lookups_refresh_once(self, session_factory, ebay):
+        add_card(session_factory, timedelta(days=30))
+
+        async def run():
+            results = await asyncio.gather(*[price(session_factory) for _ in range(5)])
+            await asyncio.gather(*HybridPricingService._refresh_tasks)
+            return results
+
+        results = asyncio.run(run())
+
+        assert all(result["stale"] for result in results)
+        assert ebay == ["Paul Skenes"]
+
+    def test_never_priced_card_waits_for_ebay(self, session_factory, ebay):
+        result = asyncio.run(price(session_factory))
+
+        assert result["source"] == "ebay_api"
+        assert result["estimated_value"] == 42.0
+        assert ebay == ["Paul Skenes"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the trigram similarity index.
+"""
+
+import pytest
+
+from src.utils import trigram_index
+from src.utils.trigram_index import TrigramIndex, similarity, trigrams
+
+
+class TestSimilarity:
+    """Test trigram sets and Dice similarity"""
+
+    def test_trigrams_are_padded(self):
+        assert trigrams("abc") == {"  a", " ab", "abc", "bc "}
+        assert trigrams("") == set()
+
+    def test_similarity(self):
+        assert similarity("paul skenes", "paul skenes") == 1.0
+        assert similarity("paul skenes", "mike trout") < 0.2
+        assert 0.6 < similarity("paul skenes", "paul skenas") < 1.0
+        assert similarity("", "paul skenes") == 0.0
+
+
+class TestTrigramIndex:
+    """Test ranked lookups over the inverted lists"""
+
+    @pytest.fixture
+    def index(self):
+        index = TrigramIndex()
+        for name in ["paul skenes", "paul konerko", "mike trout", "mookie betts", "shohei ohtani", "juan soto"]:
+            index.add(name)
+        return index
+
+    def test_add_is_idempotent(self, index):
+        assert not index.add("mike trout")
+        assert not index.add("")
+        assert len(index) == 6 and "mike trout" in index
+
+    def test_exact_term_first(self, index):
+        assert index.search("mike trout", limit=1) == [(1.0, "mike trout")]
+
+    def test_ranked_by_similarity(self, index):
+        results = index.search("paul skenas", limit=3)
+        assert results[0][1] == "paul skenes"
+        assert [score for score, _ in results] == sorted((score for score, _ in results), reverse=True)
+
+    def test_min_score_and_no_match(self, index):
+        assert all(score >= 0.5 for score, _ in index.search("paul skenas", min_score=0.5))
+        assert index.search("zzzz qqqq") == []
+
+    def test_ties_at_the_limit_are_kept(self):
+        index = TrigramIndex()
+        for name in ["card 10", "card 11", "card 12", "card 13"]:
+            index.add(name)
+        assert len(index.search("card 1", limit=2)) == 4
+
+    def test_common_trigrams_are_skipped(self, monkeypatch):
+        # Every term shares the 'player' trigrams; the digits still decide
+        monkeypatch.setattr(trigram_index, "MIN_QUERY_GRAMS", 1)
+        index = TrigramIndex()
+        for i in range(200):
+            index.add(f"player {i:03d}")
+        assert index.search("player 123", limit=1) == [(1.0, "player 123")]
+        assert index.search("playr 123", limit=1)[0][1] == "player 123"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
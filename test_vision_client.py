@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared Google Vision client provider.
+These replace client construction with a stub, so no Google API calls are made.
+"""
+
+import threading
+import pytest
+
+from src.utils import vision_client
+
+
+@pytest.fixture(autouse=True)
+def stub_client_builder(monkeypatch):
+    """Count client builds instead of opening real gRPC channels"""
+    builds = []
+
+    def fake_build(creds):
+        client = object()
+        builds.append(client)
+        return client
+
+    monkeypatch.setattr(vision_client, "_build_client", fake_build)
+    monkeypatch.setattr(vision_client, "_load_credentials", lambda: None)
+    vision_client.reset_vision_client()
+    yield builds
+    vision_client.reset_vision_client()
+
+
+class TestSharedVisionClient:
+    """Test that every caller shares one lazily built client"""
+
+    def test_client_is_reused(self, stub_client_builder):
+        first = vision_client.get_vision_client()
+        second = vision_client.get_vision_client()
+        assert first is second
+        assert len(stub_client_builder) == 1
+
+    def test_concurrent_first_use_builds_once(self, stub_client_builder):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(vision_client.get_vision_client()))
+            for _ in range(16)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(stub_client_builder) == 1
+        assert all(client is results[0] for client in results)
+
+    def test_reset_rebuilds_client(self, stub_client_builder):
+        first = vision_client.get_vision_client()
+        vision_client.reset_vision_client()
+        second = vision_client.get_vision_client()
+        assert first is not second
+        assert len(stub_client_builder) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])